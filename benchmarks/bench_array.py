@@ -0,0 +1,43 @@
+"""Indexed reads from a native Array against the equivalent linked list of instances."""
+from harness import report, time_lox
+
+N = 300
+
+LINKED_LIST = f"""
+class Node {{
+    init(value, next) {{
+        this.value = value;
+        this.next = next;
+    }}
+}}
+
+var head = nil;
+for (var i = {N} - 1; i >= 0; i = i - 1) head = Node(i, head);
+
+fun nth(list, n) {{
+    while (n > 0) {{
+        list = list.next;
+        n = n - 1;
+    }}
+    return list.value;
+}}
+
+var sum = 0;
+for (var i = 0; i < {N}; i = i + 1) sum = sum + nth(head, i);
+print sum;
+"""
+
+ARRAY = f"""
+var items = Array();
+for (var i = 0; i < {N}; i = i + 1) items.push(i);
+
+var sum = 0;
+for (var i = 0; i < {N}; i = i + 1) sum = sum + items.get(i);
+print sum;
+"""
+
+
+if __name__ == "__main__":
+    linked = time_lox(LINKED_LIST)
+    report(f"linked list, {N} indexed reads", linked)
+    report(f"Array, {N} indexed reads", time_lox(ARRAY), linked)
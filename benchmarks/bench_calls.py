@@ -0,0 +1,31 @@
+"""Call-heavy programs: recursive lox functions, constructors and natives."""
+from harness import report, time_lox
+
+FIB = """
+fun fib(n) {
+  if (n < 2) return n;
+  return fib(n - 1) + fib(n - 2);
+}
+print fib(22);
+"""
+
+CONSTRUCT = """
+class Point {
+  init(x, y) { this.x = x; this.y = y; }
+}
+var p;
+for (var i = 0; i < 30000; i = i + 1) p = Point(i, i);
+print p.x;
+"""
+
+NATIVES = """
+var total = 0;
+for (var i = 0; i < 60000; i = i + 1) total = total + abs(-i);
+print total;
+"""
+
+
+if __name__ == "__main__":
+    report("fib(22)", time_lox(FIB))
+    report("30k constructor calls", time_lox(CONSTRUCT))
+    report("60k native calls", time_lox(NATIVES))
@@ -0,0 +1,33 @@
+"""Front-end latency (scan, parse and resolve) on a large file, two passes against fused."""
+from harness import best_of, report
+
+from pylox.environment import init_global_env
+from pylox.lox import load
+
+UNIT = """
+fun make{i}(seed) {{
+    var total = seed;
+    var step = fun (x) {{ total = total + x; return total; }};
+    for (var k = 0; k < 10; k = k + 1) {{
+        if (k > seed and total < 100) step(k * 2); else total = total - 1;
+    }}
+    return step;
+}}
+class Shape{i} {{
+    init(w, h) {{ this.w = w; this.h = h; }}
+    area() {{ return this.w * this.h; }}
+    scaled(f) {{ var s = this; return fun () {{ return s.area() * f; }}; }}
+}}
+"""
+SOURCE = "".join(UNIT.format(i=i) for i in range(2_000))
+
+
+def _load(fused: bool) -> None:
+    load(SOURCE, init_global_env(), fused=fused)
+
+
+if __name__ == "__main__":
+    print(f"{len(SOURCE) / 1e6:.1f} MB source")
+    two_passes = best_of(lambda: _load(False))
+    report("scan + parse + resolve", two_passes)
+    report("scan + fused parse/resolve", best_of(lambda: _load(True)), two_passes)
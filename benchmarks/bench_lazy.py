@@ -0,0 +1,55 @@
+"""Startup of a large generated library of which a run calls only a few functions."""
+import tracemalloc
+from contextlib import redirect_stdout
+from io import StringIO
+
+from harness import best_of, report
+
+from pylox.environment import init_global_env
+from pylox.lox import run
+
+FUNCTION = """
+fun helper{i}(a, b) {{
+    var total = 0;
+    for (var k = 0; k < a; k = k + 1) {{
+        if (k > b and total < 100) total = total + k * 2; else total = total - 1;
+    }}
+    return total;
+}}
+"""
+CLASS = """
+class Widget{i} {{
+    init(x) {{ this.x = x; }}
+    {methods}
+}}
+"""
+METHOD = "method{j}(y) {{ var z = this.x + y; while (z > 0) z = z - 1; return z; }}"
+
+LIBRARY = "".join(FUNCTION.format(i=i) for i in range(500)) + "".join(
+    CLASS.format(i=i, methods="\n    ".join(METHOD.format(j=j) for j in range(10)))
+    for i in range(50)
+)
+MAIN = "print helper7(10, 2) + Widget3(5).method4(1);"
+
+
+def _run(lazy: bool) -> None:
+    with redirect_stdout(StringIO()):
+        run(LIBRARY + MAIN, init_global_env(), lazy)
+
+
+def _retained(lazy: bool) -> int:
+    tracemalloc.start()
+    env = init_global_env()
+    with redirect_stdout(StringIO()):
+        run(LIBRARY + MAIN, env, lazy)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return size
+
+
+if __name__ == "__main__":
+    eager = best_of(lambda: _run(False))
+    report("eager startup", eager)
+    report("lazy startup", best_of(lambda: _run(True)), eager)
+    print(f"{'eager retained':<40} {_retained(False) / 1e6:10.2f} MB")
+    print(f"{'lazy retained':<40} {_retained(True) / 1e6:10.2f} MB")
@@ -0,0 +1,19 @@
+"""Tight numeric loop dominated by Binary, Unary and Logical evaluation."""
+from harness import report, time_lox
+
+N = 100_000
+
+NUMERIC_LOOP = f"""
+var sum = 0;
+var i = 0;
+while (i < {N} and !(sum < 0)) {{
+    sum = sum + i * 2 - i / 2;
+    if (i >= 10 or i <= -10) sum = sum - 1;
+    i = i + 1;
+}}
+print sum;
+"""
+
+
+if __name__ == "__main__":
+    report(f"numeric loop, {N} iterations", time_lox(NUMERIC_LOOP))
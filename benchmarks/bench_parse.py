@@ -0,0 +1,31 @@
+"""Parse throughput on large generated expressions."""
+import random
+
+from harness import best_of
+
+from pylox.parser import parse
+from pylox.scanner import scan_tokens
+
+OPERATORS = ["+", "-", "*", "/", "<", ">=", "==", "!=", "and", "or"]
+
+
+def _expression(rng: random.Random, depth: int) -> str:
+    if depth == 0:
+        return rng.choice(["x", "1.5", '"s"', "f(y, 2)", "a.b", "!z", "-w", "nil"])
+    op = rng.choice(OPERATORS)
+    lhs = _expression(rng, depth - 1)
+    rhs = _expression(rng, depth - 1)
+    return f"({lhs} {op} {rhs})" if rng.random() < 0.3 else f"{lhs} {op} {rhs}"
+
+
+def _program(statements: int, depth: int) -> str:
+    rng = random.Random(42)
+    return "\n".join(f"v = {_expression(rng, depth)};" for _ in range(statements))
+
+
+if __name__ == "__main__":
+    source = _program(2_000, 6)
+    tokens = scan_tokens(source)
+    seconds = best_of(lambda: list(parse(tokens)))
+    print(f"{'parse, ' + str(len(tokens)) + ' tokens':<40} {seconds * 1000:10.2f} ms")
+    print(f"{'throughput':<40} {len(tokens) / seconds / 1e6:10.2f} M tokens/s")
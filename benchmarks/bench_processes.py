@@ -0,0 +1,53 @@
+"""CPU bound jobs run serially, and in worker processes with spawnProcess and parallelMap."""
+import os
+
+from harness import report, time_lox
+
+JOBS = 8
+
+_FIB = """
+fun fib(n) {
+  if (n < 2) return n;
+  return fib(n - 1) + fib(n - 2);
+}
+"""
+
+SERIAL = (
+    _FIB
+    + f"""
+var total = 0;
+for (var i = 0; i < {JOBS}; i = i + 1) total = total + fib(18);
+print total;
+"""
+)
+
+PARALLEL = (
+    _FIB
+    + f"""
+var handles = Array();
+for (var i = 0; i < {JOBS}; i = i + 1) handles.push(spawnProcess(fib, 18));
+var total = 0;
+for (var i = 0; i < {JOBS}; i = i + 1) total = total + handles.get(i).join();
+print total;
+"""
+)
+
+MAPPED = (
+    _FIB
+    + f"""
+var inputs = Array();
+for (var i = 0; i < {JOBS}; i = i + 1) inputs.push(18);
+var results = parallelMap(fib, inputs, 1);
+var total = 0;
+for (var i = 0; i < {JOBS}; i = i + 1) total = total + results.get(i);
+print total;
+"""
+)
+
+
+if __name__ == "__main__":
+    serial = time_lox(SERIAL, repeat=1)
+    report(f"{JOBS} x fib(18), serial", serial)
+    workers = f"{os.cpu_count()} processes"
+    report(f"{JOBS} x fib(18), spawnProcess, {workers}", time_lox(PARALLEL, repeat=1), serial)
+    report(f"{JOBS} x fib(18), parallelMap, {workers}", time_lox(MAPPED, repeat=1), serial)
@@ -0,0 +1,56 @@
+"""Rows per second of a rule over records: lox.run per row, a Rule row by row and by columns."""
+import random
+from contextlib import redirect_stdout
+from io import StringIO
+
+from harness import best_of, report
+
+from pylox.batch import Rule
+from pylox.environment import init_global_env
+from pylox.lox import run
+
+ROWS = 20_000
+RULE = "price * qty > 100 and !blocked or vip"
+PRELUDE = "fun cost(price, qty) { return price * qty; }"
+CALLING_RULE = "cost(price, qty) > 100 and !blocked or vip"
+
+_rng = random.Random(1)
+RECORDS = [
+    {
+        "price": _rng.uniform(1, 50),
+        "qty": float(_rng.randint(0, 10)),
+        "blocked": _rng.random() < 0.1,
+        "vip": _rng.random() < 0.05,
+    }
+    for _ in range(ROWS)
+]
+
+
+def _lox(value: object) -> str:
+    return str(value).lower() if isinstance(value, bool) else repr(value)
+
+
+def _run_per_row(records) -> None:
+    with redirect_stdout(StringIO()):
+        for record in records:
+            bindings = "".join(f"var {name} = {_lox(value)};" for name, value in record.items())
+            run(f"{bindings} print {RULE};", init_global_env())
+
+
+def _rows_per_second(name: str, seconds: float, rows: int, baseline: float | None = None):
+    report(f"{name} ({rows / seconds:,.0f} rows/s)", seconds, baseline)
+
+
+if __name__ == "__main__":
+    sample = RECORDS[: ROWS // 10]
+    per_row = best_of(lambda: _run_per_row(sample), 1) * 10
+    _rows_per_second("lox.run per row", per_row, ROWS)
+
+    interpreted = Rule(CALLING_RULE, PRELUDE)
+    seconds = best_of(lambda: list(interpreted.evaluate_many(RECORDS)))
+    _rows_per_second("Rule, row by row", seconds, ROWS, per_row)
+
+    columns = Rule(RULE)
+    assert list(columns.evaluate_many(RECORDS)) == list(interpreted.evaluate_many(RECORDS))
+    seconds = best_of(lambda: list(columns.evaluate_many(RECORDS)))
+    _rows_per_second("Rule, numpy columns", seconds, ROWS, per_row)
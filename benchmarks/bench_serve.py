@@ -0,0 +1,49 @@
+"""Latency of a small script: a fresh interpreter process versus a pylox.server request."""
+import multiprocessing
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from harness import best_of, report
+
+from pylox.client import request
+from pylox.server import Server
+
+SCRIPT = """
+fun fib(n) { if (n < 2) return n; return fib(n - 1) + fib(n - 2); }
+print fib(10);
+"""
+
+
+def _run(*args: str) -> None:
+    subprocess.run([sys.executable, *args], check=True, capture_output=True, env=os.environ)
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as directory:
+        script = os.path.join(directory, "script.lox")
+        with open(script, "w") as file:
+            file.write(SCRIPT)
+        socket_path = os.path.join(directory, "pylox.sock")
+        server = multiprocessing.get_context("fork").Process(
+            target=Server(socket_path, stdlib=True).serve_forever
+        )
+        server.start()
+        while not os.path.exists(socket_path):
+            time.sleep(0.01)
+        try:
+            cold = best_of(lambda: _run("-m", "pylox.lox", "--stdlib", script), 5)
+            report("new interpreter process", cold)
+            client = best_of(lambda: _run("-m", "pylox.client", socket_path, script), 5)
+            report("pylox.client process", client, cold)
+            message = {"path": script}
+            report(
+                "request() from a running host",
+                best_of(lambda: request(socket_path, message, lambda _: None), 20),
+                cold,
+            )
+        finally:
+            server.terminate()
+            server.join()
@@ -0,0 +1,31 @@
+"""string_equality: compare strings with == and look up fields by name in a hot loop."""
+from harness import report, time_lox
+
+ITERATIONS = 100_000
+
+LITERALS = f"""
+var kinds = "circle";
+var hits = 0;
+for (var i = 0; i < {ITERATIONS}; i = i + 1) {{
+  if (kinds == "circle") hits = hits + 1;
+  if (kinds != "square") hits = hits + 1;
+}}
+print hits;
+"""
+
+FIELDS = f"""
+class Shape {{}}
+var shape = Shape();
+shape.kind = "circle";
+shape.radius = 1;
+var total = 0;
+for (var i = 0; i < {ITERATIONS}; i = i + 1) {{
+  if (shape.kind == "circle") total = total + shape.radius;
+}}
+print total;
+"""
+
+
+if __name__ == "__main__":
+    report(f"string literal ==, {ITERATIONS} iterations", time_lox(LITERALS))
+    report(f"field lookup and ==, {ITERATIONS} iterations", time_lox(FIELDS))
@@ -0,0 +1,37 @@
+"""Build a 10 MB string with repeated + and with a StringBuilder."""
+from unittest.mock import patch
+
+from harness import report, time_lox
+
+import pylox.strings
+
+CHUNK = 1000
+
+
+def _concat_loop(size: int) -> str:
+    return f"""
+    var chunk = "";
+    for (var i = 0; i < {CHUNK // 10}; i = i + 1) chunk = chunk + "0123456789";
+    var s = "";
+    for (var i = 0; i < {size // CHUNK}; i = i + 1) s = s + chunk;
+    print len(s);
+    """
+
+
+def _builder_loop(size: int) -> str:
+    return f"""
+    var chunk = "";
+    for (var i = 0; i < {CHUNK // 10}; i = i + 1) chunk = chunk + "0123456789";
+    var sb = StringBuilder();
+    for (var i = 0; i < {size // CHUNK}; i = i + 1) sb.append(chunk);
+    print len(sb.toString());
+    """
+
+
+if __name__ == "__main__":
+    size = 10_000_000
+    with patch.object(pylox.strings, "ROPE_THRESHOLD", float("inf")):
+        baseline = time_lox(_concat_loop(size), repeat=1)
+    report("plain str +, 10 MB", baseline)
+    report("rope +, 10 MB", time_lox(_concat_loop(size)), baseline)
+    report("StringBuilder, 10 MB", time_lox(_builder_loop(size)), baseline)
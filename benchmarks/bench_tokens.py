@@ -0,0 +1,34 @@
+"""Memory held by the token stream of a large source, compact buffer against Token objects."""
+import tracemalloc
+
+from harness import best_of, report
+
+from pylox.scanner import scan_tokens
+
+UNIT = """
+fun step(counter, delta) {
+    var next = counter + delta * 2 - 1;
+    if (next > 1000 and delta != 0) print "overflow";
+    return next;
+}
+"""
+SOURCE = UNIT * 20_000
+
+
+def _allocated(build) -> int:
+    tracemalloc.start()
+    value = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del value
+    return size
+
+
+if __name__ == "__main__":
+    tokens = scan_tokens(SOURCE)
+    print(f"{len(SOURCE) / 1e6:.1f} MB source, {len(tokens)} tokens")
+    report("scan", best_of(lambda: scan_tokens(SOURCE), 1))
+    buffer_size = _allocated(lambda: scan_tokens(SOURCE))
+    objects_size = _allocated(lambda: list(tokens))
+    print(f"{'token buffer':<40} {buffer_size / 1e6:10.2f} MB")
+    print(f"{'Token objects':<40} {objects_size / 1e6:10.2f} MB")
@@ -0,0 +1,38 @@
+"""Elementwise math over a numeric series: Array loop against Vector bulk operations."""
+from harness import report, time_lox
+
+N = 20_000
+
+SETUP = f"""
+var items = Array();
+for (var i = 0; i < {N}; i = i + 1) items.push(i);
+"""
+
+ARRAY_LOOP = (
+    SETUP
+    + f"""
+var sum = 0;
+for (var i = 0; i < {N}; i = i + 1) {{
+    var x = items.get(i) * 2 + 1;
+    if (x > 100) sum = sum + x;
+}}
+print sum;
+"""
+)
+
+VECTOR_OPS = (
+    SETUP
+    + """
+var x = vectorOf(items).mul(2).add(1);
+print x.mul(x.gt(100)).sum();
+"""
+)
+
+SETUP_ONLY = SETUP + "print items.length();"
+
+
+if __name__ == "__main__":
+    setup = time_lox(SETUP_ONLY)
+    loop = time_lox(ARRAY_LOOP) - setup
+    report(f"Array loop, {N} elements", loop)
+    report(f"Vector ops, {N} elements", time_lox(VECTOR_OPS) - setup, loop)
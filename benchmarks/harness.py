@@ -0,0 +1,30 @@
+from contextlib import redirect_stdout
+from io import StringIO
+from time import perf_counter
+from typing import Callable
+
+from pylox.environment import Environment, init_global_env
+from pylox.lox import run
+
+
+def best_of(fn: Callable[[], object], repeat: int = 3) -> float:
+    times = []
+    for _ in range(repeat):
+        start = perf_counter()
+        fn()
+        times.append(perf_counter() - start)
+    return min(times)
+
+
+def time_lox(source: str, repeat: int = 3, stdlib: bool = True) -> float:
+    def run_once() -> None:
+        env: Environment = init_global_env(stdlib)
+        with redirect_stdout(StringIO()):
+            run(source, env)
+
+    return best_of(run_once, repeat)
+
+
+def report(name: str, seconds: float, baseline: float | None = None) -> None:
+    speedup = f"  ({baseline / seconds:.1f}x)" if baseline else ""
+    print(f"{name:<40} {seconds * 1000:10.2f} ms{speedup}")
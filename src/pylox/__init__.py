@@ -0,0 +1,7 @@
+def __getattr__(name: str):
+    # Imported lazily so that importing pylox does not import asyncio.
+    if name == "run_async":
+        from pylox.aio import run_async
+
+        return run_async
+    raise AttributeError(f"module 'pylox' has no attribute {name!r}")
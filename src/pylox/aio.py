@@ -0,0 +1,55 @@
+import asyncio
+from inspect import isawaitable
+
+from pylox.environment import Environment, init_global_env
+from pylox.interpreter import Steps, interpret_steps
+from pylox.lox import load
+from pylox.resolver import Bindings
+from pylox.runtime import NativeError, event_loop_driven
+
+# Calls and loop iterations run between two yields to the event loop.
+YIELD_INTERVAL = 1000
+
+
+async def drive(steps: Steps, yield_interval: int = YIELD_INTERVAL) -> object:
+    """Run resumable interpreter steps on the event loop, awaiting awaitables from natives."""
+    ticks = 0
+    value: object = None
+    failure: NativeError | None = None
+    driven = event_loop_driven.set(True)
+    try:
+        while True:
+            if failure:
+                request, failure = steps.throw(failure), None
+            else:
+                request = steps.send(value)
+            value = None
+            if request is None:
+                ticks += 1
+                if ticks >= yield_interval:
+                    ticks = 0
+                    await asyncio.sleep(0)
+            elif isawaitable(request):
+                try:
+                    value = await request
+                except NativeError as e:
+                    failure = e
+            else:
+                failure = NativeError("Native cannot suspend when running asynchronously.")
+    except StopIteration as stop:
+        return stop.value
+    finally:
+        event_loop_driven.reset(driven)
+        steps.close()
+
+
+async def run_async(
+    input: str, env: Environment | None = None, yield_interval: int = YIELD_INTERVAL
+) -> None:
+    """Like lox.run, but yields to the event loop every yield_interval calls and loop iterations.
+
+    Natives may be coroutine functions; their results are awaited before the program resumes.
+    Cancelling the awaiting task stops the program.
+    """
+    env = (env or init_global_env()).with_bindings(Bindings())
+    await drive(interpret_steps(load(input, env), env), yield_interval)
@@ -0,0 +1,218 @@
+from functools import cache
+from itertools import islice
+from typing import Any, Iterable, Iterator, List, Mapping
+
+from pylox.environment import init_global_env
+from pylox.error import error
+from pylox.expr import Binary, Expr, Grouping, Literal, Logical, Unary, Variable
+from pylox.interpreter import evaluate
+from pylox.lox import compile_program
+from pylox.scanner import TokenType
+from pylox.stmt import ExprStmt
+from pylox.traversal import Node, TraversalException, Visitor, walk
+
+# Records evaluated together, as one set of columns when the expression allows it.
+BATCH_SIZE = 4096
+
+_ARITHMETIC = {TokenType.PLUS, TokenType.MINUS, TokenType.STAR, TokenType.SLASH}
+_COMPARISON = {
+    TokenType.LESS,
+    TokenType.GREATER,
+    TokenType.LESS_EQUAL,
+    TokenType.GREATER_EQUAL,
+}
+_EQUALITY = {TokenType.EQUAL_EQUAL, TokenType.BANG_EQUAL}
+_COLUMN_NODES = (Binary, Unary, Logical, Grouping, Literal, Variable)
+
+
+@cache
+def _numpy() -> Any:
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+class _NotVectorized(Exception):
+    """The batch has values the column evaluation does not handle like lox does."""
+
+
+class _Columns(Visitor):
+    """Evaluates an expression over numpy columns, following lox semantics or giving up.
+
+    Values are float64 (numbers) or bool arrays; only those two types occur.
+    """
+
+    __slots__ = ("np", "columns", "globals")
+
+    def __init__(self, np: Any, columns: Mapping[str, Any], globals: Mapping[str, object]):
+        self.np = np
+        self.columns = columns
+        self.globals = globals
+
+    def _scalar(self, value: object) -> Any:
+        if value.__class__ is bool:
+            return self.np.asarray(value)
+        if value.__class__ is float or value.__class__ is int:
+            return self.np.asarray(value, dtype=self.np.float64)
+        raise _NotVectorized
+
+    def visit_Literal(self, literal: Literal) -> Any:
+        return self._scalar(literal.value)
+
+    def visit_Variable(self, variable: Variable) -> Any:
+        name = variable.name.lexeme
+        if name in self.columns:
+            return self.columns[name]
+        return self._scalar(self.globals.get(name))
+
+    def visit_Grouping(self, grouping: Grouping) -> Any:
+        return self.visit(grouping.expr)
+
+    def visit_Unary(self, unary: Unary) -> Any:
+        right = self.visit(unary.right)
+        number = right.dtype.kind == "f"
+        if unary.operator.token is TokenType.BANG:
+            # Every number is truthy.
+            return self.np.zeros_like(right, dtype=bool) if number else ~right
+        if not number:
+            raise _NotVectorized
+        return -right
+
+    def visit_Binary(self, binary: Binary) -> Any:
+        np = self.np
+        left, right = self.visit(binary.left), self.visit(binary.right)
+        operator = binary.operator.token
+        numbers = left.dtype.kind == "f" and right.dtype.kind == "f"
+        if operator in _EQUALITY:
+            if left.dtype.kind != right.dtype.kind:
+                equal = np.zeros(np.broadcast(left, right).shape, dtype=bool)
+            else:
+                equal = left == right
+            return equal if operator is TokenType.EQUAL_EQUAL else ~equal
+        if not numbers:
+            raise _NotVectorized
+        if operator is TokenType.SLASH and (right == 0).any():
+            # Division by zero fails in lox, row by row.
+            raise _NotVectorized
+        return binary.op(left, right)
+
+    def visit_Logical(self, logical: Logical) -> Any:
+        left = self.visit(logical.left)
+        if left.dtype.kind == "f":
+            # Numbers are truthy: or yields them, and yields the right operand.
+            return left if logical.short_circuit else self.visit(logical.right)
+        right = self.visit(logical.right)
+        if right.dtype.kind != "b":
+            raise _NotVectorized
+        return left | right if logical.short_circuit else left & right
+
+    def generic_visit(self, node: Node) -> Any:
+        raise _NotVectorized
+
+
+def _vectorizable(expr: Expr) -> bool:
+    for node in walk(expr):
+        if not isinstance(node, _COLUMN_NODES):
+            return False
+        if isinstance(node, Binary) and node.operator.token not in (
+            _ARITHMETIC | _COMPARISON | _EQUALITY
+        ):
+            return False
+    return True
+
+
+def _lox_value(value: object) -> object:
+    # Host integers are lox numbers.
+    return float(value) if value.__class__ is int else value
+
+
+class Rule:
+    """An expression compiled once and evaluated against many records of input values.
+
+    Names in the expression that the prelude (a program run once, e.g. function declarations)
+    and the stdlib do not define are inputs, read from each record; missing ones are nil.
+    Expressions of numbers, arithmetic, comparison and logical operators are evaluated for a
+    whole batch of records at once with numpy, when it is installed and the batch's inputs are
+    all numbers or all booleans per name; anything else is interpreted record by record.
+    A record whose evaluation fails, e.g. dividing by zero or adding nil, is reported and yields
+    nil.
+    """
+
+    def __init__(
+        self,
+        expression: str,
+        prelude: str = "",
+        stdlib: bool = False,
+        batch_size: int = BATCH_SIZE,
+    ):
+        self.env = init_global_env(stdlib)
+        program = compile_program(prelude)
+        if program.diagnostics:
+            raise ValueError("\n".join(program.diagnostics))
+        program.run(self.env)
+
+        try:
+            compiled = compile_program(expression + ";")
+        except TraversalException:
+            # The parser leaves a missing operand out of the tree without reporting it.
+            raise ValueError(f"Incomplete expression: {expression}")
+        stmts = compiled.stmts
+        if compiled.diagnostics or len(stmts) != 1 or not isinstance(stmts[0], ExprStmt):
+            raise ValueError("\n".join(compiled.diagnostics) or f"Not an expression: {expression}")
+        self.env = self.env.with_bindings(compiled.bindings)
+        self.expr: Expr = stmts[0].expr
+
+        defined = self.env.global_values()
+        self.inputs: List[str] = list(
+            dict.fromkeys(
+                node.name.lexeme
+                for node in walk(self.expr)
+                if isinstance(node, Variable) and node.name.lexeme not in defined
+            )
+        )
+        self.batch_size = batch_size
+        self._np = _numpy() if _vectorizable(self.expr) else None
+
+    def evaluate(self, record: Mapping[str, object]) -> object:
+        define = self.env.define
+        for name in self.inputs:
+            define(name, _lox_value(record.get(name)))
+        try:
+            return evaluate(self.expr, self.env)
+        except RuntimeError:
+            pass  # Already reported by the interpreter.
+        except ZeroDivisionError:
+            error("rule", "Division by zero.")
+        except TypeError as e:
+            # The interpreter leaves operand type checks to python.
+            error("rule", f"Operands of the wrong type: {e}.")
+        return None
+
+    def evaluate_many(self, records: Iterable[Mapping[str, object]]) -> Iterator[object]:
+        """The result for each record, in order, computed a batch at a time."""
+        records = iter(records)
+        while batch := list(islice(records, self.batch_size)):
+            if self._np is not None:
+                try:
+                    yield from self._evaluate_columns(batch)
+                    continue
+                except _NotVectorized:
+                    pass
+            yield from map(self.evaluate, batch)
+
+    def _evaluate_columns(self, batch: List[Mapping[str, object]]) -> List[object]:
+        np: Any = self._np
+        columns = {}
+        for name in self.inputs:
+            values = [record.get(name) for record in batch]
+            if all(value.__class__ is float or value.__class__ is int for value in values):
+                columns[name] = np.array(values, dtype=np.float64)
+            elif all(value.__class__ is bool for value in values):
+                columns[name] = np.array(values, dtype=bool)
+            else:
+                raise _NotVectorized
+        with np.errstate(all="ignore"):
+            result = _Columns(np, columns, self.env.global_values()).visit(self.expr)
+        return np.broadcast_to(result, (len(batch),)).tolist()
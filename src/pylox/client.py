@@ -0,0 +1,46 @@
+import json
+import socket
+import sys
+from argparse import ArgumentParser
+from pathlib import Path
+from typing import Any, Callable, Dict
+
+# Only the standard library: the client must start faster than the interpreter it replaces.
+
+
+def request(
+    socket_path: str, message: Dict[str, Any], write: Callable[[str], None] = print
+) -> bool:
+    """Send a request to a pylox.server, writing output and errors as they arrive.
+
+    False if the program reported errors.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+        connection.connect(socket_path)
+        connection.sendall(json.dumps(message).encode() + b"\n")
+        with connection.makefile("rb") as replies:
+            for line in replies:
+                reply = json.loads(line)
+                if "ok" in reply:
+                    return reply["ok"]
+                write(reply.get("out", reply.get("error")))
+    return False
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description="run a lox program on a pylox server")
+    parser.add_argument("socket", help="socket the server listens on")
+    parser.add_argument("path", help="file to interpret", nargs="?")
+    parser.add_argument("-c", dest="source", help="program passed in as a string")
+    parser.add_argument("--stdlib", help="load the native standard library", action="store_true")
+    args = parser.parse_args()
+
+    if args.source is not None:
+        message = {"source": args.source}
+    elif args.path:
+        message = {"path": str(Path(args.path).resolve())}
+    else:
+        parser.error("a path or -c source is required")
+    if args.stdlib:
+        message["stdlib"] = True
+    sys.exit(0 if request(args.socket, message) else 1)
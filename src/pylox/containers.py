@@ -0,0 +1,122 @@
+from typing import Any, Dict, List
+
+from pylox.runtime import (
+    NativeClass,
+    NativeError,
+    NativeInstance,
+    Natives,
+    integer_arg,
+    native_method,
+    stringify,
+)
+from pylox.strings import Rope
+
+
+class Array(NativeInstance):
+    __slots__ = ("items",)
+
+    def __init__(self, items: List[Any] | None = None):
+        self.items = [] if items is None else items
+
+    def _index(self, i: object) -> int:
+        index = integer_arg(i, "Array index")
+        if not 0 <= index < len(self.items):
+            raise NativeError(f"Array index {index} out of range.")
+        return index
+
+    @native_method()
+    def get(self, i):
+        return self.items[self._index(i)]
+
+    @native_method()
+    def set(self, i, value):
+        self.items[self._index(i)] = value
+        return value
+
+    @native_method()
+    def push(self, value):
+        self.items.append(value)
+        return value
+
+    @native_method()
+    def pop(self):
+        if not self.items:
+            raise NativeError("Pop from empty Array.")
+        return self.items.pop()
+
+    @native_method()
+    def length(self):
+        return float(len(self.items))
+
+    @native_method()
+    def slice(self, start, end):
+        return Array(self.items[integer_arg(start, "Slice start") : integer_arg(end, "Slice end")])
+
+    def __len__(self):
+        return len(self.items)
+
+    def __str__(self):
+        return f"[{', '.join(stringify(item) for item in self.items)}]"
+
+
+def _map_key(key: object) -> object:
+    match key:
+        case bool():
+            # Tagged so that true and 1 stay distinct keys, as they are under lox ==.
+            return (bool, key)
+        case None | float() | int() | str():
+            return key
+        case Rope():
+            return key.flatten()
+    raise NativeError("Map keys must be strings, numbers, booleans or nil.")
+
+
+def _lox_key(key: object) -> object:
+    return key[1] if isinstance(key, tuple) else key
+
+
+class Map(NativeInstance):
+    __slots__ = ("entries",)
+
+    def __init__(self, entries: Dict[object, Any] | None = None):
+        self.entries: Dict[object, Any] = {}
+        for key, value in (entries or {}).items():
+            self.entries[_map_key(key)] = value
+
+    @native_method()
+    def get(self, key):
+        return self.entries.get(_map_key(key))
+
+    @native_method()
+    def set(self, key, value):
+        self.entries[_map_key(key)] = value
+        return value
+
+    @native_method()
+    def has(self, key):
+        return _map_key(key) in self.entries
+
+    @native_method()
+    def remove(self, key):
+        return self.entries.pop(_map_key(key), None)
+
+    @native_method()
+    def size(self):
+        return float(len(self.entries))
+
+    @native_method()
+    def keys(self):
+        return Array([_lox_key(key) for key in self.entries])
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __str__(self):
+        items = (f"{stringify(_lox_key(k))}: {stringify(v)}" for k, v in self.entries.items())
+        return f"{{{', '.join(items)}}}"
+
+
+CONTAINERS: Natives = {
+    "Array": NativeClass("Array", 0, Array),
+    "Map": NativeClass("Map", 0, Map),
+}
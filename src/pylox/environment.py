@@ -1,18 +1,33 @@
 from time import time
-from typing import Dict, List
+from typing import TYPE_CHECKING, Callable, Dict, List, Tuple
 from pylox.iexpr import NamedExpr
 from pylox.resolver import Bindings
 
-from pylox.runtime import runtime_error
+from pylox.runtime import NativeClass, NativeFunction, Natives, runtime_error
 from pylox.scanner import Token
 
+if TYPE_CHECKING:
+    from pylox.processes import ProcessPool
+
 _ValMap = Dict[str, object]
 _GLOBAL_SCOPE_INDEX = 0
 
 
+class Cell:
+    """Shared storage for a global, or for a captured local changed after the capture."""
+
+    __slots__ = ("value",)
+
+    def __init__(self, value: object):
+        self.value = value
+
+
 class Environment:
-    def __init__(self, bindings: Bindings = {}):
-        self._bindings = bindings
+    # The stdlib's worker processes, set on the globals it is installed in.
+    process_pool: "ProcessPool | None" = None
+
+    def __init__(self, bindings: Bindings | None = None):
+        self._bindings = bindings if bindings is not None else Bindings()
         self._map: List[_ValMap] = [{}]
 
     def _resolve_bound_scope(self, expr: NamedExpr) -> _ValMap:
@@ -24,37 +39,116 @@ class Environment:
         env._map = self._map + env._map
         return env
 
+    def with_bindings(self, bindings: Bindings) -> "Environment":
+        """A view of the same scopes that resolves references through bindings."""
+        env = Environment(bindings)
+        env._map = self._map
+        return env
+
     def merge_bindings(self, bindings: Bindings):
-        self._bindings.update(bindings)
+        self._bindings.merge(bindings)
+
+    def closure(self, function: Token) -> "Environment":
+        """The environment of a function created here: globals and the variables it captures."""
+        captured = {}
+        for name, depth in self._bindings.captures.get(function, ()):
+            try:
+                captured[name] = self._map[depth][name]
+            except (IndexError, KeyError):
+                raise runtime_error(function, f"Attempt to access undefined variable {name}")
+        env = Environment(self._bindings)
+        env._map = [self._map[_GLOBAL_SCOPE_INDEX], captured]
+        return env
+
+    def with_capture(self, name: str, value: object) -> "Environment":
+        """A copy of a closure environment capturing one more variable."""
+        env = Environment(self._bindings)
+        env._map = [self._map[_GLOBAL_SCOPE_INDEX], {**self._map[-1], name: value}]
+        return env
 
     def define(self, name: str | Token, value: object) -> None:
-        name = name if isinstance(name, str) else name.lexeme
-        self._map[-1][name] = value
+        if not isinstance(name, str):
+            boxed = self._bindings.boxed
+            if boxed and name in boxed:
+                value = Cell(value)
+            name = name.lexeme
+        scope = self._map[-1]
+        if len(self._map) == 1:
+            # Each global keeps one cell for the environment's lifetime, even when it is
+            # redefined, so references can cache it.
+            cell = scope.get(name)
+            if cell.__class__ is Cell:
+                cell.value = value
+            else:
+                scope[name] = Cell(value)
+            return
+        scope[name] = value
+
+    def initialize(self, name: Token, value: object) -> None:
+        """Set a variable defined in the innermost scope, through its cell if it has one."""
+        scope = self._map[-1]
+        cell = scope.get(name.lexeme)
+        if cell.__class__ is Cell:
+            cell.value = value
+        else:
+            scope[name.lexeme] = value
+
+    def define_natives(self, natives: Natives) -> None:
+        for name, native in natives.items():
+            self.define(name, native)
 
     def assign(self, named_expr: NamedExpr, value: object) -> None:
+        ref = named_expr.ref
+        if ref.scope is self._map[_GLOBAL_SCOPE_INDEX]:
+            ref.cell.value = value
+            return
+
         name = named_expr.name.lexeme
         scope = self._resolve_bound_scope(named_expr)
 
         if name in scope:
-            scope[name] = value
+            cell = scope[name]
+            if cell.__class__ is Cell:
+                cell.value = value
+                self._cache_global(named_expr, scope, cell)
+            else:
+                scope[name] = value
             return
 
         raise runtime_error(named_expr.name, f"Assigning to undefined variable {name}")
 
     def access(self, named_expr: NamedExpr) -> object:
-        name = named_expr.name.lexeme
+        ref = named_expr.ref
+        if ref.scope is self._map[_GLOBAL_SCOPE_INDEX]:
+            return ref.cell.value
 
+        name = named_expr.name.lexeme
         scope = self._resolve_bound_scope(named_expr)
 
         if name in scope:
-            return scope[name]
+            value = scope[name]
+            if value.__class__ is Cell:
+                self._cache_global(named_expr, scope, value)
+                return value.value
+            return value
 
         raise runtime_error(named_expr.name, f"Attempt to access undefined variable {name}")
 
+    def _cache_global(self, named_expr: NamedExpr, scope: _ValMap, cell: Cell) -> None:
+        if scope is self._map[_GLOBAL_SCOPE_INDEX]:
+            ref = named_expr.ref
+            ref.scope, ref.cell = scope, cell
+
+    def global_values(self) -> Dict[str, object]:
+        scope = self._map[_GLOBAL_SCOPE_INDEX]
+        # Every global is a Cell; the check is there for the type checker.
+        return {name: cell.value for name, cell in scope.items() if isinstance(cell, Cell)}
+
     def access_unbound(self, name) -> object:
         for scope in reversed(self._map):
             if name in scope:
-                return scope[name]
+                value = scope[name]
+                return value.value if value.__class__ is Cell else value
 
 
 class _Clock:
@@ -64,7 +158,54 @@ class _Clock:
         return time() / 1000.0
 
 
-def init_global_env() -> Environment:
+# Kind and arity of the natives installed by the scheduler and the process pool, which are
+# only imported and created once a program calls one of them.
+SCHEDULER_NATIVES: Dict[str, Tuple[type, int]] = {
+    "spawn": (NativeFunction, 1),
+    "yield": (NativeFunction, 0),
+    "sleep": (NativeFunction, 1),
+    "Channel": (NativeClass, 0),
+}
+PROCESS_NATIVES: Dict[str, Tuple[type, int]] = {
+    "spawnProcess": (NativeFunction, 2),
+    "ProcessChannel": (NativeClass, 0),
+    "parallelMap": (NativeFunction, 3),
+}
+
+
+def _deferred(signatures: Dict[str, Tuple[type, int]], load: Callable[[], Natives]) -> Natives:
+    loaded: Natives = {}
+
+    def target(name: str) -> Callable[..., object]:
+        if not loaded:
+            loaded.update(load())
+        return loaded[name]
+
+    return {
+        name: kind(name, arity, lambda *args, name=name: target(name)(*args))
+        for name, (kind, arity) in signatures.items()
+    }
+
+
+def _scheduler_natives() -> Natives:
+    from pylox.scheduler import Scheduler
+
+    return Scheduler().natives()
+
+
+def init_global_env(stdlib: bool = False) -> Environment:
     env = Environment()
     env.define("clock", _Clock())
+    if stdlib:
+        from pylox.stdlib import STDLIB
+
+        def process_natives() -> Natives:
+            from pylox.processes import ProcessPool
+
+            env.process_pool = ProcessPool(env)
+            return env.process_pool.natives()
+
+        env.define_natives(STDLIB)
+        env.define_natives(_deferred(SCHEDULER_NATIVES, _scheduler_natives))
+        env.define_natives(_deferred(PROCESS_NATIVES, process_natives))
     return env
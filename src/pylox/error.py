@@ -1,2 +1,10 @@
+from contextvars import ContextVar
+from typing import Callable
+
+# Where diagnostics and print output go; set per interpreter instance (see lox.Lox).
+diagnostics: ContextVar[Callable[[str], None]] = ContextVar("diagnostics", default=print)
+output: ContextVar[Callable[[str], None]] = ContextVar("output", default=print)
+
+
 def error(location: int | str, message: str) -> None:
-    print(f"Error ({location}): {message}")
+    diagnostics.get()(f"Error ({location}): {message}")
@@ -1,8 +1,8 @@
 from dataclasses import dataclass, field
-from typing import List
+from typing import Any, Callable, List, Sequence
 
 from pylox.scanner import Token
-from pylox.iexpr import Stmt, Expr
+from pylox.iexpr import GlobalRef, Stmt, Expr
 
 
 @dataclass(slots=True, eq=True, frozen=True)
@@ -10,6 +10,8 @@ class Binary(Expr):
     left: Expr
     operator: Token
     right: Expr
+    # Operator implementation, specialized once by the parser.
+    op: Callable[[Any, Any], Any] = field(compare=False, repr=False)
 
 
 @dataclass(slots=True, eq=True, frozen=True)
@@ -26,17 +28,20 @@ class Literal(Expr):
 class Unary(Expr):
     operator: Token
     right: Expr
+    op: Callable[[Any], Any] = field(compare=False, repr=False)
 
 
 @dataclass(slots=True, eq=True, frozen=True)
 class Variable(Expr):
     name: Token
+    ref: GlobalRef = field(default_factory=GlobalRef, compare=False, repr=False)
 
 
 @dataclass(slots=True, eq=True, frozen=True)
 class Assign(Expr):
     name: Token
     value: Expr
+    ref: GlobalRef = field(default_factory=GlobalRef, compare=False, repr=False)
 
 
 @dataclass(slots=True, eq=True, frozen=True)
@@ -44,6 +49,21 @@ class Logical(Expr):
     left: Expr
     operator: Token
     right: Expr
+    # Truthiness of the left operand that short circuits: true for or, false for and.
+    short_circuit: bool | None = field(default=None, compare=False, repr=False)
+
+
+@dataclass(slots=True)
+class CallSite:
+    """Inline cache of a call site, filled in by the interpreter."""
+
+    # The last callee whose arity matched the call: a function's params, a class or a callable.
+    key: object = None
+    # The init method of a cached class, if it has one.
+    init: Any = None
+
+    def clear(self) -> None:
+        self.key = self.init = None
 
 
 @dataclass(slots=True, eq=True, frozen=True)
@@ -51,13 +71,15 @@ class Call(Expr):
     callee: Expr
     args: List[Expr]
     closing_paren: Token
+    site: CallSite = field(default_factory=CallSite, compare=False, repr=False)
 
 
 @dataclass(slots=True, eq=True, frozen=True)
 class Lambda(Expr):
     keyword: Token
     params: List[Token]
-    body: List[Stmt]
+    # A LazyBody when the parser deferred it.
+    body: Sequence[Stmt]
 
 
 @dataclass(slots=True, eq=True, frozen=True)
@@ -76,9 +98,11 @@ class Set(Expr):
 @dataclass(slots=True, eq=True, frozen=True)
 class This(Expr):
     name: Token
+    ref: GlobalRef = field(default_factory=GlobalRef, compare=False, repr=False)
 
 
 @dataclass(slots=True, eq=True, frozen=True)
 class Super(Expr):
     name: Token
     method: Token
+    ref: GlobalRef = field(default_factory=GlobalRef, compare=False, repr=False)
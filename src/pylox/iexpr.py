@@ -1,15 +1,39 @@
-from typing import Protocol
+from typing import Any, ClassVar, Dict, Protocol
 
 from pylox.scanner import Token
 
 
 class Expr:
-    pass
+    # Every node type is a dataclass.
+    __dataclass_fields__: ClassVar[Dict[str, Any]]
+
+
+class GlobalRef:
+    """The global cell a named reference resolved to, cached by the environment on first use.
+
+    scope is the globals dict the cell belongs to, so that a tree run against several global
+    environments never reads another one's cell.
+    """
+
+    __slots__ = ("scope", "cell")
+
+    def __init__(self):
+        self.scope: dict | None = None
+        self.cell = None
+
+    def clear(self) -> None:
+        self.scope = self.cell = None
 
 
 class NamedExpr(Protocol):
-    name: Token
+    @property
+    def name(self) -> Token:
+        ...
+
+    @property
+    def ref(self) -> GlobalRef:
+        ...
 
 
 class Stmt:
-    pass
+    __dataclass_fields__: ClassVar[Dict[str, Any]]
@@ -1,11 +1,14 @@
 from dataclasses import dataclass, field
-from typing import Any, Any, Dict, Iterable, List
+from inspect import isawaitable
+from typing import Any, Any, Awaitable, Dict, Generator, Iterable, List, Sequence
 
 from pylox.environment import Environment
+from pylox.error import output
 from pylox.expr import (
     Assign,
     Binary,
     Call,
+    CallSite,
     Expr,
     Get,
     Grouping,
@@ -18,27 +21,33 @@ from pylox.expr import (
     Variable,
     Set,
 )
+from pylox.operators import is_truthy
+from pylox.parser import ParseError
+from pylox.resolver import resolve_lazy_body
 from pylox.scanner import Token
-from pylox.runtime import LoxCallable, runtime_error
-from pylox.stmt import Block, Class, ExprStmt, Fun, If, Print, Return, Stmt, Var, While
-
-
-def _is_truthy(val: object):
-    return val not in [False, None]
-
-
-def _stringify(val: object) -> str:
-    if isinstance(val, bool):
-        return "true" if val else "false"
-
-    if val == None:
-        return "nil"
-
-    if isinstance(val, float):
-        str_val = str(val)
-        return str_val[:-2] if str_val.endswith(".0") else str_val
-
-    return str(val)
+from pylox.runtime import (
+    LoxCallable,
+    NativeClass,
+    NativeError,
+    NativeFunction,
+    NativeInstance,
+    Suspend,
+    runtime_error,
+    stringify,
+)
+from pylox.stmt import (
+    Block,
+    Class,
+    ExprStmt,
+    Fun,
+    If,
+    LazyBody,
+    Print,
+    Return,
+    Stmt,
+    Var,
+    While,
+)
 
 
 @dataclass
@@ -47,118 +56,68 @@ class _ReturnValue(Exception):
 
 
 def _interpret(expr_or_stmt: Expr | Stmt, env: Environment) -> object | None:
+    # Cases are tested in order, so the hottest expressions come first.
     match expr_or_stmt:
-        case Print(expr):
-            print(_stringify(_interpret(expr, env)))
-        case ExprStmt(expr):
-            _interpret(expr, env)
-        case Var(name, None):
-            env.define(name, None)
-        case Var(name, initializer):
-            env.define(name, _interpret(initializer, env))
-        case Class(name, superclass_var, method_stmts) as class_expr:
-            env.define(name, None)
-            superclass = _interpret(superclass_var, env)
-            if superclass:
-                env = env.create_child()
-                env.define("super", superclass)
-            methods: Dict[str, LoxFunction] = {}
-            for method in method_stmts:
-                methods[method.name.lexeme] = LoxFunction(method.params, method.body, env)
-            klass = LoxClass(name.lexeme, superclass, methods)
-            env.assign(class_expr, klass)
-        case Fun(name, params, body):
-            env.define(name, LoxFunction(params, body, env))
-        case Block(stmts):
-            interpret_block(stmts, env.create_child())
-        case If(condition, if_case, else_case):
-            if _interpret(condition, env):
-                _interpret(if_case, env)
-            elif else_case:
-                _interpret(else_case, env)
-        case While(condition, body):
-            while _is_truthy(_interpret(condition, env)):
-                _interpret(body, env)
-        case Return(_, None):
-            raise _ReturnValue(None)
-        case Return(_, expr):
-            raise _ReturnValue(_interpret(expr, env))
+        case Binary(left, _, right, op):
+            return op(_interpret(left, env), _interpret(right, env))
+        case Variable(name) as var:
+            return env.access(var)
         case Literal(val_expr):
             return val_expr
-        case Binary(left, operator, right):
-            lhs = _interpret(left, env)
-            rhs = _interpret(right, env)
-            match operator.lexeme:
-                case "+":
-                    return lhs + rhs
-                case "-":
-                    return lhs - rhs
-                case "*":
-                    return lhs * rhs
-                case "/":
-                    return lhs / rhs
-                case "<":
-                    return lhs < rhs
-                case ">":
-                    return lhs > rhs
-                case "<=":
-                    return lhs <= rhs
-                case ">=":
-                    return lhs >= rhs
-                case "==":
-                    return lhs == rhs
-                case "!=":
-                    return lhs != rhs
-                case _:
-                    raise runtime_error(operator, f"Unrecognized operator {operator.lexeme}")
-        case Unary(operator, right):
-            rhs = _interpret(right, env)
-            match operator.lexeme:
-                case "!":
-                    return not _is_truthy(rhs)
-                case "-":
-                    return -rhs
-        case Logical(left, operator, right):
-            lhs = _interpret(left, env)
-            match operator.lexeme:
-                case "and":
-                    if not _is_truthy(lhs):
-                        return lhs
-                case "or":
-                    if _is_truthy(lhs):
-                        return lhs
-            return _interpret(right, env)
-        case Call(callee_expr, arg_exprs, closing_paren):
-            func = _interpret(callee_expr, env)
-            if not isinstance(func, LoxCallable):
-                raise runtime_error(closing_paren, "Callee is not a function!")
-            if func.arity != len(arg_exprs):
-                raise runtime_error(closing_paren, "Wrong nargs!")
-            return func(*[_interpret(a, env) for a in arg_exprs])
-        case Grouping(expr):
-            return _interpret(expr, env)
         case Assign(name, val_expr) as assign_var:
             val = _interpret(val_expr, env)
             env.assign(assign_var, val)
             return val
-        case Variable(name) as var:
-            return env.access(var)
-        case Lambda(_, params, body):
-            return LoxFunction(params, body, env)
+        case Logical(left, _, right, short_circuit):
+            lhs = _interpret(left, env)
+            if is_truthy(lhs) is short_circuit:
+                return lhs
+            return _interpret(right, env)
+        case Unary(_, right, op):
+            return op(_interpret(right, env))
+        case Call(callee_expr, arg_exprs, closing_paren, site):
+            func: Any = _interpret(callee_expr, env)
+            kind = func.__class__
+            if kind is LoxFunction:
+                if func.params is not site.key:
+                    _check_call(site, func, len(arg_exprs), closing_paren)
+                return func.call([_interpret(a, env) for a in arg_exprs])
+            if kind is LoxClass:
+                if func is not site.key:
+                    _check_call(site, func, len(arg_exprs), closing_paren)
+                instance = LoxInstance(func)
+                if init := site.init:
+                    _bind(init, instance).call([_interpret(a, env) for a in arg_exprs])
+                return instance
+            if kind is NativeFunction or kind is NativeClass:
+                # Natives are often bound methods made afresh by each Get; their arity is a field.
+                if func.arity != len(arg_exprs):
+                    raise runtime_error(closing_paren, "Wrong nargs!")
+            elif func is not site.key:
+                _check_call(site, func, len(arg_exprs), closing_paren)
+            args = [_interpret(a, env) for a in arg_exprs]
+            try:
+                return func(*args)
+            except NativeError as e:
+                raise runtime_error(closing_paren, str(e))
         case Get(obj_expr, name):
             obj_val = _interpret(obj_expr, env)
-            if isinstance(obj_val, LoxInstance):
+            if isinstance(obj_val, LoxInstance | NativeInstance):
                 return obj_val[name]
             else:
                 raise runtime_error(name, "Only instances have fields.")
         case Set(obj_expr, name, val_expr):
             obj_val = _interpret(obj_expr, env)
-            if isinstance(obj_val, LoxInstance):
+            if isinstance(obj_val, LoxInstance | NativeInstance):
                 obj_val[name] = _interpret(val_expr, env)
             else:
                 raise runtime_error(name, "Only instances have fields.")
+        case Grouping(expr):
+            return _interpret(expr, env)
         case This(_) as this_expr:
             return env.access(this_expr)
+        case Lambda(keyword, params, body):
+            return LoxFunction(params, body, env.closure(keyword))
         case Super(name, method) as super_expr:
             superclass = env.access(super_expr)
             if isinstance(superclass, LoxClass):
@@ -167,29 +126,106 @@ def _interpret(expr_or_stmt: Expr | Stmt, env: Environment) -> object | None:
                     method = _lookup_method(superclass, method.lexeme)
                     return _bind(method, this)
             raise runtime_error(name, "Invalid super expression.")
+        case ExprStmt(expr):
+            _interpret(expr, env)
+        case If(condition, if_case, else_case):
+            if is_truthy(_interpret(condition, env)):
+                _interpret(if_case, env)
+            elif else_case:
+                _interpret(else_case, env)
+        case While(condition, body):
+            while is_truthy(_interpret(condition, env)):
+                _interpret(body, env)
+        case Block(stmts):
+            interpret_block(stmts, env.create_child())
+        case Print(expr):
+            output.get()(stringify(_interpret(expr, env)))
+        case Var(name, None):
+            env.define(name, None)
+        case Var(name, initializer):
+            env.define(name, _interpret(initializer, env))
+        case Return(_, None):
+            raise _ReturnValue(None)
+        case Return(_, expr):
+            raise _ReturnValue(_interpret(expr, env))
+        case Fun(name, params, body):
+            env.define(name, None)
+            env.initialize(name, LoxFunction(params, body, env.closure(name)))
+        case Class(name, superclass_var, method_stmts):
+            env.define(name, None)
+            superclass = _interpret(superclass_var, env)
+            # Mirror the resolver's scopes, so methods capture super and this at known depths.
+            class_env = env
+            if superclass:
+                class_env = class_env.create_child()
+                class_env.define("super", superclass)
+            class_env = class_env.create_child()
+            class_env.define("this", None)
+            methods: Dict[str, LoxFunction] = {}
+            for method_stmt in method_stmts:
+                methods[method_stmt.name.lexeme] = LoxFunction(
+                    method_stmt.params, method_stmt.body, class_env.closure(method_stmt.name)
+                )
+            env.initialize(name, LoxClass(name.lexeme, superclass, methods))
+
+
+def _check_call(site: CallSite, func: object, nargs: int, closing_paren: Token) -> None:
+    # Slow path of a call site: verify the callee, then cache it so its next calls skip this.
+    if not isinstance(func, LoxCallable):
+        raise runtime_error(closing_paren, "Callee is not a function!")
+    if func.arity != nargs:
+        raise runtime_error(closing_paren, "Wrong nargs!")
+    match func:
+        case LoxFunction():
+            # Closures made from the same declaration share their params.
+            site.key = func.params
+        case LoxClass():
+            site.key, site.init = func, func._init_method()
+        case _:
+            site.key = func
 
 
 @dataclass(slots=True)
 class LoxFunction:
     params: List[Token]
-    body: List[Stmt]
+    body: Sequence[Stmt]
     env: Environment
 
     @property
     def arity(self) -> int:
         return len(self.params)
 
-    def __call__(self, *args):
+    def call_env(self, args: Iterable[Any]) -> Environment:
+        if self.body.__class__ is LazyBody:
+            self._load_body()
         call_env = self.env.create_child()
         for token, value in zip(self.params, args):
             call_env.define(token, value)
+        return call_env
 
+    def _load_body(self) -> None:
+        body = self.body
+        if not isinstance(body, LazyBody):
+            return
+        try:
+            bindings = resolve_lazy_body(self.params, body)
+        except ParseError:
+            raise RuntimeError("Function body does not parse.")
+        # The body's own bindings cover every reference in it that is not global.
+        self.body = body.stmts()
+        self.env = self.env.with_bindings(bindings)
+
+    def call(self, args: Sequence[Any]) -> Any:
         try:
+            call_env = self.call_env(args)
             interpret_block(self.body, call_env)
         except _ReturnValue as ret:
             return ret.value
         return None
 
+    def __call__(self, *args):
+        return self.call(args)
+
 
 @dataclass(slots=True)
 class LoxClass:
@@ -209,8 +245,7 @@ class LoxClass:
     def __call__(self, *args):
         instance = LoxInstance(self)
         if init := self._init_method():
-            init = _bind(self._init_method(), instance)
-            init(*args)
+            _bind(init, instance).call(args)
         return instance
 
     def __str__(self):
@@ -247,8 +282,10 @@ class LoxInstance:
 
 
 def _bind(function: LoxFunction, instance: LoxInstance) -> LoxFunction:
-    env = function.env.create_child()
-    env.define("this", instance)
+    if function.body.__class__ is LazyBody and function.body.bindings is not None:
+        # Resolved through an earlier bound copy: share the loaded body from now on.
+        function._load_body()
+    env = function.env.with_capture("this", instance)
     return LoxFunction(function.params, function.body, env)
 
 
@@ -262,3 +299,134 @@ def interpret(stmts: Iterable[Stmt], env: Environment) -> None:
         interpret_block(stmts, env)
     except RuntimeError:
         pass
+
+
+def evaluate(expr: Expr, env: Environment) -> object:
+    """The value of expr; a runtime error is reported and raised as RuntimeError."""
+    return _interpret(expr, env)
+
+
+# Resumable interpreter: the same semantics as _interpret, written as generators that yield
+# None at every call and loop iteration and forward Suspend requests and awaitables returned by
+# natives, so a driver (a scheduler or an event loop) can interleave execution. The recursive
+# fast path is unchanged.
+Steps = Generator[Suspend | Awaitable[Any] | None, Any, Any]
+
+
+def _call_steps(func: Any, args: List[Any], closing_paren: Token | None) -> Steps:
+    yield None
+    match func:
+        case LoxFunction():
+            try:
+                call_env = func.call_env(args)
+                yield from _block_steps(func.body, call_env)
+            except _ReturnValue as ret:
+                return ret.value
+            return None
+        case LoxClass():
+            instance = LoxInstance(func)
+            if init := func._init_method():
+                yield from _call_steps(_bind(init, instance), args, closing_paren)
+            return instance
+    try:
+        result = func(*args)
+        if isinstance(result, Suspend) or isawaitable(result):
+            # The driver either sends the result back or throws a NativeError in.
+            result = yield result
+    except NativeError as e:
+        if closing_paren is None:
+            raise
+        raise runtime_error(closing_paren, str(e))
+    return result
+
+
+def _interpret_steps(expr_or_stmt: Expr | Stmt, env: Environment) -> Steps:
+    match expr_or_stmt:
+        case Binary(left, _, right, op):
+            lhs = yield from _interpret_steps(left, env)
+            return op(lhs, (yield from _interpret_steps(right, env)))
+        case Assign(name, val_expr) as assign_var:
+            val = yield from _interpret_steps(val_expr, env)
+            env.assign(assign_var, val)
+            return val
+        case Logical(left, _, right, short_circuit):
+            lhs = yield from _interpret_steps(left, env)
+            if is_truthy(lhs) is short_circuit:
+                return lhs
+            return (yield from _interpret_steps(right, env))
+        case Unary(_, right, op):
+            return op((yield from _interpret_steps(right, env)))
+        case Call(callee_expr, arg_exprs, closing_paren, site):
+            func: Any = yield from _interpret_steps(callee_expr, env)
+            kind = func.__class__
+            if kind is LoxFunction:
+                if func.params is not site.key:
+                    _check_call(site, func, len(arg_exprs), closing_paren)
+            elif kind is LoxClass:
+                if func is not site.key:
+                    _check_call(site, func, len(arg_exprs), closing_paren)
+            elif kind is NativeFunction or kind is NativeClass:
+                if func.arity != len(arg_exprs):
+                    raise runtime_error(closing_paren, "Wrong nargs!")
+            elif func is not site.key:
+                _check_call(site, func, len(arg_exprs), closing_paren)
+            args = []
+            for a in arg_exprs:
+                args.append((yield from _interpret_steps(a, env)))
+            if kind is LoxClass:
+                instance = LoxInstance(func)
+                if init := site.init:
+                    yield from _call_steps(_bind(init, instance), args, closing_paren)
+                return instance
+            return (yield from _call_steps(func, args, closing_paren))
+        case Get(obj_expr, name):
+            obj_val = yield from _interpret_steps(obj_expr, env)
+            if isinstance(obj_val, LoxInstance | NativeInstance):
+                return obj_val[name]
+            raise runtime_error(name, "Only instances have fields.")
+        case Set(obj_expr, name, val_expr):
+            obj_val = yield from _interpret_steps(obj_expr, env)
+            if isinstance(obj_val, LoxInstance | NativeInstance):
+                obj_val[name] = yield from _interpret_steps(val_expr, env)
+            else:
+                raise runtime_error(name, "Only instances have fields.")
+        case Grouping(expr) | ExprStmt(expr):
+            return (yield from _interpret_steps(expr, env))
+        case If(condition, if_case, else_case):
+            if is_truthy((yield from _interpret_steps(condition, env))):
+                yield from _interpret_steps(if_case, env)
+            elif else_case:
+                yield from _interpret_steps(else_case, env)
+        case While(condition, body):
+            while is_truthy((yield from _interpret_steps(condition, env))):
+                yield from _interpret_steps(body, env)
+                yield None
+        case Block(stmts):
+            yield from _block_steps(stmts, env.create_child())
+        case Print(expr):
+            output.get()(stringify((yield from _interpret_steps(expr, env))))
+        case Var(name, initializer) if initializer is not None:
+            env.define(name, (yield from _interpret_steps(initializer, env)))
+        case Return(_, expr) if expr is not None:
+            raise _ReturnValue((yield from _interpret_steps(expr, env)))
+        case _:
+            # Leaves and declarations never call back into lox code.
+            return _interpret(expr_or_stmt, env)
+
+
+def _block_steps(stmts: Iterable[Stmt], env: Environment) -> Steps:
+    for stmt in stmts:
+        yield from _interpret_steps(stmt, env)
+
+
+def call_steps(func: LoxCallable, args: List[Any]) -> Steps:
+    """Resumable call of func from host code; NativeError from a native func propagates."""
+    return _call_steps(func, args, None)
+
+
+def interpret_steps(stmts: Iterable[Stmt], env: Environment) -> Steps:
+    """Resumable interpret; runtime errors are reported and end the program, as in interpret."""
+    try:
+        yield from _block_steps(stmts, env)
+    except RuntimeError:
+        pass
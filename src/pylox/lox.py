@@ -1,36 +1,152 @@
 from argparse import ArgumentParser
+from dataclasses import dataclass
 from pathlib import Path
+from threading import Lock
+from typing import Callable, List, Tuple
+
 from pylox.environment import Environment, init_global_env
+from pylox.error import diagnostics, output
 
 from pylox.parser import parse
 from pylox.interpreter import interpret
-from pylox.resolver import resolve
+from pylox.resolver import Bindings, Resolver, ResolverSession, resolve
+from pylox.expr import Assign, Call, Super, This, Variable
 from pylox.scanner import scan_tokens
+from pylox.stmt import Fun, LazyBody, Stmt
+from pylox.traversal import Node, children
 
 
-def run(input: str, env: Environment = None) -> None:
-    env = env or init_global_env()
+def load(
+    input: str,
+    env: Environment,
+    resolver: ResolverSession | None = None,
+    lazy: bool = False,
+    fused: bool = False,
+) -> List[Stmt]:
+    """Scan, parse and resolve input; fused resolves while parsing instead of in a second pass."""
     tokens = scan_tokens(input)
-    program = list(parse(tokens))
-    bindings = resolve(program)
+    if fused:
+        fused_resolver = Resolver(resolver)
+        program = list(parse(tokens, lazy, fused_resolver))
+        bindings = fused_resolver.bindings
+    else:
+        program = list(parse(tokens, lazy))
+        bindings = resolve(program, resolver)
     env.merge_bindings(bindings)
-    interpret(program, env)
+    return program
+
+
+@dataclass(frozen=True)
+class Program:
+    """A scanned, parsed and resolved program that can run against any number of environments.
+
+    Its nodes hold inline caches, so one program must not run in several threads at once.
+    """
+
+    stmts: List[Stmt]
+    bindings: Bindings
+    # Reported while compiling; reported again by every run.
+    diagnostics: Tuple[str, ...]
+
+    def run(self, env: Environment) -> None:
+        report = diagnostics.get()
+        for message in self.diagnostics:
+            report(message)
+        interpret(self.stmts, env.with_bindings(self.bindings))
+
+    def clear_caches(self) -> None:
+        """Drop the globals and callees the last run cached in the tree, so they can be freed."""
+        stack: List[Node] = list(self.stmts)
+        while stack:
+            node = stack.pop()
+            match node:
+                case Variable(ref=ref) | Assign(ref=ref) | This(ref=ref) | Super(ref=ref):
+                    ref.clear()
+                case Call(site=site):
+                    site.clear()
+                case Fun(body=LazyBody() as body) if not body.parsed:
+                    continue
+            stack.extend(children(node))
+
+
+def compile_program(input: str, lazy: bool = False) -> Program:
+    reported: List[str] = []
+    token = diagnostics.set(reported.append)
+    try:
+        stmts = list(parse(scan_tokens(input), lazy))
+        bindings = resolve(stmts)
+    finally:
+        diagnostics.reset(token)
+    return Program(stmts, bindings, tuple(reported))
 
 
-def run_file(input_path: Path) -> None:
+def run(input: str, env: Environment | None = None, lazy: bool = False) -> None:
+    # Each input resolves into its own bindings: tokens from separate inputs can compare equal.
+    env = (env or init_global_env()).with_bindings(Bindings())
+    interpret(load(input, env, lazy=lazy), env)
+
+
+class Lox:
+    """An interpreter instance that owns its globals, bindings, diagnostics and output.
+
+    Instances share no mutable state, so separate instances can run in parallel threads.
+    """
+
+    def __init__(
+        self,
+        stdlib: bool = False,
+        output: Callable[[str], None] = print,
+        on_error: Callable[[str], None] | None = None,
+    ):
+        self.globals = init_global_env(stdlib)
+        self.diagnostics: List[str] = []
+        self._output = output
+        self._on_error = on_error
+        self._lock = Lock()
+
+    def _report(self, message: str) -> None:
+        self.diagnostics.append(message)
+        if self._on_error:
+            self._on_error(message)
+
+    def run(self, input: str) -> bool:
+        """Run input against this instance's globals; False if it reported any errors."""
+        with self._lock:
+            reported = len(self.diagnostics)
+            diagnostics_token = diagnostics.set(self._report)
+            output_token = output.set(self._output)
+            try:
+                self._execute(input)
+            finally:
+                output.reset(output_token)
+                diagnostics.reset(diagnostics_token)
+            return len(self.diagnostics) == reported
+
+    def _execute(self, input: str) -> None:
+        run(input, self.globals)
+
+    def close(self) -> None:
+        """Stop the worker processes the program started, if any."""
+        if self.globals.process_pool is not None:
+            self.globals.process_pool.shutdown()
+
+
+def run_file(input_path: Path, stdlib: bool = False, lazy: bool = False) -> None:
     with open(input_path) as file:
         input_text = file.read()
-        run(input_text)
+        run(input_text, init_global_env(stdlib), lazy)
+
 
+def run_prompt(stdlib: bool = False) -> None:
+    from pylox.session import Session
 
-def run_prompt() -> None:
-    env = init_global_env()
+    session = Session(stdlib, on_error=print)
     try:
         while True:
             print("> ", end="")
             line = input()
             if line:
-                run(line, env)
+                session.run(line)
     except KeyboardInterrupt:
         print("--=Exiting pylox.=--")
 
@@ -38,9 +154,13 @@ def run_prompt() -> None:
 if __name__ == "__main__":
     parser = ArgumentParser(description="pylox lox interpreter")
     parser.add_argument("path", help="file to interpret", nargs="?")
+    parser.add_argument("--stdlib", help="load the native standard library", action="store_true")
+    parser.add_argument(
+        "--lazy", help="parse function bodies on their first call", action="store_true"
+    )
     args = parser.parse_args()
 
     if args.path:
-        run_file(Path(args.path))
+        run_file(Path(args.path), args.stdlib, args.lazy)
     else:
-        run_prompt()
+        run_prompt(args.stdlib)
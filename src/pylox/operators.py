@@ -0,0 +1,58 @@
+import operator
+from typing import Any, Callable, Dict
+
+from pylox.runtime import is_equal
+from pylox.scanner import TokenType
+from pylox.strings import Rope, concat
+
+# Operands are any lox values; type errors are python's.
+BinaryOp = Callable[[Any, Any], Any]
+UnaryOp = Callable[[Any], Any]
+
+
+def is_truthy(val: object) -> bool:
+    return val is not None and val is not False
+
+
+def _add(lhs: Any, rhs: Any) -> object:
+    if lhs.__class__ is float and rhs.__class__ is float:
+        return lhs + rhs
+    if isinstance(lhs, str | Rope) and isinstance(rhs, str | Rope):
+        return concat(lhs, rhs)
+    return lhs + rhs
+
+
+def _equal(lhs: object, rhs: object) -> bool:
+    if lhs is rhs:
+        # Interned strings, nil and booleans; only NaN is not equal to itself.
+        return lhs.__class__ is not float or lhs == lhs
+    if lhs.__class__ is rhs.__class__:
+        return lhs == rhs
+    return is_equal(lhs, rhs)
+
+
+def _not_equal(lhs: object, rhs: object) -> bool:
+    return not _equal(lhs, rhs)
+
+
+def _not(rhs: object) -> bool:
+    return rhs is None or rhs is False
+
+
+BINARY_OPERATORS: Dict[TokenType, BinaryOp] = {
+    TokenType.PLUS: _add,
+    TokenType.MINUS: operator.sub,
+    TokenType.STAR: operator.mul,
+    TokenType.SLASH: operator.truediv,
+    TokenType.LESS: operator.lt,
+    TokenType.GREATER: operator.gt,
+    TokenType.LESS_EQUAL: operator.le,
+    TokenType.GREATER_EQUAL: operator.ge,
+    TokenType.EQUAL_EQUAL: _equal,
+    TokenType.BANG_EQUAL: _not_equal,
+}
+
+UNARY_OPERATORS: Dict[TokenType, UnaryOp] = {
+    TokenType.BANG: _not,
+    TokenType.MINUS: operator.neg,
+}
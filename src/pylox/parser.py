@@ -1,4 +1,5 @@
-from typing import Iterable, List, Tuple
+from enum import IntEnum, auto
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
 
 from pylox.error import error
 from pylox.expr import (
@@ -17,38 +18,80 @@ from pylox.expr import (
     Variable,
     Set,
 )
-from pylox.scanner import Token, TokenType
-from pylox.stmt import Block, Class, ExprStmt, Fun, If, Print, Return, Stmt, Var, While
+from pylox.operators import BINARY_OPERATORS, UNARY_OPERATORS
+from pylox.scanner import Token, TokenBuffer, TokenType
+from pylox.resolver import GlobalKind, Resolver
+from pylox.stmt import (
+    Block,
+    Class,
+    ExprStmt,
+    Fun,
+    If,
+    LazyBody,
+    Print,
+    Return,
+    Stmt,
+    Var,
+    While,
+)
 
 
 class ParseError(Exception):
     pass
 
 
+def _binary(left: Expr, operator: Token, right: Expr) -> Binary:
+    return Binary(left, operator, right, BINARY_OPERATORS[operator.token])
+
+
+def _logical(left: Expr, operator: Token, right: Expr) -> Logical:
+    return Logical(left, operator, right, operator.token == TokenType.OR)
+
+
 class _ParseView:
-    def __init__(self, tokens: Iterable[Token]):
-        self._tokens = list(tokens)
-        self._current = 0
+    """Reads a TokenBuffer, building Token objects only for the tokens it returns."""
+
+    def __init__(
+        self,
+        tokens: TokenBuffer,
+        start: int = 0,
+        end: int | None = None,
+        lazy=False,
+        resolver: Resolver | None = None,
+    ):
+        self._tokens = tokens
+        self._types = tokens.types
+        self._count = len(tokens) if end is None else end
+        self._current = start
+        self.lazy = lazy
+        # In fused mode, resolves the nodes as they are built.
+        self.resolver = resolver
+        # Scopes enclosing the current position, as the resolver will see them.
+        self.depth = 0
 
     def is_at_end(self) -> bool:
-        return self._current >= len(self._tokens)
+        return self._current >= self._count
 
     def peek(self) -> Token | None:
         if self.is_at_end():
             return None
         return self._tokens[self._current]
 
-    def check(self, expected: TokenType) -> Token | None:
-        token = self.peek()
-        if token and token.token == expected:
-            return token
-        return None
+    def check(self, expected: TokenType) -> bool:
+        return not self.is_at_end() and self._tokens.type_at(self._current) is expected
 
-    def check_ahead(self, n: int, expected: TokenType) -> Token | None:
+    def check_ahead(self, n: int, expected: TokenType) -> bool:
         i = self._current + n
-        if i <= len(self._tokens) and self._tokens[i].token == expected:
-            return self._tokens[i]
-        return None
+        return i < self._count and self._tokens.type_at(i) is expected
+
+    def peek_code(self) -> int:
+        """The TokenType value of the next token, 0 at the end."""
+        if self._current >= self._count:
+            return 0
+        return self._types[self._current]
+
+    def skip(self) -> None:
+        self._current += 1
 
     def advance(self) -> Token:
         val = self.peek()
@@ -56,271 +99,413 @@ class _ParseView:
         return val
 
     def match(self, *tokens: TokenType) -> Token | None:
-        token = self.peek()
-        if token and token.token in tokens:
+        if not self.is_at_end() and self._tokens.type_at(self._current) in tokens:
             return self.advance()
         return None
 
+    def skip_block(self) -> int:
+        """Skip to the brace closing the current block; the index of the closing brace."""
+        types = self._types
+        left, right = TokenType.LEFT_BRACE.value, TokenType.RIGHT_BRACE.value
+        nesting = 0
+        i = self._current
+        while i < self._count:
+            code = types[i]
+            if code == right:
+                if nesting == 0:
+                    self._current = i
+                    return i
+                nesting -= 1
+            elif code == left:
+                nesting += 1
+            i += 1
+        self._current = i
+        raise self._error(self._tokens[-1], "Expected '}'.")
+
     def _error(self, token: Token, message: str) -> ParseError:
-        error(token.line, message)
+        error(token.location, message)
         return ParseError()
 
+    def accept(self, *tokens: TokenType) -> bool:
+        """Like match, for when the token itself is not needed."""
+        if self._current < self._count and self._tokens.type_at(self._current) in tokens:
+            self._current += 1
+            return True
+        return False
+
+    def expect(self, expected: TokenType, message: str) -> None:
+        """Like consume, for when the token itself is not needed."""
+        if not self.check(expected):
+            self.consume(expected, message)
+        self._current += 1
+
     def consume(self, expected: TokenType, message: str) -> Token:
-        token = self.peek()
-        if token and token.token == expected:
+        if self.check(expected):
             return self.advance()
 
-        raise self._error(token or self._tokens[-1], message)
-
-
-def _primary(parser: _ParseView) -> Expr:
-    if parser.match(TokenType.TRUE):
-        return Literal(True)
-    if parser.match(TokenType.FALSE):
-        return Literal(False)
-    if token := parser.match(TokenType.THIS):
-        return This(token)
-    if token := parser.match(TokenType.SUPER):
-        parser.consume(TokenType.DOT, "Expect '.' after super expression.")
-        method = parser.consume(TokenType.IDENTIFIER, "Expect super class method name")
-        return Super(token, method)
-    if parser.match(TokenType.NIL):
-        return Literal(None)
-    if token := parser.match(TokenType.NUMBER, TokenType.STRING):
-        return Literal(token.literal)
-    if parser.match(TokenType.LEFT_PAREN):
-        expr = _expression(parser)
-        parser.consume(TokenType.RIGHT_PAREN, "Unterminated grouping")
-        return Grouping(expr)
-    if identifier := parser.match(TokenType.IDENTIFIER):
-        return Variable(identifier)
-    if fun := parser.match(TokenType.FUN):
-        params, body = _parse_fun_defn(parser)
-        return Lambda(fun, params, body)
-
-
-def _finish_call(parser: _ParseView, callee: Expr):
-    args: List[Expr] = []
-    if not parser.check(TokenType.RIGHT_PAREN):
-        while True:
-            args.append(_expression(parser))
-            if parser.check(TokenType.RIGHT_PAREN):
-                break
-            parser.consume(TokenType.COMMA, "Expected ','.")
-
-    return Call(callee, args, parser.consume(TokenType.RIGHT_PAREN, "Expected ')'."))
-
-
-def _call(parser: _ParseView) -> Expr:
-    expr = _primary(parser)
-
-    while True:
-        if parser.match(TokenType.LEFT_PAREN):
-            expr = _finish_call(parser, expr)
-        elif parser.match(TokenType.DOT):
-            name = parser.consume(TokenType.IDENTIFIER, "Expect property name after '.'.")
-            expr = Get(expr, name)
-        else:
-            break
-
-    return expr
+        # At the end of a bounded view, point at the token that ends it.
+        raise self._error(self._tokens[min(self._current, len(self._tokens) - 1)], message)
 
 
-def _unary(parser: _ParseView) -> Expr:
-    if operator := parser.match(TokenType.BANG, TokenType.MINUS):
-        right = _unary(parser)
-        return Unary(operator, right)
+class _Precedence(IntEnum):
+    NONE = auto()
+    ASSIGNMENT = auto()
+    OR = auto()
+    AND = auto()
+    EQUALITY = auto()
+    COMPARISON = auto()
+    TERM = auto()
+    FACTOR = auto()
+    UNARY = auto()
+    CALL = auto()
 
-    return _call(parser)
 
+def _literal(value: object) -> Callable[[_ParseView], Expr]:
+    def parse_literal(parser: _ParseView) -> Expr:
+        parser.skip()
+        return Literal(value)
 
-def _factor(parser: _ParseView) -> Expr:
-    expr = _unary(parser)
+    return parse_literal
 
-    while operator := parser.match(TokenType.SLASH, TokenType.STAR):
-        right = _unary(parser)
-        expr = Binary(expr, operator, right)
 
-    return expr
+def _token_literal(parser: _ParseView) -> Expr:
+    return Literal(parser.advance().literal)
 
 
-def _term(parser: _ParseView) -> Expr:
-    expr = _factor(parser)
+def _variable(parser: _ParseView) -> Expr:
+    variable = Variable(parser.advance())
+    if resolver := parser.resolver:
+        resolver.bind(variable)
+    return variable
 
-    while operator := parser.match(TokenType.PLUS, TokenType.MINUS):
-        right = _factor(parser)
-        expr = Binary(expr, operator, right)
 
-    return expr
+def _this(parser: _ParseView) -> Expr:
+    this = This(parser.advance())
+    if resolver := parser.resolver:
+        resolver.bind(this)
+    return this
 
 
-def _comparison(parser: _ParseView) -> Expr:
-    expr = _term(parser)
+def _super(parser: _ParseView) -> Expr:
+    token = parser.advance()
+    parser.expect(TokenType.DOT, "Expect '.' after super expression.")
+    method = parser.consume(TokenType.IDENTIFIER, "Expect super class method name")
+    super = Super(token, method)
+    if resolver := parser.resolver:
+        resolver.bind_super(super)
+    return super
 
-    while operator := parser.match(
-        TokenType.GREATER, TokenType.GREATER_EQUAL, TokenType.LESS, TokenType.LESS_EQUAL
-    ):
-        right = _term(parser)
-        expr = Binary(expr, operator, right)
-
-    return expr
-
-
-def _equality(parser: _ParseView) -> Expr:
-    expr = _comparison(parser)
 
-    while operator := parser.match(TokenType.BANG_EQUAL, TokenType.EQUAL_EQUAL):
-        right = _comparison(parser)
-        expr = Binary(expr, operator, right)
+def _lambda(parser: _ParseView) -> Expr:
+    fun = parser.advance()
+    params, body = _parse_fun_defn(parser, fun, ())
+    return Lambda(fun, params, body)
 
-    return expr
 
+def _binary_rule(precedence: int) -> Callable[[_ParseView, Expr], Expr]:
+    def parse_binary(parser: _ParseView, left: Expr) -> Expr:
+        operator = parser.advance()
+        return _binary(left, operator, _parse_precedence(parser, precedence + 1))
 
-def _and(parser: _ParseView) -> Expr:
-    expr = _equality(parser)
+    return parse_binary
 
-    while operator := parser.match(TokenType.AND):
-        right = _equality(parser)
-        expr = Logical(expr, operator, right)
 
-    return expr
+def _logical_rule(precedence: int) -> Callable[[_ParseView, Expr], Expr]:
+    def parse_logical(parser: _ParseView, left: Expr) -> Expr:
+        operator = parser.advance()
+        return _logical(left, operator, _parse_precedence(parser, precedence + 1))
 
+    return parse_logical
 
-def _or(parser: _ParseView) -> Expr:
-    expr = _and(parser)
 
-    while operator := parser.match(TokenType.OR):
-        right = _and(parser)
-        expr = Logical(expr, operator, right)
-
-    return expr
-
-
-def _assignment(parser: _ParseView) -> Expr:
-    expr = _or(parser)
+def _finish_call(parser: _ParseView, callee: Expr) -> Expr:
+    parser.skip()
+    args: List[Expr] = []
+    if not parser.check(TokenType.RIGHT_PAREN):
+        while True:
+            args.append(_expression(parser))
+            if parser.check(TokenType.RIGHT_PAREN):
+                break
+            parser.expect(TokenType.COMMA, "Expected ','.")
 
-    if equals := parser.match(TokenType.EQUAL):
-        value = _assignment(parser)
+    return Call(callee, args, parser.consume(TokenType.RIGHT_PAREN, "Expected ')'."))
 
-        if isinstance(expr, Variable):
-            return Assign(expr.name, value)
-        elif isinstance(expr, Get):
-            return Set(expr.object, expr.name, value)
 
-        parser._error(equals, "Invalid assignment target")
+def _get(parser: _ParseView, obj: Expr) -> Expr:
+    parser.skip()
+    name = parser.consume(TokenType.IDENTIFIER, "Expect property name after '.'.")
+    return Get(obj, name)
+
+
+def _assignment(parser: _ParseView, target: Expr) -> Expr:
+    equals = parser.advance()
+    # Right associative: the value may itself be an assignment.
+    value = _parse_precedence(parser, _Precedence.ASSIGNMENT)
+
+    if isinstance(target, Variable):
+        assign = Assign(target.name, value)
+        if resolver := parser.resolver:
+            resolver.bind(assign, assigned=True)
+        return assign
+    elif isinstance(target, Get):
+        return Set(target.object, target.name, value)
+
+    parser._error(equals, "Invalid assignment target")
+    return target
+
+
+_PREFIX_RULES: Dict[TokenType, Callable[[_ParseView], Expr]] = {
+    TokenType.TRUE: _literal(True),
+    TokenType.FALSE: _literal(False),
+    TokenType.NIL: _literal(None),
+    TokenType.NUMBER: _token_literal,
+    TokenType.STRING: _token_literal,
+    TokenType.IDENTIFIER: _variable,
+    TokenType.THIS: _this,
+    TokenType.SUPER: _super,
+    TokenType.FUN: _lambda,
+}
+
+_INFIX_RULES: Dict[TokenType, Tuple[_Precedence, Callable[[_ParseView, Expr], Expr]]] = {
+    TokenType.EQUAL: (_Precedence.ASSIGNMENT, _assignment),
+    TokenType.OR: (_Precedence.OR, _logical_rule(_Precedence.OR)),
+    TokenType.AND: (_Precedence.AND, _logical_rule(_Precedence.AND)),
+    **{
+        token: (precedence, _binary_rule(precedence))
+        for precedence, tokens in [
+            (_Precedence.EQUALITY, [TokenType.BANG_EQUAL, TokenType.EQUAL_EQUAL]),
+            (
+                _Precedence.COMPARISON,
+                [
+                    TokenType.GREATER,
+                    TokenType.GREATER_EQUAL,
+                    TokenType.LESS,
+                    TokenType.LESS_EQUAL,
+                ],
+            ),
+            (_Precedence.TERM, [TokenType.PLUS, TokenType.MINUS]),
+            (_Precedence.FACTOR, [TokenType.SLASH, TokenType.STAR]),
+        ]
+        for token in tokens
+    },
+    TokenType.LEFT_PAREN: (_Precedence.CALL, _finish_call),
+    TokenType.DOT: (_Precedence.CALL, _get),
+}
+
+
+# The rule tables indexed by token type value, as stored in the token buffer.
+_PREFIX_TABLE = [_PREFIX_RULES.get(token) for token in (None, *TokenType)]
+_INFIX_TABLE = [_INFIX_RULES.get(token) for token in (None, *TokenType)]
+
+
+_LEFT_PAREN = TokenType.LEFT_PAREN.value
+_UNARY_CODES = (TokenType.BANG.value, TokenType.MINUS.value)
+
+
+def _parse_precedence(parser: _ParseView, precedence: int) -> Expr:
+    # Groupings and unary operators are opened on a stack instead of parsed recursively, so
+    # nesting them costs no Python frames. Each entry holds the unary operator, or None for a
+    # grouping, and the precedence to resume at once its operand is parsed.
+    opened: List[Tuple[Token | None, int]] = []
+    while True:
+        code = parser.peek_code()
+        if code == _LEFT_PAREN:
+            parser.skip()
+            opened.append((None, precedence))
+            precedence = _Precedence.ASSIGNMENT
+        elif code in _UNARY_CODES:
+            opened.append((parser.advance(), precedence))
+            precedence = _Precedence.UNARY
+        else:
+            break
 
-    return expr
+    prefix = _PREFIX_TABLE[parser.peek_code()]
+    expr = prefix(parser) if prefix else None
+    while True:
+        if expr is not None:
+            while (rule := _INFIX_TABLE[parser.peek_code()]) and rule[0] >= precedence:
+                expr = rule[1](parser, expr)
+        if not opened:
+            return expr
+        operator, precedence = opened.pop()
+        if operator is None:
+            parser.expect(TokenType.RIGHT_PAREN, "Unterminated grouping")
+            expr = Grouping(expr)
+        else:
+            expr = Unary(operator, expr, UNARY_OPERATORS[operator.token])
 
 
 def _expression(parser: _ParseView) -> Expr:
-    return _assignment(parser)
+    return _parse_precedence(parser, _Precedence.ASSIGNMENT)
 
 
 def _block(parser: _ParseView) -> Iterable[Stmt]:
-    while not (parser.is_at_end() or parser.peek().token == TokenType.RIGHT_BRACE):
+    while not (parser.is_at_end() or parser.check(TokenType.RIGHT_BRACE)):
         yield _declaration(parser)
 
 
 def _print(parser: _ParseView) -> Print:
     expr = _expression(parser)
-    parser.consume(TokenType.SEMICOLON, "Expect ';' after value.")
+    parser.expect(TokenType.SEMICOLON, "Expect ';' after value.")
     return Print(expr)
 
 
 def _var_decl(parser: _ParseView) -> Var:
     name = parser.consume(TokenType.IDENTIFIER, "Expect variable name.")
+    resolver = parser.resolver
+    if resolver:
+        resolver.declare(name)
 
     initializer = None
-    if parser.match(TokenType.EQUAL):
+    if parser.accept(TokenType.EQUAL):
         initializer = _expression(parser)
 
-    parser.consume(TokenType.SEMICOLON, "Expect ';' after variable declaration")
+    parser.expect(TokenType.SEMICOLON, "Expect ';' after variable declaration")
+    if resolver:
+        resolver.define(name)
+        resolver.declare_global(name, GlobalKind.VARIABLE)
     return Var(name, initializer)
 
 
 def _if(parser: _ParseView) -> If:
-    parser.consume(TokenType.LEFT_PAREN, "Expect opening '('.")
+    parser.expect(TokenType.LEFT_PAREN, "Expect opening '('.")
     condition = _expression(parser)
-    parser.consume(TokenType.RIGHT_PAREN, "Expect closing ')'.")
+    parser.expect(TokenType.RIGHT_PAREN, "Expect closing ')'.")
     if_case = _statement(parser)
-    else_case = _statement(parser) if parser.match(TokenType.ELSE) else None
+    else_case = _statement(parser) if parser.accept(TokenType.ELSE) else None
     return If(condition, if_case, else_case)
 
 
 def _while(parser: _ParseView) -> While:
-    parser.consume(TokenType.LEFT_PAREN, "Expect opening '('.")
+    parser.expect(TokenType.LEFT_PAREN, "Expect opening '('.")
     condition = _expression(parser)
-    parser.consume(TokenType.RIGHT_PAREN, "Expected closing ')'.")
+    parser.expect(TokenType.RIGHT_PAREN, "Expected closing ')'.")
     body = _statement(parser)
     return While(condition, body)
 
 
 def _for(parser: _ParseView) -> Stmt:
-    parser.consume(TokenType.LEFT_PAREN, "Expected opening '('.")
+    parser.depth += 1
+    resolver = parser.resolver
+    parser.expect(TokenType.LEFT_PAREN, "Expected opening '('.")
     initializer = None
-    if parser.match(TokenType.SEMICOLON):
+    if parser.accept(TokenType.SEMICOLON):
         initializer = None
-    elif parser.match(TokenType.VAR):
-        initializer = _var_decl(parser)
     else:
-        initializer = _expr_stmt(parser)
+        # In fused mode, open the scopes of the blocks the loop desugars to in source order.
+        if resolver:
+            resolver.enter_scope()
+        if parser.accept(TokenType.VAR):
+            initializer = _var_decl(parser)
+        else:
+            initializer = _expr_stmt(parser)
 
     condition = None if parser.check(TokenType.SEMICOLON) else _expression(parser)
-    parser.consume(TokenType.SEMICOLON, "Expected ';'.")
-    increment = None if parser.check(TokenType.RIGHT_PAREN) else _expression(parser)
-    parser.consume(TokenType.RIGHT_PAREN, "Expected closing ')'.")
+    parser.expect(TokenType.SEMICOLON, "Expected ';'.")
+    has_increment = not parser.check(TokenType.RIGHT_PAREN)
+    if resolver and has_increment:
+        resolver.enter_scope()
+    increment = _expression(parser) if has_increment else None
+    parser.expect(TokenType.RIGHT_PAREN, "Expected closing ')'.")
 
     body = _statement(parser)
 
     if increment:
         body = Block([body, increment])
+        if resolver:
+            resolver.exit_scope()
 
     loop = While(condition or Literal(True), body)
 
     if initializer:
         loop = Block([initializer, loop])
+        if resolver:
+            resolver.exit_scope()
 
+    parser.depth -= 1
     return loop
 
 
-def _parse_fun_defn(parser: _ParseView) -> Tuple[List[Token], List[Stmt]]:
-    parser.consume(TokenType.LEFT_PAREN, "Expected '('.")
+def _parse_fun_defn(
+    parser: _ParseView, name: Token, enclosing: Tuple[str, ...]
+) -> Tuple[List[Token], Sequence[Stmt]]:
+    parser.expect(TokenType.LEFT_PAREN, "Expected '('.")
     params: List[Token] = []
     if not parser.check(TokenType.RIGHT_PAREN):
         while True:
             params.append(parser.consume(TokenType.IDENTIFIER, "Expected identifier."))
             if parser.check(TokenType.RIGHT_PAREN):
                 break
-            parser.consume(TokenType.COMMA, "Expected ','.")
-
-    parser.consume(TokenType.RIGHT_PAREN, "Expected ')'.")
-    parser.consume(TokenType.LEFT_BRACE, "Expected '{'.")
-    body = list(_block(parser))
-    parser.consume(TokenType.RIGHT_BRACE, "Expected '}'.")
+            parser.expect(TokenType.COMMA, "Expected ','.")
+
+    parser.expect(TokenType.RIGHT_PAREN, "Expected ')'.")
+    parser.expect(TokenType.LEFT_BRACE, "Expected '{'.")
+    # Only bodies directly in the global scope or a global class are deferred, so that the
+    # scopes they capture from are known without resolving the program around them.
+    resolver = parser.resolver
+    body: Sequence[Stmt]
+    if parser.lazy and parser.depth == 0:
+        start = parser._current
+        body = LazyBody(parser._tokens, start, parser.skip_block(), enclosing)
+        if resolver:
+            resolver.lazy_function(name)
+    else:
+        parser.depth += 1
+        if resolver:
+            resolver.begin_function(params)
+        body = list(_block(parser))
+        if resolver:
+            resolver.end_function(name)
+        parser.depth -= 1
+    parser.expect(TokenType.RIGHT_BRACE, "Expected '}'.")
 
     return params, body
 
 
+def _method(parser: _ParseView, enclosing: Tuple[str, ...]) -> Fun:
+    name = parser.consume(TokenType.IDENTIFIER, "Expected function name.")
+    params, body = _parse_fun_defn(parser, name, enclosing)
+    return Fun(name, params, body)
+
+
 def _fun(parser: _ParseView) -> Fun:
     name = parser.consume(TokenType.IDENTIFIER, "Expected function name.")
-    params, body = _parse_fun_defn(parser)
+    if resolver := parser.resolver:
+        resolver.declare(name)
+        resolver.define(name, late_init=True)
+        resolver.declare_global(name, GlobalKind.FUNCTION)
+    params, body = _parse_fun_defn(parser, name, ())
     return Fun(name, params, body)
 
 
 def _class_decl(parser: _ParseView) -> Class:
     name = parser.consume(TokenType.IDENTIFIER, "Expected class name.")
+    resolver = parser.resolver
+    if resolver:
+        resolver.define(name, late_init=True)
+        resolver.declare_global(name, GlobalKind.CLASS)
     superclass = None
-    if parser.match(TokenType.LESS):
+    if parser.accept(TokenType.LESS):
         super_token = parser.consume(TokenType.IDENTIFIER, "Expected super class identifier.")
         superclass = Variable(super_token)
 
-    parser.consume(TokenType.LEFT_BRACE, "Expect '{' before class body.")
+    parser.expect(TokenType.LEFT_BRACE, "Expect '{' before class body.")
 
+    enclosing = ("super", "this") if superclass else ("this",)
+    if resolver:
+        if superclass:
+            resolver.bind(superclass)
+        for scope_name in enclosing:
+            resolver.enter_scope()
+            resolver.define(scope_name)
     methods: List[Fun] = []
     while not parser.check(TokenType.RIGHT_BRACE):
-        methods.append(_fun(parser))
+        methods.append(_method(parser, enclosing))
+    if resolver:
+        for _ in enclosing:
+            resolver.exit_scope()
 
-    parser.consume(TokenType.RIGHT_BRACE, "Expect '}' after class body.")
+    parser.expect(TokenType.RIGHT_BRACE, "Expect '}' after class body.")
 
     return Class(name, superclass, methods)
 
@@ -332,26 +517,32 @@ def _return(parser: _ParseView, keyword: Token) -> Return:
 
 def _expr_stmt(parser: _ParseView) -> ExprStmt:
     expr = _expression(parser)
-    parser.consume(TokenType.SEMICOLON, "Expect ';' after expression.")
+    parser.expect(TokenType.SEMICOLON, "Expect ';' after expression.")
     return ExprStmt(expr)
 
 
 def _statement(parser: _ParseView) -> Stmt:
-    if parser.match(TokenType.PRINT):
+    if parser.accept(TokenType.PRINT):
         return _print(parser)
 
-    if parser.match(TokenType.LEFT_BRACE):
+    if parser.accept(TokenType.LEFT_BRACE):
+        parser.depth += 1
+        if resolver := parser.resolver:
+            resolver.enter_scope()
         stmts = list(_block(parser))
-        parser.consume(TokenType.RIGHT_BRACE, "Expect closing '}'.")
+        if resolver:
+            resolver.exit_scope()
+        parser.depth -= 1
+        parser.expect(TokenType.RIGHT_BRACE, "Expect closing '}'.")
         return Block(stmts)
 
-    if parser.match(TokenType.IF):
+    if parser.accept(TokenType.IF):
         return _if(parser)
 
-    if parser.match(TokenType.WHILE):
+    if parser.accept(TokenType.WHILE):
         return _while(parser)
 
-    if parser.match(TokenType.FOR):
+    if parser.accept(TokenType.FOR):
         return _for(parser)
 
     if keyword := parser.match(TokenType.RETURN):
@@ -361,23 +552,35 @@ def _statement(parser: _ParseView) -> Stmt:
 
 
 def _declaration(parser: _ParseView) -> Stmt:
-    if parser.match(TokenType.CLASS):
+    if parser.accept(TokenType.CLASS):
         return _class_decl(parser)
-    if parser.check_ahead(1, TokenType.IDENTIFIER) and parser.match(TokenType.FUN):
+    if parser.check_ahead(1, TokenType.IDENTIFIER) and parser.accept(TokenType.FUN):
         return _fun(parser)
 
-    if parser.match(TokenType.VAR):
+    if parser.accept(TokenType.VAR):
         return _var_decl(parser)
 
     return _statement(parser)
 
 
-def parse_expr(tokens: Iterable[Token]) -> object:
+def parse_expr(tokens: TokenBuffer) -> object:
     return _expression(_ParseView(tokens))
 
 
-def parse(tokens: Iterable[Token]) -> Iterable[Stmt]:
-    parser = _ParseView(tokens)
+def parse_body(tokens: TokenBuffer, start: int, end: int) -> List[Stmt]:
+    """Parse the statements of a function body between its braces."""
+    parser = _ParseView(tokens, start, end)
+    parser.depth = 1
+    return list(_block(parser))
+
+
+def parse(tokens: TokenBuffer, lazy=False, resolver: Resolver | None = None) -> Iterable[Stmt]:
+    """Parse a program.
+
+    In lazy mode, global function and method bodies become LazyBody. With a resolver (fused
+    mode), the program is resolved into resolver.bindings as it is parsed.
+    """
+    parser = _ParseView(tokens, lazy=lazy, resolver=resolver)
 
     try:
         while not parser.is_at_end():
@@ -1,8 +1,30 @@
 from pylox.expr import Expr, Literal, Unary, Binary, Grouping
+from pylox.traversal import Node, Visitor
 
 
-def _parenthesize(name: str, *exprs: Expr) -> str:
-    return f"({name} {str.join(' ', (expr_to_string(e) for e in exprs))})"
+class _Printer(Visitor):
+    __slots__ = ()
+
+    def _parenthesize(self, name: str, *exprs: Expr) -> str:
+        return f"({name} {str.join(' ', (self.visit(e) for e in exprs))})"
+
+    def visit_Literal(self, literal: Literal) -> str:
+        return str(literal.value)
+
+    def visit_Binary(self, binary: Binary) -> str:
+        return self._parenthesize(binary.operator.lexeme, binary.left, binary.right)
+
+    def visit_Unary(self, unary: Unary) -> str:
+        return self._parenthesize(unary.operator.lexeme, unary.right)
+
+    def visit_Grouping(self, grouping: Grouping) -> str:
+        return self._parenthesize("group", grouping.expr)
+
+    def generic_visit(self, node: Node) -> None:
+        return None
+
+
+_PRINTER = _Printer()
 
 
 def print_expr(expr: Expr) -> None:
@@ -10,12 +32,4 @@ def print_expr(expr: Expr) -> None:
 
 
 def expr_to_string(expr: Expr) -> str:
-    match expr:
-        case Literal(value):
-            return str(value)
-        case Binary(left, operator, right):
-            return _parenthesize(operator.lexeme, left, right)
-        case Unary(operator, right):
-            return _parenthesize(operator.lexeme, right)
-        case Grouping(expr):
-            return _parenthesize("group", expr)
+    return _PRINTER.visit(expr)
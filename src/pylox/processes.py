@@ -0,0 +1,279 @@
+import multiprocessing
+import os
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Set
+
+from pylox.containers import Array, Map
+from pylox.environment import Environment
+from pylox.interpreter import LoxClass, LoxFunction, LoxInstance
+from pylox.runtime import (
+    NativeClass,
+    NativeError,
+    NativeFunction,
+    NativeInstance,
+    Natives,
+    integer_arg,
+    native_method,
+)
+from pylox.strings import Rope
+
+# Globals of the program a worker process was forked from; replaced when the worker starts.
+_worker_env = Environment()
+
+
+def _init_worker(env: Environment) -> None:
+    global _worker_env
+    _worker_env = env
+
+
+class ProcessChannel(NativeInstance):
+    """A message queue that lox code in any process of a pool can send to and receive from."""
+
+    __slots__ = ("_queue", "_env")
+
+    def __init__(self, queue: Any, env: Environment):
+        self._queue = queue
+        self._env = env
+
+    @native_method()
+    def send(self, value):
+        self._queue.put(_encode(value))
+        return value
+
+    @native_method()
+    def receive(self):
+        return _decode(self._queue.get(), self._env)
+
+    @native_method()
+    def size(self):
+        return float(self._queue.qsize())
+
+    def __str__(self):
+        return "<process channel>"
+
+
+class ProcessHandle(NativeInstance):
+    __slots__ = ("_future", "_env")
+
+    def __init__(self, future: Future, env: Environment):
+        self._future = future
+        self._env = env
+
+    @native_method()
+    def join(self):
+        try:
+            return _decode(self._future.result(), self._env)
+        except NativeError:
+            raise
+        except Exception as e:
+            raise NativeError(f"Process failed: {e}")
+
+    @native_method()
+    def done(self):
+        return self._future.done()
+
+    def __str__(self):
+        return "<process>"
+
+
+# Values crossing a process boundary are encoded as plain python data, containers as tuples
+# tagged with their kind. Instances and their classes are matched up by the class's global
+# name in the receiving process.
+
+
+def _encode(value: object, seen: Set[int] | None = None) -> object:
+    match value:
+        case None | bool() | float() | int() | str():
+            return value
+        case Rope():
+            return value.flatten()
+        case ProcessChannel():
+            return ("channel", value._queue)
+    seen = set() if seen is None else seen
+    if id(value) in seen:
+        raise NativeError("Cannot send a value that contains itself to another process.")
+    seen.add(id(value))
+    encoded: tuple
+    match value:
+        case Array():
+            encoded = ("array", [_encode(item, seen) for item in value.items])
+        case Map():
+            encoded = ("map", {key: _encode(item, seen) for key, item in value.entries.items()})
+        case LoxInstance():
+            fields = {name: _encode(item, seen) for name, item in value.fields.items()}
+            encoded = ("instance", value.klass.name, fields)
+        case _:
+            raise NativeError(
+                "Only numbers, strings, booleans, nil, arrays, maps, instances and process "
+                "channels can be sent to another process."
+            )
+    seen.discard(id(value))
+    return encoded
+
+
+def _decode(value: object, env: Environment) -> object:
+    if value.__class__ is not tuple:
+        return value
+    match value:
+        case ("array", items):
+            return Array([_decode(item, env) for item in items])
+        case ("map", entries):
+            map = Map()
+            map.entries = {key: _decode(item, env) for key, item in entries.items()}
+            return map
+        case ("instance", class_name, fields):
+            klass = env.access_unbound(class_name)
+            if not isinstance(klass, LoxClass):
+                raise NativeError(f"No class {class_name} to receive an instance of.")
+            return LoxInstance(klass, {name: _decode(item, env) for name, item in fields.items()})
+        case ("channel", queue):
+            return ProcessChannel(queue, env)
+    raise NativeError("Received a malformed value.")
+
+
+def _call_in_worker(name: str, args: List[object]) -> object:
+    return _call(_worker_function(name), args, _worker_env)
+
+
+def _map_in_worker(name: str, chunk: List[object]) -> List[object]:
+    fn = _worker_function(name)
+    return [_call(fn, [item], _worker_env) for item in chunk]
+
+
+def _worker_function(name: str) -> LoxFunction:
+    fn = _worker_env.access_unbound(name)
+    if not isinstance(fn, LoxFunction):
+        raise NativeError(f"{name} was not a function when the workers started.")
+    return fn
+
+
+def _apply(fn: LoxFunction, args: List[object], env: Environment) -> object:
+    """fn called with encoded args, its result encoded."""
+    return _encode(fn.call([_decode(arg, env) for arg in args]))
+
+
+def _call(fn: LoxFunction, args: List[object], env: Environment) -> object:
+    """Like _apply, for a worker: a runtime error becomes a NativeError the caller can receive."""
+    try:
+        return _apply(fn, args, env)
+    except RuntimeError as e:
+        # Already reported by the interpreter, in the calling process.
+        raise NativeError(str(e))
+
+
+class ProcessPool:
+    """Runs global lox functions in forked worker processes.
+
+    The workers are forked from this process when a function is started, so they share the
+    parsed program and see the globals as they were at that point; they are forked again when
+    a global function or class has changed since. Values passed to and from them are copied.
+    """
+
+    def __init__(self, env: Environment, workers: int | None = None):
+        self.env = env
+        self.workers = workers or os.cpu_count() or 1
+        self._executor: ProcessPoolExecutor | None = None
+        self._retired: List[ProcessPoolExecutor] = []
+        self._forked_definitions: Dict[str, object] = {}
+        self._manager: Any = None
+
+    def natives(self) -> Natives:
+        return {
+            "spawnProcess": NativeFunction("spawnProcess", 2, self.spawn),
+            "ProcessChannel": NativeClass("ProcessChannel", 0, self.channel),
+            "parallelMap": NativeFunction("parallelMap", 3, self.parallel_map),
+        }
+
+    def _context(self) -> Any:
+        if "fork" not in multiprocessing.get_all_start_methods():
+            raise NativeError("Worker processes need the fork start method.")
+        return multiprocessing.get_context("fork")
+
+    def _definitions(self) -> Dict[str, object]:
+        return {
+            name: value
+            for name, value in self.env.global_values().items()
+            if isinstance(value, LoxFunction | LoxClass)
+        }
+
+    def _global_name(self, fn: object, definitions: Dict[str, object]) -> str:
+        name = next((name for name, value in definitions.items() if value is fn), None)
+        if name is None or not isinstance(fn, LoxFunction):
+            raise NativeError("Only global functions can run in another process.")
+        return name
+
+    def submit(self, task: Callable[..., Any], fn: object, *args: Any) -> Future:
+        """Run task(name, *args) in a worker, where name is the global name of function fn."""
+        definitions = self._definitions()
+        name = self._global_name(fn, definitions)
+
+        forked = self._forked_definitions
+        if self._executor is not None and (
+            len(forked) != len(definitions)
+            or any(forked.get(name) is not value for name, value in definitions.items())
+        ):
+            # Running calls finish in the old workers.
+            self._executor.shutdown(wait=False)
+            self._retired.append(self._executor)
+            self._executor = None
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                self.workers, self._context(), initializer=_init_worker, initargs=(self.env,)
+            )
+            self._forked_definitions = definitions
+        return self._executor.submit(task, name, *args)
+
+    def spawn(self, fn: object, arg: object) -> ProcessHandle:
+        if not isinstance(fn, LoxFunction) or fn.arity != 1:
+            raise NativeError("spawnProcess expects a function with one parameter.")
+        return ProcessHandle(self.submit(_call_in_worker, fn, [_encode(arg)]), self.env)
+
+    def parallel_map(self, fn: object, items: object, chunk_size: object) -> Array:
+        """fn applied to every item, in chunks of chunk_size items per worker call.
+
+        Inputs that fit in one chunk are mapped in this process, on copies like in a worker.
+        """
+        if not isinstance(fn, LoxFunction) or fn.arity != 1:
+            raise NativeError("parallelMap expects a function with one parameter.")
+        if not isinstance(items, Array):
+            raise NativeError("parallelMap expects an Array.")
+        size = integer_arg(chunk_size, "parallelMap chunk size")
+        if size < 1:
+            raise NativeError("parallelMap chunk size must be positive.")
+
+        # Checked up front, so that small inputs fail like large ones.
+        self._global_name(fn, self._definitions())
+        values = [_encode(value) for value in items.items]
+        if len(values) <= size:
+            # A runtime error in fn is already reported, so it propagates as it is.
+            return Array([_decode(_apply(fn, [value], self.env), self.env) for value in values])
+        futures = [
+            self.submit(_map_in_worker, fn, values[i : i + size])
+            for i in range(0, len(values), size)
+        ]
+        results: List[object] = []
+        try:
+            for future in futures:
+                results.extend(_decode(result, self.env) for result in future.result())
+        except NativeError:
+            raise
+        except Exception as e:
+            raise NativeError(f"Process failed: {e}")
+        return Array(results)
+
+    def channel(self) -> ProcessChannel:
+        if self._manager is None:
+            self._manager = self._context().Manager()
+        return ProcessChannel(self._manager.Queue(), self.env)
+
+    def shutdown(self) -> None:
+        """Wait for running calls and stop all worker processes."""
+        if self._executor is not None:
+            self._retired.append(self._executor)
+            self._executor = None
+        for executor in self._retired:
+            executor.shutdown()
+        self._retired.clear()
+        if self._manager is not None:
+            self._manager.shutdown()
+            self._manager = None
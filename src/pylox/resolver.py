@@ -1,17 +1,39 @@
 from contextlib import contextmanager
 from dataclasses import dataclass
 from enum import Enum, auto
-from typing import Dict, Iterable, List
+from typing import Callable, Dict, Iterable, List, Sequence, Set, Tuple
 
 from pylox.error import error
 from pylox.expr import Assign, Lambda, Super, This, Variable
-from pylox.iexpr import Expr, NamedExpr, Stmt
+from pylox.iexpr import NamedExpr, Stmt
 from pylox.scanner import Token
-from pylox.stmt import Block, Class, Fun, Var
-from pylox.traversal import visit_children
+from pylox.stmt import Block, Class, Fun, LazyBody, Var
+from pylox.traversal import Visitor
 
 
-Bindings = Dict[Token, int]
+Captures = Tuple[Tuple[str, int], ...]
+
+
+class Bindings(dict):
+    """Maps each resolved reference token to the (negative) index of the scope holding it.
+
+    Functions are flat closures: captures maps a function's name token (or a lambda's keyword)
+    to the variables its closure copies, with their scope index where it is created. Captured
+    variables that are assigned, or initialized after the closure is created, live in shared
+    cells; boxed holds their declaration tokens.
+    """
+
+    __slots__ = ("boxed", "captures", "__weakref__")
+
+    def __init__(self):
+        super().__init__()
+        self.boxed: Set[Token] = set()
+        self.captures: Dict[Token, Captures] = {}
+
+    def merge(self, other: "Bindings") -> None:
+        self.update(other)
+        self.boxed.update(other.boxed)
+        self.captures.update(other.captures)
 
 
 class _DefinedState(Enum):
@@ -19,114 +41,263 @@ class _DefinedState(Enum):
     DEFINED = auto()
 
 
-_Scope = Dict[str, _DefinedState]
+@dataclass(slots=True)
+class _Variable:
+    state: _DefinedState
+    declaration: Token | None
+    # Functions and classes are initialized after closures in their own bodies capture them.
+    late_init: bool = False
+    captured: bool = False
+    assigned: bool = False
+
+
+_Scope = Dict[str, _Variable]
 
 
 @dataclass(slots=True)
-class _ResolveContext:
-    scopes: List[_Scope]
-    bindings: Bindings
+class _Function:
+    # Index of the function's outermost scope in Resolver.scopes.
+    base: int
+    # Free variables, with the index of the scope defining them.
+    free: Dict[str, int]
+
+
+class GlobalKind(Enum):
+    VARIABLE = auto()
+    FUNCTION = auto()
+    CLASS = auto()
+
+
+@dataclass(slots=True)
+class GlobalInfo:
+    kind: GlobalKind
+    name: Token
+    # Incremented every time the global is declared again.
+    version: int = 0
+
+
+class ResolverSession:
+    """Resolver state kept across programs resolved one after another, e.g. REPL inputs."""
 
     def __init__(self):
-        self.scopes = []
-        self.bindings = {}
+        self.globals: Dict[str, GlobalInfo] = {}
+        self._invalidation_listeners: List[Callable[[GlobalInfo], None]] = []
 
+    def lookup(self, name: str) -> GlobalInfo | None:
+        return self.globals.get(name)
 
-@contextmanager
-def _enter_scope(context: _ResolveContext, condition=True):
-    try:
-        if condition:
-            context.scopes.append({})
-        yield
-    finally:
+    def on_invalidate(self, listener: Callable[[GlobalInfo], None]) -> None:
+        """Call listener with the new info whenever a known global is redefined."""
+        self._invalidation_listeners.append(listener)
+
+    def declare(self, name: Token, kind: GlobalKind) -> None:
+        if previous := self.globals.get(name.lexeme):
+            info = GlobalInfo(kind, name, previous.version + 1)
+            self.globals[name.lexeme] = info
+            for listener in self._invalidation_listeners:
+                listener(info)
+        else:
+            self.globals[name.lexeme] = GlobalInfo(kind, name)
+
+    def resolve(self, program: Iterable[Stmt]) -> Bindings:
+        return resolve(program, self)
+
+
+class Resolver(Visitor):
+    """Scope state of a resolution: binds references to scope depths and records captures.
+
+    resolve() drives it by visiting a parsed program. The parser can also drive it while it
+    builds the nodes, calling the same methods in the same order, so that a program is
+    resolved without a second pass over the tree.
+    """
+
+    __slots__ = ("scopes", "functions", "bindings", "session")
+
+    def __init__(self, session: ResolverSession | None = None):
+        self.scopes: List[_Scope] = []
+        self.functions = [_Function(0, {})]
+        self.bindings = Bindings()
+        self.session = session
+
+    def enter_scope(self) -> None:
+        self.scopes.append({})
+
+    def exit_scope(self) -> None:
+        for variable in self.scopes.pop().values():
+            if variable.captured and (variable.assigned or variable.late_init):
+                if variable.declaration:
+                    self.bindings.boxed.add(variable.declaration)
+
+    @contextmanager
+    def scope(self, condition=True):
         if condition:
-            context.scopes.pop()
+            self.enter_scope()
+        try:
+            yield
+        finally:
+            if condition:
+                self.exit_scope()
 
+    def declare(self, name: Token) -> None:
+        if not self.scopes:
+            return
+        scope = self.scopes[-1]
+        if name.lexeme in scope:
+            error(name.location, f"Redefinition of {name.lexeme}.")
+        else:
+            scope[name.lexeme] = _Variable(_DefinedState.DECLARED, name)
 
-def _resolve_children(expr_or_stmt: Expr | Stmt, context: _ResolveContext) -> None:
-    visit_children(expr_or_stmt, lambda child_expr_or_stmt: _resolve(child_expr_or_stmt, context))
+    def define(self, name: Token | str, late_init=False) -> None:
+        if not self.scopes:
+            return
+        if isinstance(name, Token):
+            name_str, declaration = name.lexeme, name
+        else:
+            name_str, declaration = name, None
+        self.scopes[-1][name_str] = _Variable(_DefinedState.DEFINED, declaration, late_init)
 
+    def declare_global(self, name: Token, kind: GlobalKind) -> None:
+        if self.session and not self.scopes:
+            self.session.declare(name, kind)
 
-def _declare(name: Token, context: _ResolveContext):
-    if not context.scopes:
-        return
-    scope = context.scopes[-1]
-    if name.lexeme in scope:
-        error(name.line, f"Redefinition of {name.lexeme}.")
-    else:
-        scope[name.lexeme] = _DefinedState.DECLARED
+    def bind(self, reference: NamedExpr, assigned=False) -> None:
+        name_token = reference.name
+        index = self._lookup(name_token.lexeme, name_token)
+        if index is not None:
+            self.scopes[index][name_token.lexeme].assigned |= assigned
+            self.bindings[name_token] = self._scope_depth(name_token.lexeme, index)
 
+    def bind_super(self, super: Super) -> None:
+        self.bind(super)
+        # The interpreter looks up the instance to bind the method to as well.
+        if (index := self._lookup("this", super.name)) is not None:
+            self._scope_depth("this", index)
 
-def _define(name: Token | str, context: _ResolveContext):
-    if not context.scopes:
-        return
-    scope = context.scopes[-1]
-    name_str = name.lexeme if isinstance(name, Token) else name
-    scope[name_str] = _DefinedState.DEFINED
+    def begin_function(self, params: List[Token]) -> None:
+        self.functions.append(_Function(len(self.scopes), {}))
+        self.enter_scope()
+        for p in params:
+            self.declare(p)
+            self.define(p)
 
+    def end_function(self, name: Token | None) -> None:
+        """Close the innermost function; name is its name token or a lambda's keyword."""
+        self.exit_scope()
+        self._record_captures(name, self.functions.pop())
 
-def _bind(reference: NamedExpr, context: _ResolveContext):
-    name_token = reference.name
-    for i, scope in enumerate(reversed(context.scopes), 1):
-        match scope.get(name_token.lexeme):
-            case _DefinedState.DEFINED:
-                context.bindings[name_token] = -i
-                break
-            case _DefinedState.DECLARED:
-                error(
-                    name_token.line,
-                    f"Cannot bind reference to {name_token.lexeme} during definition.",
-                )
+    def lazy_function(self, name: Token | None) -> None:
+        """A function whose body is resolved on its first call (see resolve_lazy_body)."""
+        # Until then, assume it captures everything around it.
+        function = _Function(len(self.scopes), {})
+        for index, scope in enumerate(self.scopes):
+            function.free.update(dict.fromkeys(scope, index))
+        self._record_captures(name, function)
+
+    def resolve_function(
+        self, name: Token | None, params: List[Token], body: Sequence[Stmt]
+    ) -> None:
+        if isinstance(body, LazyBody) and body.bindings is None:
+            self.lazy_function(name)
+            return
+        self.begin_function(params)
+        for stmt in body:
+            self.visit(stmt)
+        self.end_function(name)
+
+    def visit_Block(self, block: Block) -> None:
+        with self.scope():
+            for stmt in block.stmts:
+                self.visit(stmt)
+
+    def visit_Var(self, var: Var) -> None:
+        self.declare(var.name)
+        if var.initializer:
+            self.visit(var.initializer)
+        self.define(var.name)
+        self.declare_global(var.name, GlobalKind.VARIABLE)
+
+    def visit_Variable(self, variable: Variable) -> None:
+        self.bind(variable)
+
+    def visit_Assign(self, assignment: Assign) -> None:
+        self.bind(assignment, assigned=True)
+        self.visit(assignment.value)
+
+    def visit_Class(self, klass: Class) -> None:
+        self.define(klass.name, late_init=True)
+        self.declare_global(klass.name, GlobalKind.CLASS)
+        superclass = klass.superclass
+        if superclass:
+            self.bind(superclass)
+        with self.scope(superclass is not None):
+            if superclass:
+                self.define("super")
+            with self.scope():
+                self.define("this")
+                for method in klass.methods:
+                    self.resolve_function(method.name, method.params, method.body)
+
+    def visit_Fun(self, fun: Fun) -> None:
+        self.declare(fun.name)
+        self.define(fun.name, late_init=True)
+        self.declare_global(fun.name, GlobalKind.FUNCTION)
+        self.resolve_function(fun.name, fun.params, fun.body)
+
+    def visit_Lambda(self, function: Lambda) -> None:
+        self.resolve_function(function.keyword, function.params, function.body)
+
+    def visit_This(self, this: This) -> None:
+        self.bind(this)
+
+    def visit_Super(self, super: Super) -> None:
+        self.bind_super(super)
+
+    def _record_captures(self, name: Token | None, function: _Function) -> None:
+        if name is not None:
+            self.bindings.captures[name] = tuple(
+                (free_name, self._scope_depth(free_name, index))
+                for free_name, index in function.free.items()
+            )
+
+    def _scope_depth(self, name: str, index: int) -> int:
+        function = self.functions[-1]
+        if index >= function.base:
+            return index - len(self.scopes)
+
+        # Free in the current function, and in every enclosing function up to its definition.
+        self.scopes[index][name].captured = True
+        for enclosing in reversed(self.functions):
+            if enclosing.base <= index:
                 break
-            case None:
+            enclosing.free.setdefault(name, index)
+        return function.base - len(self.scopes) - 1
+
+    def _lookup(self, name: str, name_token: Token) -> int | None:
+        for index in range(len(self.scopes) - 1, -1, -1):
+            variable = self.scopes[index].get(name)
+            if variable is None:
                 continue
+            if variable.state == _DefinedState.DECLARED:
+                error(name_token.location, f"Cannot bind reference to {name} during definition.")
+                return None
+            return index
+        return None
+
+
+def resolve_lazy_body(params: List[Token], body: LazyBody) -> Bindings:
+    """Parse and resolve a deferred function body, once; its bindings are kept on the body."""
+    if body.bindings is None:
+        resolver = Resolver()
+        for enclosing in body.enclosing:
+            resolver.enter_scope()
+            resolver.define(enclosing)
+        resolver.resolve_function(None, params, body.stmts())
+        body.bindings = resolver.bindings
+    return body.bindings
 
 
-def _resolve(expr_or_stmt: Expr | Stmt, context: _ResolveContext):
-    match expr_or_stmt:
-        case Block(_):
-            with _enter_scope(context):
-                _resolve_children(expr_or_stmt, context)
-        case Var(name, _):
-            _declare(name, context)
-            _resolve_children(expr_or_stmt, context)
-            _define(name, context)
-        case Variable(name) as variable:
-            _bind(variable, context)
-        case Assign(name, _) as assignment:
-            _bind(assignment, context)
-            _resolve_children(expr_or_stmt, context)
-        case Class(name, superclass, _):
-            _define(name, context)
-            with _enter_scope(context, superclass is not None):
-                _define("super", context)
-                with _enter_scope(context):
-                    _define("this", context)
-                    _resolve_children(expr_or_stmt, context)
-        case Fun(name, params, _):
-            _declare(name, context)
-            _define(name, context)
-            with _enter_scope(context):
-                for p in params:
-                    _declare(p, context)
-                    _define(p, context)
-                _resolve_children(expr_or_stmt, context)
-        case Lambda(_, params, _):
-            with _enter_scope(context):
-                for p in params:
-                    _declare(p, context)
-                    _define(p, context)
-                _resolve_children(expr_or_stmt, context)
-        case This(_) as this:
-            _bind(this, context)
-        case Super(_, _) as super:
-            _bind(super, context)
-        case _:
-            _resolve_children(expr_or_stmt, context)
-
-
-def resolve(program: Iterable[Stmt]) -> Bindings:
-    context = _ResolveContext()
+def resolve(program: Iterable[Stmt], session: ResolverSession | None = None) -> Bindings:
+    resolver = Resolver(session)
     for stmt in program:
-        _resolve(stmt, context)
-    return context.bindings
+        resolver.visit(stmt)
+    return resolver.bindings
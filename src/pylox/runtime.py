@@ -1,5 +1,8 @@
 from abc import ABCMeta, abstractmethod, abstractproperty
-from typing import Any
+from contextvars import ContextVar
+from dataclasses import dataclass
+from inspect import signature
+from typing import Any, Callable, ClassVar, Dict
 
 from pylox.error import error
 from pylox.scanner import Token
@@ -7,10 +10,58 @@ from pylox.stmt import Stmt
 
 
 def runtime_error(token: Token, message: str) -> Exception:
-    error(token.line, message)
+    error(token.location, message)
     return RuntimeError(message)
 
 
+class NativeError(Exception):
+    """Raised by native code; reported as a runtime error at the call site."""
+
+
+def number_arg(val: object, what: str) -> float:
+    if isinstance(val, bool) or not isinstance(val, float | int):
+        raise NativeError(f"{what} must be a number.")
+    return float(val)
+
+
+def integer_arg(val: object, what: str) -> int:
+    if isinstance(val, bool) or not isinstance(val, float | int) or not float(val).is_integer():
+        raise NativeError(f"{what} must be an integer.")
+    return int(val)
+
+
+class Suspend:
+    """Returned by a native to suspend the resumable interpreter until its driver resumes it."""
+
+    __slots__ = ()
+
+
+# Set while an event loop drives the program (see aio.drive); natives that would block return
+# an awaitable instead.
+event_loop_driven: ContextVar[bool] = ContextVar("event_loop_driven", default=False)
+
+
+def stringify(val: object) -> str:
+    if isinstance(val, bool):
+        return "true" if val else "false"
+
+    if val == None:
+        return "nil"
+
+    if isinstance(val, float):
+        str_val = str(val)
+        return str_val[:-2] if str_val.endswith(".0") else str_val
+
+    return str(val)
+
+
+def is_equal(lhs: object, rhs: object) -> bool:
+    # Lox values of different types are never equal, but python treats True == 1.
+    if (lhs.__class__ is bool) != (rhs.__class__ is bool):
+        return False
+    return lhs == rhs
+
+
 class LoxCallable(metaclass=ABCMeta):
     @abstractproperty
     def arity(self) -> int:
@@ -27,3 +78,80 @@ class LoxCallable(metaclass=ABCMeta):
             return True
 
         return NotImplemented
+
+
+@dataclass(slots=True, frozen=True)
+class NativeFunction:
+    name: str
+    arity: int
+    fn: Callable[..., Any]
+
+    def __call__(self, *args: Any) -> Any | None:
+        return self.fn(*args)
+
+    def __str__(self):
+        return f"<native fn {self.name}>"
+
+
+# The natives a module installs in the globals, by name.
+Natives = Dict[str, "NativeFunction | NativeClass"]
+
+
+def native(natives: Natives, name: str | None = None, arity: int | None = None):
+    """Register a python callable in natives, inferring name and arity from its signature."""
+
+    def register(fn: Callable[..., Any]) -> Callable[..., Any]:
+        fn_name = name or fn.__name__.strip("_")
+        fn_arity = len(signature(fn).parameters) if arity is None else arity
+        natives[fn_name] = NativeFunction(fn_name, fn_arity, fn)
+        return fn
+
+    return register
+
+
+@dataclass(slots=True, frozen=True)
+class NativeClass:
+    name: str
+    arity: int
+    factory: Callable[..., Any]
+
+    def __call__(self, *args: Any) -> Any:
+        return self.factory(*args)
+
+    def __str__(self):
+        return self.name
+
+
+def native_method(name: str | None = None):
+    """Expose a method of a NativeInstance subclass to lox under name."""
+
+    def mark(method: Callable[..., Any]) -> Callable[..., Any]:
+        setattr(method, "lox_name", name or method.__name__.strip("_"))
+        return method
+
+    return mark
+
+
+class NativeInstance:
+    """Base for python objects that lox code can call methods on through Get."""
+
+    __slots__ = ()
+    _native_methods: ClassVar[Dict[str, tuple[str, int]]] = {}
+
+    def __init_subclass__(cls, **kwargs: Any):
+        super().__init_subclass__(**kwargs)
+        methods = dict(cls._native_methods)
+        for attr, value in vars(cls).items():
+            if lox_name := getattr(value, "lox_name", None):
+                methods[lox_name] = (attr, len(signature(value).parameters) - 1)
+        cls._native_methods = methods
+
+    def __getitem__(self, key: Token) -> NativeFunction:
+        if method := self._native_methods.get(key.lexeme):
+            attr, arity = method
+            return NativeFunction(key.lexeme, arity, getattr(self, attr))
+
+        raise runtime_error(key, "Undefined property.")
+
+    def __setitem__(self, key: Token, value: Any) -> None:
+        raise runtime_error(key, "Cannot set properties on native instances.")
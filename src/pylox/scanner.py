@@ -1,6 +1,9 @@
+from array import array
+from bisect import bisect_right
 from enum import Enum, auto
-from dataclasses import dataclass
-from typing import Callable, Iterable, Optional
+from sys import intern
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional
 
 from pylox.error import error
 
@@ -67,13 +70,135 @@ KEYWORDS = {
 }
 
 
+class SourceMap:
+    """Maps source offsets to lines and columns.
+
+    The table of line start offsets is built in one pass, the first time a location is needed.
+    """
+
+    __slots__ = ("source", "_line_starts")
+
+    def __init__(self, source: str):
+        self.source = source
+        self._line_starts: array | None = None
+
+    def _starts(self) -> array:
+        if self._line_starts is None:
+            starts = array("I", [0])
+            find = self.source.find
+            newline = find("\n")
+            while newline != -1:
+                starts.append(newline + 1)
+                newline = find("\n", newline + 1)
+            self._line_starts = starts
+        return self._line_starts
+
+    def line(self, offset: int) -> int:
+        return bisect_right(self._starts(), offset)
+
+    def column(self, offset: int) -> int:
+        starts = self._starts()
+        return offset - starts[bisect_right(starts, offset) - 1] + 1
+
+    def location(self, offset: int) -> str:
+        return f"{self.line(offset)}:{self.column(offset)}"
+
+
 @dataclass(slots=True, eq=True, frozen=True)
 class Token:
     token: TokenType
     lexeme: str
     literal: object
-    line: int
     index: int
+    source: SourceMap | None = field(default=None, compare=False, repr=False)
+
+    @property
+    def line(self) -> int:
+        return self.source.line(self.index) if self.source else 0
+
+    @property
+    def location(self) -> str:
+        return self.source.location(self.index) if self.source else f"@{self.index}"
+
+
+# Indexed by TokenType value, the code stored in TokenBuffer.types.
+_TOKEN_TYPES = (None, *TokenType)
+
+
+class TokenBuffer:
+    """A compact token stream: one array per token field instead of one object per token.
+
+    Identifier names and literal values are stored once each, in the lexemes and literals
+    tables; values holds the table index for identifier, number and string tokens. Other
+    lexemes are sliced from the source. Token objects are built only on access.
+
+    Names and string literals are interned, so the same name or string in different inputs is
+    the same object: field lookups and == on them succeed on identity.
+    """
+
+    __slots__ = (
+        "source_map",
+        "types",
+        "starts",
+        "lengths",
+        "values",
+        "lexemes",
+        "literals",
+        "_lexeme_ids",
+        "_literal_ids",
+    )
+
+    def __init__(self, source: str):
+        self.source_map = SourceMap(source)
+        self.types = array("B")
+        self.starts = array("I")
+        self.lengths = array("I")
+        self.values = array("I")
+        self.lexemes: List[str] = []
+        self.literals: List[object] = []
+        self._lexeme_ids: Dict[str, int] = {}
+        self._literal_ids: Dict[object, int] = {}
+
+    @property
+    def source(self) -> str:
+        return self.source_map.source
+
+    def append(self, type: TokenType, start: int, end: int, value: Any = None):
+        if type is TokenType.IDENTIFIER:
+            value_id = self._lexeme_ids.setdefault(value, len(self.lexemes))
+            if value_id == len(self.lexemes):
+                self.lexemes.append(intern(value))
+        elif value is not None:
+            value_id = self._literal_ids.setdefault(value, len(self.literals))
+            if value_id == len(self.literals):
+                self.literals.append(intern(value) if type is TokenType.STRING else value)
+        else:
+            value_id = 0
+        self.types.append(type.value)
+        self.starts.append(start)
+        self.lengths.append(end - start)
+        self.values.append(value_id)
+
+    def type_at(self, i: int) -> TokenType:
+        return _TOKEN_TYPES[self.types[i]]
+
+    def __len__(self) -> int:
+        return len(self.types)
+
+    def __getitem__(self, i: int) -> Token:
+        type = _TOKEN_TYPES[self.types[i]]
+        start = self.starts[i]
+        literal = None
+        if type is TokenType.IDENTIFIER:
+            lexeme = self.lexemes[self.values[i]]
+        else:
+            lexeme = self.source_map.source[start : start + self.lengths[i]]
+            if type is TokenType.NUMBER or type is TokenType.STRING:
+                literal = self.literals[self.values[i]]
+        return Token(type, lexeme, literal, start, self.source_map)
+
+    def __iter__(self) -> Iterator[Token]:
+        return map(self.__getitem__, range(len(self)))
 
 
 class _ScanView:
@@ -81,7 +206,6 @@ class _ScanView:
         self._input = input
         self.start = 0
         self._current = 0
-        self.line = 1
 
     def is_at_end(self) -> bool:
         return self._current >= len(self._input)
@@ -99,8 +223,6 @@ class _ScanView:
 
     def advance(self) -> str:
         val = self.peek()
-        if val == "\n":
-            self.line += 1
         self._current += 1
         return val
 
@@ -119,6 +241,10 @@ class _ScanView:
     def start_token(self) -> None:
         self.start = self._current
 
+    @property
+    def end(self) -> int:
+        return self._current
+
     @property
     def token(self) -> str:
         return self._input[self.start : self._current]
@@ -136,56 +262,57 @@ def _is_alpha_numeric(val: str):
     return _is_alpha(val) or _is_digit(val)
 
 
-def scan_tokens(input: str) -> Iterable[Token]:
+def scan_tokens(input: str) -> TokenBuffer:
     scan = _ScanView(input)
+    tokens = TokenBuffer(input)
 
-    def create_token(type, literal=None) -> Token:
-        return Token(type, scan.token, literal, scan.line, scan.start)
+    def create_token(type, value=None) -> None:
+        tokens.append(type, scan.start, scan.end, value)
 
     while not scan.is_at_end():
         scan.start_token()
         match scan.advance():
             case "(":
-                yield create_token(TokenType.LEFT_PAREN)
+                create_token(TokenType.LEFT_PAREN)
             case ")":
-                yield create_token(TokenType.RIGHT_PAREN)
+                create_token(TokenType.RIGHT_PAREN)
             case "{":
-                yield create_token(TokenType.LEFT_BRACE)
+                create_token(TokenType.LEFT_BRACE)
             case "}":
-                yield create_token(TokenType.RIGHT_BRACE)
+                create_token(TokenType.RIGHT_BRACE)
             case ",":
-                yield create_token(TokenType.COMMA)
+                create_token(TokenType.COMMA)
             case ".":
-                yield create_token(TokenType.DOT)
+                create_token(TokenType.DOT)
             case "+":
-                yield create_token(TokenType.PLUS)
+                create_token(TokenType.PLUS)
             case "-":
-                yield create_token(TokenType.MINUS)
+                create_token(TokenType.MINUS)
             case ";":
-                yield create_token(TokenType.SEMICOLON)
+                create_token(TokenType.SEMICOLON)
             case "*":
-                yield create_token(TokenType.STAR)
+                create_token(TokenType.STAR)
             case "/":
                 if scan.peek() == "/":
                     scan.advance_while(lambda s: s != "\n")
                 else:
-                    yield create_token(TokenType.SLASH)
+                    create_token(TokenType.SLASH)
             case "=":
-                yield create_token(TokenType.EQUAL_EQUAL if scan.match("=") else TokenType.EQUAL)
+                create_token(TokenType.EQUAL_EQUAL if scan.match("=") else TokenType.EQUAL)
             case ">":
-                yield create_token(
-                    TokenType.GREATER_EQUAL if scan.match("=") else TokenType.GREATER
-                )
+                create_token(TokenType.GREATER_EQUAL if scan.match("=") else TokenType.GREATER)
             case "<":
-                yield create_token(TokenType.LESS_EQUAL if scan.match("=") else TokenType.LESS)
+                create_token(TokenType.LESS_EQUAL if scan.match("=") else TokenType.LESS)
             case "!":
-                yield create_token(TokenType.BANG_EQUAL if scan.match("=") else TokenType.BANG)
+                create_token(TokenType.BANG_EQUAL if scan.match("=") else TokenType.BANG)
             case '"':
                 scan.advance_while(lambda s: s != '"')
                 if scan.match('"'):
-                    yield create_token(TokenType.STRING, scan.token[1:-1])
+                    create_token(TokenType.STRING, scan.token[1:-1])
                 else:
-                    error(scan.line, f"Unterminated string {scan.token}")
+                    error(
+                        tokens.source_map.location(scan.start), f"Unterminated string {scan.token}"
+                    )
                     break
             case " " | "\t" | "\r" | "\n":
                 pass
@@ -195,10 +322,15 @@ def scan_tokens(input: str) -> Iterable[Token]:
                     if scan.peek() == "." and _is_digit(scan.peek_next()):
                         scan.advance()
                         scan.advance_while(_is_digit)
-                    yield create_token(TokenType.NUMBER, float(scan.token))
+                    create_token(TokenType.NUMBER, float(scan.token))
                 elif _is_alpha(token):
                     scan.advance_while(_is_alpha_numeric)
-                    token_type = KEYWORDS.get(scan.token, TokenType.IDENTIFIER)
-                    yield create_token(token_type)
+                    lexeme = scan.token
+                    if keyword := KEYWORDS.get(lexeme):
+                        create_token(keyword)
+                    else:
+                        create_token(TokenType.IDENTIFIER, lexeme)
                 else:
-                    error(scan.line, f"Unexpected token {token}")
+                    error(tokens.source_map.location(scan.start), f"Unexpected token {token}")
+
+    return tokens
@@ -0,0 +1,256 @@
+import heapq
+import time
+from collections import deque
+from dataclasses import dataclass
+from itertools import count
+from typing import Any, Callable, Deque, Generator, List, Tuple
+
+from pylox.error import error
+from pylox.interpreter import Steps, call_steps
+from pylox.runtime import (
+    LoxCallable,
+    NativeClass,
+    NativeError,
+    NativeFunction,
+    NativeInstance,
+    Natives,
+    Suspend,
+    event_loop_driven,
+    native_method,
+)
+
+# Ticks (calls and loop iterations) a task runs before the scheduler switches to the next one.
+QUANTUM = 100
+
+
+@dataclass(slots=True)
+class _Park(Suspend):
+    park: Callable[["Task"], None]
+
+
+class Task(NativeInstance):
+    __slots__ = ("_scheduler", "_steps", "_resume_value", "_joiners", "finished", "result")
+
+    def __init__(self, scheduler: "Scheduler", steps: Steps):
+        self._scheduler = scheduler
+        self._steps = steps
+        self._resume_value: Any = None
+        self._joiners: List[Task] = []
+        self.finished = False
+        self.result: Any = None
+
+    def _finish(self, result: Any) -> None:
+        self.finished = True
+        self.result = result
+        for joiner in self._joiners:
+            self._scheduler.wake(joiner, result)
+        self._joiners.clear()
+
+    @native_method()
+    def join(self):
+        if self.finished:
+            return self.result
+        if current := self._scheduler.current:
+            if current is self:
+                raise NativeError("A task cannot join itself.")
+            return _Park(self._joiners.append)
+        return self._scheduler.block(
+            lambda: self.finished, lambda: self.result, "Deadlock: joined task can never finish."
+        )
+
+    @native_method()
+    def done(self):
+        return self.finished
+
+    def __str__(self):
+        return "<task>"
+
+
+class Channel(NativeInstance):
+    __slots__ = ("_scheduler", "_items", "_receivers")
+
+    def __init__(self, scheduler: "Scheduler"):
+        self._scheduler = scheduler
+        self._items: Deque[Any] = deque()
+        self._receivers: Deque[Task] = deque()
+
+    @native_method()
+    def send(self, value):
+        if self._receivers:
+            self._scheduler.wake(self._receivers.popleft(), value)
+        else:
+            self._items.append(value)
+        return value
+
+    @native_method()
+    def receive(self):
+        if self._items:
+            return self._items.popleft()
+        if self._scheduler.current:
+            return _Park(self._receivers.append)
+        return self._scheduler.block(
+            lambda: bool(self._items),
+            self._items.popleft,
+            "Deadlock: receive on an empty channel with no runnable tasks.",
+        )
+
+    @native_method()
+    def size(self):
+        return float(len(self._items))
+
+    def __str__(self):
+        return "<channel>"
+
+
+class Scheduler:
+    """Cooperative scheduler running lox functions as tasks on the resumable interpreter.
+
+    The main program runs on the regular interpreter; tasks only make progress while it blocks
+    in join, receive, sleep or yield, and unfinished tasks are abandoned when it ends. Under an
+    event loop (aio.run_async) the main program awaits instead of blocking, so other asyncio
+    tasks keep running.
+    """
+
+    def __init__(self, quantum: int = QUANTUM):
+        self.quantum = quantum
+        self.current: Task | None = None
+        self._ready: Deque[Task] = deque()
+        self._sleeping: List[Tuple[float, int, Task]] = []
+        self._sequence = count()
+
+    def natives(self) -> Natives:
+        return {
+            "spawn": NativeFunction("spawn", 1, self.spawn),
+            "yield": NativeFunction("yield", 0, self._yield),
+            "sleep": NativeFunction("sleep", 1, self._sleep),
+            "Channel": NativeClass("Channel", 0, lambda: Channel(self)),
+        }
+
+    def spawn(self, fn: object) -> Task:
+        if not isinstance(fn, LoxCallable) or fn.arity != 0:
+            raise NativeError("spawn expects a function without parameters.")
+        task = Task(self, call_steps(fn, []))
+        self._ready.append(task)
+        return task
+
+    def wake(self, task: Task, value: Any = None) -> None:
+        task._resume_value = value
+        self._ready.append(task)
+
+    def run(self) -> None:
+        """Run until every task has finished or is blocked."""
+        self.run_until(lambda: False)
+
+    def run_until(self, condition: Callable[[], bool], deadline: float | None = None) -> bool:
+        """Run tasks until condition holds; False if no task can make progress before then."""
+        waits = self._waits(condition, deadline)
+        try:
+            while True:
+                if seconds := next(waits):
+                    time.sleep(seconds)
+        except StopIteration as stop:
+            return stop.value
+
+    async def run_until_async(
+        self, condition: Callable[[], bool], deadline: float | None = None
+    ) -> bool:
+        """Like run_until, but yields to the event loop between quanta and while waiting."""
+        import asyncio
+
+        waits = self._waits(condition, deadline)
+        try:
+            while True:
+                await asyncio.sleep(next(waits))
+        except StopIteration as stop:
+            return stop.value
+
+    def _waits(
+        self, condition: Callable[[], bool], deadline: float | None
+    ) -> Generator[float, None, bool]:
+        # Runs a quantum at a time, yielding the seconds to wait before going on.
+        while not condition():
+            self._wake_sleepers()
+            if self._ready:
+                self._step(self._ready.popleft())
+                yield 0.0
+                continue
+            wake_at = self._sleeping[0][0] if self._sleeping else None
+            if deadline is not None and (wake_at is None or deadline < wake_at):
+                wake_at = deadline
+            if wake_at is None:
+                return False
+            yield max(0.0, wake_at - time.monotonic())
+        return True
+
+    def block(
+        self,
+        condition: Callable[[], bool],
+        result: Callable[[], Any],
+        deadlock: str,
+        deadline: float | None = None,
+    ) -> Any:
+        """result() once tasks have run until condition holds, for the main program.
+
+        An awaitable of it when an event loop drives the program. NativeError(deadlock) if no
+        task can make progress.
+        """
+        if event_loop_driven.get():
+
+            async def wait() -> Any:
+                if not await self.run_until_async(condition, deadline):
+                    raise NativeError(deadlock)
+                return result()
+
+            return wait()
+        if not self.run_until(condition, deadline):
+            raise NativeError(deadlock)
+        return result()
+
+    def _wake_sleepers(self) -> None:
+        now = time.monotonic()
+        while self._sleeping and self._sleeping[0][0] <= now:
+            self.wake(heapq.heappop(self._sleeping)[2])
+
+    def _step(self, task: Task) -> None:
+        self.current = task
+        steps = task._steps
+        try:
+            for _ in range(self.quantum):
+                value, task._resume_value = task._resume_value, None
+                if (request := steps.send(value)) is not None:
+                    if not isinstance(request, _Park):
+                        steps.close()
+                        raise NativeError("Task suspended by a request the scheduler cannot serve.")
+                    request.park(task)
+                    return
+            self._ready.append(task)
+        except StopIteration as stop:
+            task._finish(stop.value)
+        except RuntimeError:
+            # Already reported by the interpreter.
+            task._finish(None)
+        except NativeError as e:
+            error("task", str(e))
+            task._finish(None)
+        finally:
+            self.current = None
+
+    def _yield(self) -> _Park | None:
+        if self.current:
+            return _Park(self.wake)
+        for _ in range(len(self._ready)):
+            self._wake_sleepers()
+            if self._ready:
+                self._step(self._ready.popleft())
+        return None
+
+    def _sleep(self, seconds: object) -> Any:
+        if isinstance(seconds, bool) or not isinstance(seconds, float | int):
+            raise NativeError("sleep expects a number of seconds.")
+        wake_at = time.monotonic() + seconds
+        if self.current:
+            return _Park(
+                lambda task: heapq.heappush(self._sleeping, (wake_at, next(self._sequence), task))
+            )
+        # Never deadlocks: the deadline is always something to wait for.
+        return self.block(lambda: time.monotonic() >= wake_at, lambda: None, "", wake_at)
@@ -0,0 +1,171 @@
+import json
+import multiprocessing
+import os
+import signal
+import socket
+from argparse import ArgumentParser
+from collections import OrderedDict
+from multiprocessing.connection import wait
+from typing import Any, Callable, Dict, List
+
+from pylox.lox import Lox, Program, compile_program
+
+# Compiled programs each worker keeps, least recently used first out.
+CACHE_SIZE = 128
+
+
+class ProgramCache:
+    """Compiled programs by source text, so a script sent again is not scanned or parsed again."""
+
+    def __init__(self, size: int = CACHE_SIZE):
+        self.size = size
+        self._programs: OrderedDict[str, Program] = OrderedDict()
+
+    def get(self, source: str) -> Program:
+        program = self._programs.get(source)
+        if program is None:
+            program = compile_program(source)
+            self._programs[source] = program
+            if len(self._programs) > self.size:
+                self._programs.popitem(last=False)
+        else:
+            self._programs.move_to_end(source)
+        return program
+
+    def __len__(self):
+        return len(self._programs)
+
+
+class _CachedLox(Lox):
+    def __init__(self, programs: ProgramCache, stdlib: bool, send: Callable[[Dict], None]):
+        super().__init__(
+            stdlib,
+            output=lambda text: send({"out": text}),
+            on_error=lambda message: send({"error": message}),
+        )
+        self._programs = programs
+
+    def _execute(self, input: str) -> None:
+        program = self._programs.get(input)
+        try:
+            program.run(self.globals)
+        finally:
+            # The cached tree must not keep this run's globals (and worker processes) alive.
+            program.clear_caches()
+
+
+def _read_request(connection: socket.socket) -> Dict[str, Any]:
+    with connection.makefile("rb") as file:
+        request = json.loads(file.readline())
+    if "path" in request:
+        with open(request["path"]) as source:
+            request["source"] = source.read()
+    return request
+
+
+def handle(connection: socket.socket, programs: ProgramCache, stdlib: bool = False) -> None:
+    """Serve one request: a JSON line with a source or a path, answered with JSON lines.
+
+    Output and diagnostics stream back as {"out": text} and {"error": message}; the last line
+    is {"ok": bool}, false if the program reported any errors.
+    """
+    with connection.makefile("wb") as file:
+
+        def send(message: Dict) -> None:
+            file.write(json.dumps(message).encode() + b"\n")
+            file.flush()
+
+        lox = None
+        try:
+            request = _read_request(connection)
+            lox = _CachedLox(programs, request.get("stdlib", stdlib), send)
+            ok = lox.run(request["source"])
+            # Before replying: worker processes inherited the connection.
+            lox.close()
+            send({"ok": ok})
+        except (OSError, ValueError, KeyError) as e:
+            send({"error": f"Bad request: {e}"})
+            send({"ok": False})
+        except Exception as e:
+            send({"error": f"Internal error: {e!r}"})
+            send({"ok": False})
+        finally:
+            if lox is not None:
+                lox.close()
+
+
+def _interrupt(signum: int, frame: Any) -> None:
+    raise KeyboardInterrupt
+
+
+class Server:
+    """Serves lox programs over a Unix domain socket from a pool of forked worker processes.
+
+    Workers are forked once pylox is imported, so a request pays neither python's start up nor
+    module imports. Each worker runs one request at a time, against fresh globals, and keeps
+    its own ProgramCache. Workers that die are replaced.
+    """
+
+    def __init__(self, path: str, workers: int | None = None, stdlib: bool = False):
+        self.path = path
+        self.workers = workers or os.cpu_count() or 1
+        self.stdlib = stdlib
+        self._context = multiprocessing.get_context("fork")
+        self._processes: List[Any] = []
+
+    def _work(self, listener: socket.socket) -> None:
+        # The server stops its workers itself; a request is never interrupted half way.
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        programs = ProgramCache()
+        while True:
+            connection, _ = listener.accept()
+            with connection:
+                try:
+                    handle(connection, programs, self.stdlib)
+                except OSError:
+                    pass  # The client went away.
+
+    def _start_worker(self, listener: socket.socket) -> Any:
+        process = self._context.Process(target=self._work, args=(listener,), daemon=True)
+        process.start()
+        return process
+
+    def serve_forever(self) -> None:
+        signal.signal(signal.SIGTERM, _interrupt)
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as listener:
+            listener.bind(self.path)
+            listener.listen()
+            try:
+                self._processes = [self._start_worker(listener) for _ in range(self.workers)]
+                while True:
+                    wait([process.sentinel for process in self._processes])
+                    self._processes = [
+                        process if process.is_alive() else self._start_worker(listener)
+                        for process in self._processes
+                    ]
+            except KeyboardInterrupt:
+                pass
+            finally:
+                self.shutdown()
+
+    def shutdown(self) -> None:
+        for process in self._processes:
+            process.terminate()
+        for process in self._processes:
+            process.join()
+        self._processes = []
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description="serve lox programs over a Unix domain socket")
+    parser.add_argument("socket", help="path of the socket to listen on")
+    parser.add_argument("--workers", help="number of worker processes", type=int)
+    parser.add_argument("--stdlib", help="load the native standard library", action="store_true")
+    args = parser.parse_args()
+
+    Server(args.socket, args.workers, args.stdlib).serve_forever()
@@ -0,0 +1,54 @@
+from dataclasses import dataclass
+from typing import Callable
+from weakref import WeakValueDictionary
+
+from pylox.interpreter import interpret
+from pylox.lox import Lox, load
+from pylox.resolver import Bindings, ResolverSession
+
+
+@dataclass(frozen=True)
+class SessionStats:
+    inputs: int
+    globals: int
+    live_inputs: int
+    live_bindings: int
+
+
+class Session(Lox):
+    """A long running interpreter instance for REPLs and hosts that evaluate many inputs.
+
+    Declared globals are tracked across inputs by a ResolverSession. Each input is resolved into
+    its own bindings table, referenced only by the environments and functions created while
+    running it. Bindings and syntax trees of earlier inputs are released as soon as nothing
+    defined by them is reachable from the globals.
+    """
+
+    def __init__(
+        self,
+        stdlib: bool = False,
+        output: Callable[[str], None] = print,
+        on_error: Callable[[str], None] | None = None,
+    ):
+        super().__init__(stdlib, output, on_error)
+        self.resolver = ResolverSession()
+        self._inputs = 0
+        self._live_bindings: WeakValueDictionary[int, Bindings] = WeakValueDictionary()
+
+    def _execute(self, input: str) -> None:
+        bindings = Bindings()
+        env = self.globals.with_bindings(bindings)
+        program = load(input, env, self.resolver)
+        self._inputs += 1
+        if bindings or bindings.captures:
+            self._live_bindings[self._inputs] = bindings
+        interpret(program, env)
+
+    def stats(self) -> SessionStats:
+        live = list(self._live_bindings.values())
+        return SessionStats(
+            inputs=self._inputs,
+            globals=len(self.globals.global_values()),
+            live_inputs=len(live),
+            live_bindings=sum(len(bindings) for bindings in live),
+        )
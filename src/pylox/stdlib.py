@@ -0,0 +1,176 @@
+import math
+
+from pylox.containers import CONTAINERS
+from pylox.interpreter import LoxClass, LoxInstance
+from pylox.runtime import (
+    LoxCallable,
+    NativeClass,
+    NativeError,
+    NativeInstance,
+    Natives,
+    integer_arg,
+    native,
+    number_arg,
+    stringify,
+)
+from pylox.strings import STRINGS, Rope
+from pylox.vector import VECTORS
+
+
+STDLIB: Natives = CONTAINERS | STRINGS | VECTORS
+
+
+def _string(val: object, what: str) -> str:
+    if isinstance(val, Rope):
+        return val.flatten()
+    if not isinstance(val, str):
+        raise NativeError(f"{what} must be a string.")
+    return val
+
+
+# Math
+
+
+@native(STDLIB)
+def _abs(x):
+    return abs(number_arg(x, "abs argument"))
+
+
+@native(STDLIB)
+def _sqrt(x):
+    x = number_arg(x, "sqrt argument")
+    if x < 0:
+        raise NativeError("sqrt argument must not be negative.")
+    return math.sqrt(x)
+
+
+@native(STDLIB)
+def _floor(x):
+    return float(math.floor(number_arg(x, "floor argument")))
+
+
+@native(STDLIB)
+def _ceil(x):
+    return float(math.ceil(number_arg(x, "ceil argument")))
+
+
+@native(STDLIB)
+def _round(x):
+    return float(round(number_arg(x, "round argument")))
+
+
+@native(STDLIB)
+def _pow(base, exp):
+    try:
+        return math.pow(number_arg(base, "pow base"), number_arg(exp, "pow exponent"))
+    except (ValueError, OverflowError) as e:
+        raise NativeError(f"pow failed: {e}.")
+
+
+@native(STDLIB)
+def _min(a, b):
+    return min(number_arg(a, "min argument"), number_arg(b, "min argument"))
+
+
+@native(STDLIB)
+def _max(a, b):
+    return max(number_arg(a, "max argument"), number_arg(b, "max argument"))
+
+
+@native(STDLIB)
+def _sin(x):
+    return math.sin(number_arg(x, "sin argument"))
+
+
+@native(STDLIB)
+def _cos(x):
+    return math.cos(number_arg(x, "cos argument"))
+
+
+@native(STDLIB)
+def _exp(x):
+    try:
+        return math.exp(number_arg(x, "exp argument"))
+    except OverflowError:
+        raise NativeError("exp overflow.")
+
+
+@native(STDLIB)
+def _log(x):
+    x = number_arg(x, "log argument")
+    if x <= 0:
+        raise NativeError("log argument must be positive.")
+    return math.log(x)
+
+
+# Strings
+
+
+@native(STDLIB)
+def _len(s):
+    return float(len(_string(s, "len argument")))
+
+
+@native(STDLIB)
+def _substr(s, start, end):
+    return _string(s, "substr argument")[
+        integer_arg(start, "substr start") : integer_arg(end, "substr end")
+    ]
+
+
+@native(STDLIB, name="indexOf")
+def _index_of(s, sub):
+    return float(_string(s, "indexOf argument").find(_string(sub, "indexOf search")))
+
+
+@native(STDLIB)
+def _upper(s):
+    return _string(s, "upper argument").upper()
+
+
+@native(STDLIB)
+def _lower(s):
+    return _string(s, "lower argument").lower()
+
+
+@native(STDLIB)
+def _trim(s):
+    return _string(s, "trim argument").strip()
+
+
+# Type conversion
+
+
+@native(STDLIB)
+def _str(val):
+    return stringify(val)
+
+
+@native(STDLIB)
+def _num(val):
+    if isinstance(val, float | int) and not isinstance(val, bool):
+        return float(val)
+    try:
+        return float(_string(val, "num argument"))
+    except ValueError:
+        return None
+
+
+@native(STDLIB)
+def _type(val):
+    match val:
+        case None:
+            return "nil"
+        case bool():
+            return "boolean"
+        case float() | int():
+            return "number"
+        case str() | Rope():
+            return "string"
+        case LoxClass() | NativeClass():
+            return "class"
+        case LoxInstance() | NativeInstance():
+            return "instance"
+        case LoxCallable():
+            return "function"
+    return "native"
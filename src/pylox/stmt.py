@@ -1,9 +1,12 @@
 from dataclasses import dataclass
-from typing import List
+from typing import TYPE_CHECKING, Iterator, List, Sequence, Tuple
 
 from pylox.expr import Variable
 from pylox.iexpr import Expr, Stmt
-from pylox.scanner import Token
+from pylox.scanner import Token, TokenBuffer
+
+if TYPE_CHECKING:
+    from pylox.resolver import Bindings
 
 
 @dataclass(slots=True, eq=True, frozen=True)
@@ -40,11 +43,59 @@ class While(Stmt):
     body: Stmt
 
 
+class LazyBody(Sequence[Stmt]):
+    """A function body skipped by the parser, parsed on first use.
+
+    The parser only matches its braces. enclosing lists the names of the scopes around the
+    function, which the resolver needs to resolve the body later.
+    """
+
+    __slots__ = ("_tokens", "_start", "_end", "enclosing", "_stmts", "_error", "bindings")
+
+    def __init__(self, tokens: TokenBuffer, start: int, end: int, enclosing: Tuple[str, ...]):
+        self._tokens = tokens
+        self._start = start
+        self._end = end
+        self.enclosing = enclosing
+        self._stmts: List[Stmt] | None = None
+        self._error: Exception | None = None
+        # Set by the resolver once it has resolved the body.
+        self.bindings: "Bindings | None" = None
+
+    @property
+    def parsed(self) -> bool:
+        return self._stmts is not None
+
+    def stmts(self) -> List[Stmt]:
+        """The parsed body; raises ParseError, reported only once, if it does not parse."""
+        if self._stmts is None:
+            from pylox.parser import ParseError, parse_body
+
+            if self._error is not None:
+                raise self._error
+            try:
+                self._stmts = parse_body(self._tokens, self._start, self._end)
+            except ParseError as error:
+                self._error = error
+                raise
+        return self._stmts
+
+    def __getitem__(self, i):
+        return self.stmts()[i]
+
+    def __len__(self) -> int:
+        return len(self.stmts())
+
+    def __iter__(self) -> Iterator[Stmt]:
+        return iter(self.stmts())
+
+
 @dataclass(slots=True, eq=True, frozen=True)
 class Fun(Stmt):
     name: Token
     params: List[Token]
-    body: List[Stmt]
+    # A LazyBody when the parser deferred it.
+    body: Sequence[Stmt]
 
 
 @dataclass(slots=True, eq=True, frozen=True)
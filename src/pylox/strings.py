@@ -0,0 +1,144 @@
+from typing import List
+
+from pylox.runtime import NativeClass, NativeInstance, Natives, native_method, stringify
+
+# Concatenations shorter than this stay plain python strings.
+ROPE_THRESHOLD = 4096
+# Short right hand sides are merged into the rope's last leaf to keep the node count low.
+_LEAF_SIZE = 1024
+
+
+class Rope:
+    """Lazy string concatenation, flattened only once its value is observed."""
+
+    __slots__ = ("_left", "_right", "_flat", "_length")
+
+    def __init__(self, left: "str | Rope", right: "str | Rope", length: int):
+        # Emptied once flattened, so the parts can be freed.
+        self._left = left
+        self._right = right
+        self._flat: str | None = None
+        self._length = length
+
+    def flatten(self) -> str:
+        if self._flat is None:
+            parts: List[str] = []
+            stack: List[str | Rope] = [self]
+            while stack:
+                node = stack.pop()
+                if isinstance(node, str):
+                    parts.append(node)
+                elif node._flat is not None:
+                    parts.append(node._flat)
+                else:
+                    stack.append(node._right)
+                    stack.append(node._left)
+            self._flat = "".join(parts)
+            self._left = self._right = ""
+        return self._flat
+
+    def __len__(self):
+        return self._length
+
+    def __str__(self):
+        return self.flatten()
+
+    def __repr__(self):
+        return f"Rope({self.flatten()!r})"
+
+    def __hash__(self):
+        return hash(self.flatten())
+
+    def __eq__(self, other: object):
+        if isinstance(other, str | Rope):
+            return self.flatten() == str(other)
+        return NotImplemented
+
+    def __lt__(self, other: object):
+        if isinstance(other, str | Rope):
+            return self.flatten() < str(other)
+        return NotImplemented
+
+    def __le__(self, other: object):
+        if isinstance(other, str | Rope):
+            return self.flatten() <= str(other)
+        return NotImplemented
+
+    def __gt__(self, other: object):
+        if isinstance(other, str | Rope):
+            return self.flatten() > str(other)
+        return NotImplemented
+
+    def __ge__(self, other: object):
+        if isinstance(other, str | Rope):
+            return self.flatten() >= str(other)
+        return NotImplemented
+
+    def __add__(self, other: object):
+        if isinstance(other, str | Rope):
+            return concat(self, other)
+        return NotImplemented
+
+    def __radd__(self, other: object):
+        if isinstance(other, str | Rope):
+            return concat(other, self)
+        return NotImplemented
+
+
+LoxString = str | Rope
+
+
+def concat(lhs: LoxString, rhs: LoxString) -> LoxString:
+    length = len(lhs) + len(rhs)
+    if length < ROPE_THRESHOLD:
+        return str(lhs) + str(rhs)
+
+    if (
+        isinstance(lhs, Rope)
+        and lhs._flat is None
+        and isinstance(lhs._right, str)
+        and isinstance(rhs, str)
+        and len(lhs._right) + len(rhs) <= _LEAF_SIZE
+    ):
+        return Rope(lhs._left, lhs._right + rhs, length)
+
+    return Rope(lhs, rhs, length)
+
+
+class StringBuilder(NativeInstance):
+    __slots__ = ("parts", "_length")
+
+    def __init__(self):
+        self.parts: List[str] = []
+        self._length = 0
+
+    @native_method()
+    def append(self, value):
+        part = stringify(value)
+        self.parts.append(part)
+        self._length += len(part)
+        return self
+
+    @native_method()
+    def length(self):
+        return float(self._length)
+
+    @native_method()
+    def clear(self):
+        self.parts.clear()
+        self._length = 0
+        return self
+
+    @native_method(name="toString")
+    def to_string(self):
+        if len(self.parts) > 1:
+            self.parts[:] = ["".join(self.parts)]
+        return self.parts[0] if self.parts else ""
+
+    def __str__(self):
+        return self.to_string()
+
+
+STRINGS: Natives = {
+    "StringBuilder": NativeClass("StringBuilder", 0, StringBuilder),
+}
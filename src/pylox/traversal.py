@@ -1,4 +1,5 @@
-from typing import Callable
+from dataclasses import fields, replace
+from typing import Any, Callable, ClassVar, Dict, Iterator, Sequence
 
 from pylox.expr import (
     Assign,
@@ -11,6 +12,7 @@ from pylox.expr import (
     Literal,
     Logical,
     Set,
+    Super,
     This,
     Unary,
     Variable,
@@ -19,72 +21,122 @@ from pylox.iexpr import Expr, Stmt
 from pylox.stmt import Block, Class, ExprStmt, Fun, If, Print, Return, Stmt, Var, While
 
 
-Visitor = Callable[[Expr | Stmt], None]
+Node = Expr | Stmt
+Visit = Callable[[Node], None]
 
 
 class TraversalException(Exception):
     """Error while traversing"""
 
 
-def visit_children(expr_or_stmt: Expr | Stmt, visit: Visitor) -> None:
-    match expr_or_stmt:
-        case Print(expr):
-            visit(expr)
-        case ExprStmt(expr):
-            if expr:
-                visit(expr)
-        case Fun(_, _, body):
-            for stmt in body:
-                visit(stmt)
-        case Class(_, _, methods):
-            for method in methods:
-                visit(method)
-        case Var(_, initializer):
-            if initializer:
-                visit(initializer)
-        case Block(stmts):
-            for stmt in stmts:
-                visit(stmt)
-        case If(condition, if_case, else_case):
-            visit(condition)
-            visit(if_case)
-            if else_case:
-                visit(else_case)
-        case While(condition, body):
-            visit(condition)
-            visit(body)
-        case Return(_, expr):
-            if expr:
-                visit(expr)
-        case Literal(val_expr):
-            pass
-        case Binary(left, _, right):
-            visit(left)
-            visit(right)
-        case Unary(_, right):
-            visit(right)
-        case Logical(left, _, right):
-            visit(left)
-            visit(right)
-        case Call(callee_expr, arg_exprs, _):
-            visit(callee_expr)
-            for expr in arg_exprs:
-                visit(expr)
-        case Grouping(expr):
-            visit(expr)
-        case Assign(_, val_expr):
-            visit(val_expr)
-        case Variable(_):
-            pass
-        case This(_):
-            pass
-        case Lambda(_, _, body):
-            for stmt in body:
-                visit(stmt)
-        case Get(obj, _):
-            visit(obj)
-        case Set(obj, _, value):
-            visit(obj)
-            visit(value)
-        case _:
-            raise TraversalException("Unhandled expr_or_stmt", expr_or_stmt)
+_CHILDREN: Dict[type, Callable[[Any], Sequence[Node]]] = {
+    Print: lambda node: (node.expr,),
+    ExprStmt: lambda node: (node.expr,) if node.expr else (),
+    Fun: lambda node: node.body,
+    Class: lambda node: node.methods,
+    Var: lambda node: (node.initializer,) if node.initializer else (),
+    Block: lambda node: node.stmts,
+    If: lambda node: (
+        (node.condition, node.if_case, node.else_case)
+        if node.else_case
+        else (node.condition, node.if_case)
+    ),
+    While: lambda node: (node.condition, node.body),
+    Return: lambda node: (node.value,) if node.value else (),
+    Literal: lambda node: (),
+    Binary: lambda node: (node.left, node.right),
+    Unary: lambda node: (node.right,),
+    Logical: lambda node: (node.left, node.right),
+    Call: lambda node: (node.callee, *node.args),
+    Grouping: lambda node: (node.expr,),
+    Assign: lambda node: (node.value,),
+    Variable: lambda node: (),
+    This: lambda node: (),
+    Super: lambda node: (),
+    Lambda: lambda node: node.body,
+    Get: lambda node: (node.object,),
+    Set: lambda node: (node.object, node.value),
+}
+
+_NODE_TYPES: Dict[str, type] = {node_type.__name__: node_type for node_type in _CHILDREN}
+
+
+def children(node: Node) -> Sequence[Node]:
+    """The child expressions and statements of node, in evaluation order."""
+    get_children = _CHILDREN.get(node.__class__)
+    if get_children is None:
+        raise TraversalException("Unhandled expr_or_stmt", node)
+    return get_children(node)
+
+
+def visit_children(expr_or_stmt: Node, visit: Visit) -> None:
+    for child in children(expr_or_stmt):
+        visit(child)
+
+
+def walk(node: Node) -> Iterator[Node]:
+    """Node and its descendants in pre-order, with an explicit stack instead of recursion."""
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        yield node
+        stack.extend(reversed(children(node)))
+
+
+class Visitor:
+    """Base class for passes over the syntax tree.
+
+    Subclasses define visit_<NodeClass> methods (e.g. visit_Binary). visit dispatches on the
+    node's class through a table built once per subclass; nodes without a handler go to
+    generic_visit, which visits their children.
+    """
+
+    __slots__ = ()
+
+    _handlers: ClassVar[Dict[type, Callable[[Any, Any], Any]]] = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        handlers: Dict[type, Callable[[Any, Any], Any]] = {}
+        for name in dir(cls):
+            if name.startswith("visit_"):
+                node_type = _NODE_TYPES.get(name[len("visit_") :])
+                if node_type is None:
+                    raise TraversalException(f"{cls.__name__}.{name} handles no node type")
+                handlers[node_type] = getattr(cls, name)
+        cls._handlers = handlers
+
+    def visit(self, node: Node) -> Any:
+        handler = self._handlers.get(node.__class__)
+        if handler is None:
+            return self.generic_visit(node)
+        return handler(self, node)
+
+    def generic_visit(self, node: Node) -> Any:
+        for child in children(node):
+            self.visit(child)
+
+
+class Transformer(Visitor):
+    """A visitor whose handlers return the node to replace the visited one with.
+
+    generic_visit transforms the children and rebuilds the node only if any of them changed.
+    """
+
+    __slots__ = ()
+
+    def generic_visit(self, node: Node) -> Node:
+        changes = {}
+        for field in fields(node):
+            value = getattr(node, field.name)
+            if isinstance(value, Expr | Stmt):
+                new_value = self.visit(value)
+                if new_value is not value:
+                    changes[field.name] = new_value
+            elif isinstance(value, list):
+                new_values = [
+                    self.visit(item) if isinstance(item, Expr | Stmt) else item for item in value
+                ]
+                if any(new is not old for new, old in zip(new_values, value)):
+                    changes[field.name] = new_values
+        return replace(node, **changes) if changes else node
@@ -0,0 +1,202 @@
+import operator
+from array import array
+from functools import cache
+from math import copysign, inf, isnan, nan
+from typing import Any, Callable, Iterable
+
+from pylox.containers import Array
+from pylox.runtime import (
+    NativeClass,
+    NativeError,
+    NativeInstance,
+    Natives,
+    integer_arg,
+    native,
+    native_method,
+    number_arg,
+    stringify,
+)
+
+VECTORS: Natives = {}
+
+
+@cache
+def _numpy() -> Any:
+    # Imported on first use so loading the stdlib does not pay for numpy.
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def _divide(lhs: float, rhs: float) -> float:
+    # IEEE division by zero, as numpy does it, for the array fallback.
+    try:
+        return lhs / rhs
+    except ZeroDivisionError:
+        if lhs == 0.0 or isnan(lhs):
+            return nan
+        return copysign(inf, lhs) * copysign(1.0, rhs)
+
+
+class Vector(NativeInstance):
+    """Fixed size float64 vector backed by a numpy array, or a memoryview of array('d')."""
+
+    __slots__ = ("data",)
+
+    def __init__(self, data: Any):
+        self.data = data
+
+    @staticmethod
+    def zeros(size: int) -> "Vector":
+        if np := _numpy():
+            return Vector(np.zeros(size, dtype=np.float64))
+        return Vector(memoryview(array("d", bytes(8 * size))))
+
+    @staticmethod
+    def of(values: Iterable[float]) -> "Vector":
+        if np := _numpy():
+            return Vector(np.fromiter(values, dtype=np.float64))
+        return Vector(memoryview(array("d", values)))
+
+    @staticmethod
+    def from_buffer(buffer: Any) -> "Vector":
+        """Wrap a host buffer of float64 values without copying it."""
+        if np := _numpy():
+            return Vector(np.frombuffer(buffer, dtype=np.float64))
+        return Vector(memoryview(buffer).cast("B").cast("d"))
+
+    def __buffer__(self, flags: int) -> memoryview:
+        return memoryview(self.data)
+
+    def buffer(self) -> memoryview:
+        return memoryview(self.data)
+
+    def _is_numpy(self) -> bool:
+        return not isinstance(self.data, memoryview)
+
+    def _operand(self, other: object) -> Any:
+        if isinstance(other, Vector):
+            if len(other.data) != len(self.data):
+                raise NativeError("Vector lengths differ.")
+            return other.data
+        return number_arg(other, "Vector operand")
+
+    def _elementwise(self, op: Callable[[Any, Any], Any], other: object) -> "Vector":
+        rhs = self._operand(other)
+        if self._is_numpy():
+            np = _numpy()
+            with np.errstate(divide="ignore", invalid="ignore"):
+                return Vector(np.asarray(op(self.data, rhs), dtype=np.float64))
+        if isinstance(rhs, float):
+            return Vector.of(op(x, rhs) for x in self.data)
+        return Vector.of(map(op, self.data, rhs))
+
+    def _check_index(self, i: object) -> int:
+        index = integer_arg(i, "Vector index")
+        if not 0 <= index < len(self.data):
+            raise NativeError(f"Vector index {index} out of range.")
+        return index
+
+    @native_method()
+    def get(self, i):
+        return float(self.data[self._check_index(i)])
+
+    @native_method()
+    def set(self, i, value):
+        self.data[self._check_index(i)] = number_arg(value, "Vector element")
+        return value
+
+    @native_method()
+    def length(self):
+        return float(len(self.data))
+
+    @native_method()
+    def slice(self, start, end):
+        return Vector(self.data[integer_arg(start, "Slice start") : integer_arg(end, "Slice end")])
+
+    @native_method()
+    def add(self, other):
+        return self._elementwise(operator.add, other)
+
+    @native_method()
+    def sub(self, other):
+        return self._elementwise(operator.sub, other)
+
+    @native_method()
+    def mul(self, other):
+        return self._elementwise(operator.mul, other)
+
+    @native_method()
+    def div(self, other):
+        return self._elementwise(operator.truediv if self._is_numpy() else _divide, other)
+
+    @native_method()
+    def lt(self, other):
+        return self._elementwise(operator.lt, other)
+
+    @native_method()
+    def le(self, other):
+        return self._elementwise(operator.le, other)
+
+    @native_method()
+    def gt(self, other):
+        return self._elementwise(operator.gt, other)
+
+    @native_method()
+    def ge(self, other):
+        return self._elementwise(operator.ge, other)
+
+    @native_method()
+    def eq(self, other):
+        return self._elementwise(operator.eq, other)
+
+    @native_method()
+    def sum(self):
+        return float(self.data.sum()) if self._is_numpy() else float(sum(self.data))
+
+    @native_method()
+    def min(self):
+        if not len(self.data):
+            raise NativeError("min of empty Vector.")
+        return float(self.data.min()) if self._is_numpy() else min(self.data)
+
+    @native_method()
+    def max(self):
+        if not len(self.data):
+            raise NativeError("max of empty Vector.")
+        return float(self.data.max()) if self._is_numpy() else max(self.data)
+
+    @native_method()
+    def mean(self):
+        if not len(self.data):
+            raise NativeError("mean of empty Vector.")
+        return self.sum() / len(self.data)
+
+    @native_method(name="toArray")
+    def to_array(self):
+        return Array([float(x) for x in self.data])
+
+    def __len__(self):
+        return len(self.data)
+
+    def __str__(self):
+        return f"Vector({', '.join(stringify(float(x)) for x in self.data)})"
+
+
+def _new_vector(size: object) -> Vector:
+    length = integer_arg(size, "Vector size")
+    if length < 0:
+        raise NativeError("Vector size must not be negative.")
+    return Vector.zeros(length)
+
+
+VECTORS["Vector"] = NativeClass("Vector", 1, _new_vector)
+
+
+@native(VECTORS, name="vectorOf")
+def _vector_of(items):
+    if not isinstance(items, Array):
+        raise NativeError("vectorOf expects an Array.")
+    return Vector.of(number_arg(item, "Vector element") for item in items.items)
@@ -0,0 +1,24 @@
+import pytest
+
+from pylox.environment import init_global_env
+from pylox.lox import run
+
+
+@pytest.fixture
+def run_stdlib():
+    """Runs a program against fresh globals with the native standard library."""
+
+    def run_stdlib(input: str) -> None:
+        run(input, init_global_env(stdlib=True))
+
+    return run_stdlib
+
+
+@pytest.fixture
+def assert_out_lines(capsys):
+    """Asserts that the output printed since the last check is exactly the given lines."""
+
+    def assert_out_lines(*expected_lines: str) -> None:
+        assert capsys.readouterr().out == "\n".join(expected_lines) + "\n"
+
+    return assert_out_lines
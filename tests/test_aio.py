@@ -0,0 +1,97 @@
+import asyncio
+
+import pytest
+
+import pylox
+from pylox.environment import init_global_env
+from pylox.runtime import NativeError, native
+
+
+def test_run_async(assert_out_lines):
+    asyncio.run(pylox.run_async("var x = 0; while (x < 5) x = x + 1; print x;"))
+
+    assert_out_lines("5")
+
+
+def test_yields_to_event_loop(assert_out_lines):
+    ticks = []
+
+    async def ticker():
+        while True:
+            ticks.append(None)
+            await asyncio.sleep(0)
+
+    async def main():
+        task = asyncio.create_task(ticker())
+        await pylox.run_async("var i = 0; while (i < 1000) i = i + 1; print i;", yield_interval=10)
+        task.cancel()
+
+    asyncio.run(main())
+
+    assert_out_lines("1000")
+    assert len(ticks) >= 90
+
+
+def test_scheduler_waits_on_the_event_loop(assert_out_lines):
+    ticks = []
+
+    async def ticker():
+        while True:
+            ticks.append(None)
+            await asyncio.sleep(0.01)
+
+    async def main():
+        task = asyncio.create_task(ticker())
+        await pylox.run_async(
+            """
+            var channel = Channel();
+            fun worker() { sleep(0.05); channel.send("sent"); return "joined"; }
+            var task = spawn(worker);
+            sleep(0.1);
+            print channel.receive();
+            print task.join();
+            print Channel().receive();
+            """,
+            init_global_env(stdlib=True),
+        )
+        task.cancel()
+
+    asyncio.run(main())
+
+    assert_out_lines(
+        "sent",
+        "joined",
+        "Error (8:37): Deadlock: receive on an empty channel with no runnable tasks.",
+    )
+    assert len(ticks) >= 5
+
+
+def test_async_native(assert_out_lines):
+    natives = {}
+
+    @native(natives)
+    async def fetch(key):
+        await asyncio.sleep(0)
+        return key + "!"
+
+    @native(natives)
+    async def fail():
+        raise NativeError("fetch failed.")
+
+    env = init_global_env()
+    env.define_natives(natives)
+
+    asyncio.run(pylox.run_async('print fetch("a") + fetch("b");\nfail();\nprint "no";', env))
+
+    assert_out_lines("a!b!", "Error (2:6): fetch failed.")
+
+
+def test_cancellation():
+    async def main():
+        task = asyncio.create_task(pylox.run_async("while (true) {}", yield_interval=1))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(main())
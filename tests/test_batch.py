@@ -0,0 +1,107 @@
+import random
+
+import pytest
+
+import pylox.batch
+from pylox.batch import Rule
+
+
+@pytest.fixture(params=["numpy", "interpreter"])
+def backend(request, monkeypatch):
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(pylox.batch, "_numpy", lambda: None)
+    return request.param
+
+
+def _records(count: int):
+    rng = random.Random(7)
+    return [
+        {
+            "price": rng.choice([0, 1.5, 10, 99.25]),
+            "qty": rng.randint(-2, 20),
+            "vip": rng.random() < 0.3,
+        }
+        for _ in range(count)
+    ]
+
+
+@pytest.mark.parametrize(
+    "expression",
+    [
+        "price * qty - 3",
+        "price * qty > 100 or vip",
+        "!vip and qty >= 10",
+        "(price + 1) / (qty + 3) <= 2",
+        "-price == -10 and qty != 0",
+        "vip == qty",
+        "qty and price",
+        "price or qty",
+        "!price",
+        "qty != 0 and price / qty > 1",
+    ],
+)
+def test_columns_match_interpreter(backend, expression):
+    records = _records(300)
+    expected = [Rule(expression).evaluate(record) for record in records]
+
+    results = list(Rule(expression, batch_size=64).evaluate_many(records))
+
+    assert results == expected
+    assert all(type(r) is type(e) for r, e in zip(results, expected))
+
+
+def test_mixed_batches_fall_back_to_the_interpreter(backend):
+    records = [{"x": 1}, {"x": None}, {"x": "a"}, {"x": 2.5}]
+
+    assert list(Rule("x == 1", batch_size=2).evaluate_many(records)) == [True, False, False, False]
+
+
+def test_prelude_functions_and_globals(backend):
+    rule = Rule(
+        "discount(price) > limit",
+        prelude="var limit = 5; fun discount(p) { return p * 0.5; }",
+    )
+
+    assert list(rule.evaluate_many([{"price": 20}, {"price": 4}])) == [True, False]
+    assert rule.inputs == ["price"]
+
+
+def test_numeric_globals_from_the_prelude_are_columns_constants(backend):
+    rule = Rule("x * scale", prelude="var scale = 3;")
+
+    assert list(rule.evaluate_many({"x": i} for i in range(3))) == [0.0, 3.0, 6.0]
+
+
+def test_division_by_zero_yields_nil(backend, capsys):
+    rule = Rule("x / y")
+
+    assert list(rule.evaluate_many([{"x": 1, "y": 2}, {"x": 1, "y": 0}])) == [0.5, None]
+    assert capsys.readouterr().out == "Error (rule): Division by zero.\n"
+
+
+def test_missing_and_wrong_type_inputs_yield_nil(backend, capsys):
+    rule = Rule("x + 1 > y")
+    records = [{"x": 1, "y": 0}, {"y": 0}, {"x": 1, "y": "a"}, {"x": 3, "y": 1}]
+
+    assert list(rule.evaluate_many(records)) == [True, None, None, True]
+    errors = capsys.readouterr().out.splitlines()
+    assert len(errors) == 2
+    assert all(line.startswith("Error (rule): Operands of the wrong type") for line in errors)
+
+
+def test_runtime_errors_yield_nil(capsys):
+    rule = Rule("x.field")
+
+    assert list(rule.evaluate_many([{"x": 1}, {"x": 2}])) == [None, None]
+    assert "Only instances have fields." in capsys.readouterr().out
+
+
+def test_rejects_statements_and_syntax_errors():
+    with pytest.raises(ValueError):
+        Rule("var x = 1")
+    with pytest.raises(ValueError):
+        Rule("1 +")
+    with pytest.raises(ValueError):
+        Rule("x", prelude="fun (")
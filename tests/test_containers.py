@@ -0,0 +1,148 @@
+from pylox.containers import Array, Map
+from pylox.environment import init_global_env
+from pylox.lox import run
+
+
+def test_array(run_stdlib, assert_out_lines):
+    run_stdlib(
+        """
+        var a = Array();
+        for (var i = 0; i < 5; i = i + 1) a.push(i * i);
+        print a.length();
+        print a.get(3);
+        a.set(0, "zero");
+        print a;
+        print a.pop();
+        print a.slice(1, 3);
+        print a.length();
+        print Array;
+        print type(a) + type(Array);
+        """
+    )
+
+    assert_out_lines("5", "9", "[zero, 1, 4, 9, 16]", "16", "[1, 4]", "4", "Array", "instanceclass")
+
+
+def test_array_method_as_value(run_stdlib, assert_out_lines):
+    run_stdlib(
+        """
+        var a = Array();
+        var push = a.push;
+        push("x");
+        print a;
+        """
+    )
+
+    assert_out_lines("[x]")
+
+
+def test_array_index_errors(run_stdlib, assert_out_lines):
+    run_stdlib(
+        """
+        var a = Array();
+        a.push(1);
+        print a.get(1);
+        """
+    )
+
+    assert_out_lines("Error (4:22): Array index 1 out of range.")
+
+
+def test_array_non_integer_index(run_stdlib, assert_out_lines):
+    run_stdlib("Array().get(0.5);")
+
+    assert_out_lines("Error (1:16): Array index must be an integer.")
+
+
+def test_array_undefined_property(run_stdlib, assert_out_lines):
+    run_stdlib("Array().missing();")
+
+    assert_out_lines("Error (1:9): Undefined property.")
+
+
+def test_array_set_property(run_stdlib, assert_out_lines):
+    run_stdlib("Array().x = 1;")
+
+    assert_out_lines("Error (1:9): Cannot set properties on native instances.")
+
+
+def test_array_from_host():
+    env = init_global_env(stdlib=True)
+    env.define("data", Array([1.0, 2.0]))
+
+    run("data.push(data.get(0) + data.get(1));", env)
+
+    assert env.access_unbound("data").items == [1.0, 2.0, 3.0]
+
+
+def test_map(run_stdlib, assert_out_lines):
+    run_stdlib(
+        """
+        var m = Map();
+        m.set("a", 1);
+        m.set(2, "two");
+        m.set(true, "yes");
+        m.set(nil, "nothing");
+        print m.size();
+        print m.get("a");
+        print m.get(1 + 1);
+        print m.get(true) + m.get(nil);
+        print m.has("a");
+        print m.has("b");
+        print m.get("b");
+        print m.remove("a");
+        print m.size();
+        print m.keys();
+        print m;
+        """
+    )
+
+    assert_out_lines(
+        "4",
+        "1",
+        "two",
+        "yesnothing",
+        "true",
+        "false",
+        "nil",
+        "1",
+        "3",
+        "[2, true, nil]",
+        "{2: two, true: yes, nil: nothing}",
+    )
+
+
+def test_map_keys_follow_lox_equality(run_stdlib, assert_out_lines):
+    run_stdlib(
+        """
+        var m = Map();
+        m.set(1, "number");
+        m.set(true, "boolean");
+        print m.get(1);
+        print m.get(true);
+        print 1 == true;
+        print m.get(0) == m.get(false);
+        """
+    )
+
+    assert_out_lines("number", "boolean", "false", "true")
+
+
+def test_map_rejects_instance_keys(run_stdlib, assert_out_lines):
+    run_stdlib(
+        """
+        class T {}
+        Map().set(T(), 1);
+        """
+    )
+
+    assert_out_lines("Error (3:25): Map keys must be strings, numbers, booleans or nil.")
+
+
+def test_map_from_host():
+    env = init_global_env(stdlib=True)
+    env.define("table", Map({"x": 1.0, True: 2.0}))
+
+    run('table.set("y", table.get("x") + table.get(true));', env)
+
+    assert env.access_unbound("table").entries == {"x": 1.0, (bool, True): 2.0, "y": 3.0}
@@ -0,0 +1,91 @@
+from pylox.environment import init_global_env
+from pylox.interpreter import interpret
+from pylox.lox import load, run
+from pylox import parser
+from pylox.parser import parse
+from pylox.scanner import scan_tokens
+from pylox.stmt import LazyBody
+
+
+def test_global_bodies_are_deferred():
+    program = list(
+        parse(
+            scan_tokens(
+                """
+                fun f() { { fun inner() {} } }
+                class C { m() { return fun () {}; } }
+                var g = fun () {};
+                { fun local() {} }
+                """
+            ),
+            lazy=True,
+        )
+    )
+
+    f, c, g, block = program
+    assert isinstance(f.body, LazyBody) and f.body._stmts is None
+    assert isinstance(c.methods[0].body, LazyBody)
+    assert isinstance(g.initializer.body, LazyBody)
+    assert isinstance(block.stmts[0].body, list)
+    assert isinstance(f.body[0].stmts[0].body, list)
+
+
+def test_lazy_program_runs_like_eager(assert_out_lines):
+    run(
+        """
+        fun fib(n) { if (n < 2) return n; return fib(n - 1) + fib(n - 2); }
+        fun counter() {
+            var n = 0;
+            return fun () { n = n + 1; return n; };
+        }
+        class Base { greet() { return "base"; } }
+        class Derived < Base {
+            init(name) { this.name = name; }
+            greet() { return super.greet() + " " + this.name; }
+            later() { return fun () { return this.greet(); }; }
+        }
+        var count = counter();
+        count();
+        print fib(15);
+        print count();
+        print Derived("d").later()();
+        """,
+        lazy=True,
+    )
+
+    assert_out_lines("610", "2", "base d")
+
+
+def test_body_is_parsed_once_on_first_call(assert_out_lines):
+    env = init_global_env()
+    program = load("fun f(a) { return a + 1; } fun unused() {}", env, lazy=True)
+    interpret(program, env)
+    run("print f(1); print f(2);", env)
+
+    assert program[0].body._stmts is not None and program[0].body.bindings is not None
+    assert program[1].body._stmts is None
+    assert_out_lines("2", "3")
+
+
+def test_syntax_error_reported_on_first_call(assert_out_lines):
+    run('fun broken() { print 1 } print "before"; broken(); print "after";', lazy=True)
+
+    assert_out_lines("before", "Error (1:24): Expect ';' after value.")
+
+
+def test_lazy_method_is_loaded_once(assert_out_lines, monkeypatch):
+    parsed = []
+    parse_body = parser.parse_body
+    monkeypatch.setattr(
+        parser, "parse_body", lambda *args: parsed.append(args) or parse_body(*args)
+    )
+    env = init_global_env()
+    program = load("class C { m() { return 1; } broken() { print 1 } }", env, lazy=True)
+    interpret(program, env)
+    method = env.access_unbound("C").methods["m"]
+    run("var c = C(); print c.m(); print c.m(); c.broken();", env)
+    run("c.broken();", env)
+
+    assert len(parsed) == 2
+    assert not isinstance(method.body, LazyBody)
+    assert_out_lines("1", "1", "Error (1:48): Expect ';' after value.")
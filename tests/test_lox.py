@@ -1,6 +1,10 @@
 import pytest
 
-from pylox.lox import run
+from pylox.environment import init_global_env
+from pylox.interpreter import interpret
+from pylox.lox import Lox, load, run
+from pylox.resolver import Bindings, resolve
+from pylox.scanner import Token, TokenType
 
 
 def _assert_std_out(capsys, expected):
@@ -194,7 +198,7 @@ def test_for_empty(capsys):
         }
         """
     )
-    _assert_out_lines(capsys, "0", "Error (6): Attempt to access undefined variable y")
+    _assert_out_lines(capsys, "0", "Error (6:19): Attempt to access undefined variable y")
 
 
 def test_clock(capsys):
@@ -346,7 +350,7 @@ def test_self_reference_from_definition(capsys):
         """
     )
 
-    _assert_out_lines(capsys, "Error (4): Cannot bind reference to y during definition.")
+    _assert_out_lines(capsys, "Error (4:21): Cannot bind reference to y during definition.")
 
 
 def test_print_class(capsys):
@@ -511,3 +515,228 @@ def test_super_call(capsys):
     )
 
     _assert_out_lines(capsys, "HelloT", "HelloD", "HelloT", "HelloD")
+
+
+def test_truthiness(capsys):
+    run(
+        """
+        if (0) print "zero is true";
+        if ("") print "empty string is true";
+        if (nil) print "nil is true"; else print "nil is false";
+        print !0;
+        print !nil;
+        print 0 and "and";
+        print false or "or";
+        """
+    )
+
+    _assert_out_lines(
+        capsys, "zero is true", "empty string is true", "nil is false", "false", "true", "and", "or"
+    )
+
+
+def test_equality(capsys):
+    run(
+        """
+        print 1 == 1;
+        print "a" == "a";
+        print nil == nil;
+        print 1 == "1";
+        print true == 1;
+        print false != 0;
+        print nil != false;
+        var s = "ab";
+        print s == "a" + "b";
+        """
+    )
+
+    _assert_out_lines(capsys, "true", "true", "true", "false", "false", "true", "true", "true")
+
+
+def test_closures_share_captured_variables(capsys):
+    run(
+        """
+        fun pair() {
+            var n = 0;
+            var inc = fun () { n = n + 1; };
+            var get = fun () { return n; };
+            inc();
+            inc();
+            print get();
+            n = 10;
+            print get();
+        }
+        pair();
+        """
+    )
+
+    _assert_out_lines(capsys, "2", "10")
+
+
+def test_closure_captures_enclosing_function_variables(capsys):
+    run(
+        """
+        fun outer() {
+            var x = "outer";
+            fun middle() {
+                fun inner() { print x; }
+                return inner;
+            }
+            return middle();
+        }
+        outer()();
+        """
+    )
+
+    _assert_out_lines(capsys, "outer")
+
+
+def test_local_recursion(capsys):
+    run(
+        """
+        {
+            fun fib(n) {
+                if (n < 2) return n;
+                return fib(n - 1) + fib(n - 2);
+            }
+            print fib(10);
+        }
+        """
+    )
+
+    _assert_out_lines(capsys, "55")
+
+
+def test_local_class(capsys):
+    run(
+        """
+        fun make() {
+            var greeting = "hi";
+            class Base {
+                greet() { return greeting; }
+            }
+            class Derived < Base {
+                greet() { return super.greet() + "!"; }
+                again() { return fun () { return this.greet(); }; }
+            }
+            return Derived;
+        }
+        var D = make();
+        print D().greet();
+        print D().again()();
+        """
+    )
+
+    _assert_out_lines(capsys, "hi!", "hi!")
+
+
+def test_closure_retains_only_captured_variables():
+    lox = Lox()
+    lox.run(
+        """
+        fun make() {
+            var big = "x";
+            var small = 1;
+            { var inner = 2; }
+            return fun () { return small; };
+        }
+        var f = make();
+        """
+    )
+
+    closure = lox.globals.access_unbound("f").env
+    assert closure._map == [lox.globals._map[0], {"small": 1.0}]
+
+
+def test_call_site_with_changing_callees(capsys):
+    run(
+        """
+        fun one(a) { return "one " + a; }
+        fun two(a, b) { return "two"; }
+        class A { init(x) { this.x = x; } }
+        class B {}
+        var callees = fun (i) {
+            if (i == 0) return one;
+            if (i == 1) return A;
+            if (i == 2) return one;
+            if (i == 3) return fun (a) { return "lambda " + a; };
+            if (i == 4) return fun (a) { return "other " + a; };
+            if (i == 5) return B;
+            return two;
+        };
+        for (var i = 0; i < 7; i = i + 1) {
+            var result = callees(i)("x");
+            if (i == 1) result = result.x;
+            print result;
+        }
+        """
+    )
+
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[:5] == ["one x", "x", "one x", "lambda x", "other x"]
+    assert lines[5].endswith("Wrong nargs!")
+
+
+def test_globals_are_late_bound(capsys):
+    run(
+        """
+        fun get() { return later; }
+        var later = 1;
+        print get();
+        var later = 2;
+        print get();
+        later = 3;
+        print get();
+        fun get() { return "redefined"; }
+        print get();
+        """
+    )
+
+    _assert_out_lines(capsys, "1", "2", "3", "redefined")
+
+
+def test_tree_runs_against_separate_globals(capsys):
+    first, second = init_global_env(), init_global_env()
+    program = load("var x = x + 1; print x;", first)
+    second.merge_bindings(resolve(program))
+    first.define("x", 1.0)
+    second.define("x", 10.0)
+
+    interpret(program, first)
+    interpret(program, second)
+    interpret(program, first)
+
+    _assert_out_lines(capsys, "2", "11", "3")
+
+
+def test_inputs_on_one_instance_keep_their_own_bindings():
+    lines = []
+    lox = Lox(output=lines.append)
+    lox.run("fun f() { var a = 1; { var a = 5; return a; } }")
+    lox.run("print f();")
+    lox.run("fun g() { var a = 1; { var b = 5; return a; } }")
+    lox.run("print f();")
+
+    assert lines == ["5", "5"]
+    assert lox.diagnostics == []
+
+
+def test_closures_on_one_instance_capture_their_own_variables():
+    lines = []
+    lox = Lox(output=lines.append)
+    lox.run("fun mk() { var x = 1; { return fun () { return x; }; } }")
+    lox.run("fun nk() { { var x = 2; return fun () { return x; }; } }")
+    lox.run("print mk()();")
+
+    assert lines == ["1"]
+    assert lox.diagnostics == []
+
+
+def test_missing_capture_is_a_lox_runtime_error():
+    function = Token(TokenType.IDENTIFIER, "f", None, 0)
+    bindings = Bindings()
+    bindings.captures[function] = (("x", 1),)
+    env = init_global_env().with_bindings(bindings).create_child()
+
+    with pytest.raises(RuntimeError, match="undefined variable x"):
+        env.closure(function)
@@ -1,7 +1,7 @@
 from typing import List
 
 from pylox.stmt import Stmt
-from pylox.expr import Expr, Literal
+from pylox.expr import Assign, Call, Expr, Grouping, Literal, Set, Unary
 from pylox.parser import parse_expr, parse
 from pylox.scanner import TokenType, scan_tokens
 
@@ -60,3 +60,49 @@ print "Hello World";
     assert prog[0].expr.left.left.value == 1.0
     assert prog[1].expr.value == "Hello World"
     assert prog[2].expr.right.value == 50.45
+
+
+def test_operators_specialized():
+    binary = _scan_and_parse_expr("1 < 2")
+    unary = _scan_and_parse_expr("!true")
+    logical = _scan_and_parse_expr("a or b and c")
+
+    assert binary.op(1.0, 2.0) is True
+    assert unary.op(True) is False
+    assert logical.short_circuit is True
+    assert logical.right.short_circuit is False
+
+
+def test_precedence_and_associativity():
+    expr = _scan_and_parse_expr("a = b.c = -x * 2 + 3 < 4 == !y or z and w(1)")
+
+    assert isinstance(expr, Assign)
+    assert isinstance(expr.value, Set)
+    logical = expr.value.value
+    assert logical.short_circuit is True
+    equality = logical.left
+    assert equality.operator.token == TokenType.EQUAL_EQUAL
+    assert equality.left.operator.token == TokenType.LESS
+    assert equality.left.left.left.operator.token == TokenType.STAR
+    assert isinstance(equality.left.left.left.left, Unary)
+    assert isinstance(logical.right.right, Call)
+
+
+def test_deeply_nested_expression():
+    depth = 300
+    expr = _scan_and_parse_expr("(" * depth + "1" + ")" * depth + " - 2 - 3")
+
+    assert expr.right.value == 3
+    assert expr.left.right.value == 2
+
+
+def test_nesting_beyond_the_recursion_limit():
+    depth = 10000
+    expr = _scan_and_parse_expr("(-" * depth + "1" + ")" * depth + " * 2")
+
+    assert expr.right.value == 2
+    expr = expr.left
+    for _ in range(depth):
+        assert isinstance(expr, Grouping) and isinstance(expr.expr, Unary)
+        expr = expr.expr.right
+    assert expr.value == 1
@@ -0,0 +1,167 @@
+import multiprocessing
+
+import pytest
+
+from pylox.environment import init_global_env
+from pylox.lox import run
+
+pytestmark = pytest.mark.skipif(
+    "fork" not in multiprocessing.get_all_start_methods(), reason="needs fork"
+)
+
+
+@pytest.fixture
+def env():
+    env = init_global_env(stdlib=True)
+    yield env
+    if env.process_pool is not None:
+        env.process_pool.shutdown()
+
+
+def test_spawn_process_copies_values_both_ways(env, assert_out_lines):
+    run(
+        """
+        class Point {
+            init(x, y) { this.x = x; this.y = y; }
+            sum() { return this.x + this.y; }
+        }
+        fun scale(p) { return Point(p.x * 2, p.y * 2); }
+        fun tally(items) {
+            var counts = Map();
+            for (var i = 0; i < items.length(); i = i + 1) counts.set(items.get(i), i);
+            return counts;
+        }
+        var items = Array();
+        items.push("a");
+        items.push(true);
+        items.push(nil);
+        print spawnProcess(scale, Point(1, 2)).join().sum();
+        var counts = spawnProcess(tally, items).join();
+        print counts.get("a") + counts.get(true);
+        print counts.has(1);
+        """,
+        env,
+    )
+
+    assert_out_lines("6", "1", "false")
+
+
+def test_actor_receives_messages_over_a_channel(env, assert_out_lines):
+    run(
+        """
+        fun actor(inbox) {
+            var total = 0;
+            var n = inbox.receive();
+            while (n != nil) {
+                total = total + n;
+                n = inbox.receive();
+            }
+            inbox.send(total);
+            return "done";
+        }
+        var inbox = ProcessChannel();
+        var handle = spawnProcess(actor, inbox);
+        for (var i = 1; i <= 4; i = i + 1) inbox.send(i);
+        inbox.send(nil);
+        print handle.join();
+        print inbox.receive();
+        """,
+        env,
+    )
+
+    assert_out_lines("done", "10")
+
+
+def test_functions_defined_after_the_workers_started(env, assert_out_lines):
+    run(
+        """
+        fun first(x) { return x + 1; }
+        print spawnProcess(first, 1).join();
+        fun second(x) { return x + 2; }
+        print spawnProcess(second, 1).join();
+        fun first(x) { return x + 3; }
+        print spawnProcess(first, 1).join();
+        """,
+        env,
+    )
+
+    assert_out_lines("2", "3", "4")
+
+
+@pytest.mark.parametrize(
+    "input, message",
+    [
+        ("spawnProcess(fun (x) { return x; }, 1);", "Only global functions"),
+        ("fun f(x) { return x; } spawnProcess(f, f);", "Only numbers, strings"),
+        ("fun f(x) { return x; } var a = Array(); a.push(a); spawnProcess(f, a);", "itself"),
+        ("fun f() { return 1; } spawnProcess(f, 1);", "one parameter"),
+    ],
+)
+def test_spawn_process_errors(capsys, env, input, message):
+    run(input, env)
+
+    assert message in capsys.readouterr().out
+
+
+@pytest.mark.parametrize("count", [3, 10])
+def test_parallel_map_keeps_order(env, count, assert_out_lines):
+    run(
+        f"""
+        class Box {{ init(v) {{ this.v = v; }} }}
+        fun square(box) {{ return box.v * box.v; }}
+        var boxes = Array();
+        for (var i = 0; i < {count}; i = i + 1) boxes.push(Box(i));
+        var squares = parallelMap(square, boxes, 4);
+        print squares.length();
+        print squares.get({count} - 1);
+        print squares.slice(0, 3);
+        """,
+        env,
+    )
+
+    assert_out_lines(str(count), str((count - 1) ** 2), "[0, 1, 4]")
+
+
+@pytest.mark.parametrize("count", [2, 10])
+def test_parallel_map_copies_values_for_any_input_size(capsys, env, count):
+    run(
+        f"""
+        class Box {{ init(v) {{ this.v = v; }} }}
+        fun bump(box) {{ box.v = box.v + 1; return box; }}
+        fun itself(box) {{ return itself; }}
+        var boxes = Array();
+        for (var i = 0; i < {count}; i = i + 1) boxes.push(Box(i));
+        var bumped = parallelMap(bump, boxes, 4);
+        print boxes.get(0).v;
+        print bumped.get(0).v;
+        print bumped.get(0) == boxes.get(0);
+        parallelMap(itself, boxes, 4);
+        """,
+        env,
+    )
+
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[:3] == ["0", "1", "false"]
+    assert "Only numbers, strings" in lines[3]
+
+
+def test_parallel_map_error_in_this_process_is_reported_once(capsys, env):
+    run("fun fail(x) { return missing; }", env)
+    run("var items = Array(); items.push(1); parallelMap(fail, items, 4);", env)
+
+    lines = capsys.readouterr().out.splitlines()
+    assert len(lines) == 1 and "undefined variable missing" in lines[0]
+
+
+@pytest.mark.parametrize(
+    "input, message",
+    [
+        ("parallelMap(fun (x) { return x; }, Array(), 1);", "Only global functions"),
+        ("fun f(x) { return x; } parallelMap(f, 1, 1);", "expects an Array"),
+        ("fun f(x) { return x; } parallelMap(f, Array(), 0);", "must be positive"),
+    ],
+)
+def test_parallel_map_errors(capsys, env, input, message):
+    run(input, env)
+
+    assert message in capsys.readouterr().out
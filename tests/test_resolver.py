@@ -0,0 +1,89 @@
+import pytest
+
+from pylox.parser import parse
+from pylox.resolver import GlobalKind, Resolver, ResolverSession, resolve
+from pylox.scanner import scan_tokens
+
+
+def _parse(input: str):
+    return list(parse(scan_tokens(input)))
+
+
+def test_resolve_local_depths():
+    program = _parse("var g; { var a; { var b; a; b; g; } }")
+    bindings = resolve(program)
+
+    depths = {token.lexeme: depth for token, depth in bindings.items()}
+    assert depths == {"a": -2, "b": -1}
+
+
+def test_session_tracks_globals_across_programs():
+    session = ResolverSession()
+
+    session.resolve(_parse("var x = 1; fun f() { var local; } class C {}"))
+    session.resolve(_parse("{ var y; }"))
+
+    assert {name: info.kind for name, info in session.globals.items()} == {
+        "x": GlobalKind.VARIABLE,
+        "f": GlobalKind.FUNCTION,
+        "C": GlobalKind.CLASS,
+    }
+    assert session.lookup("local") is None
+
+
+def test_session_invalidates_redefined_globals():
+    session = ResolverSession()
+    invalidated = []
+    session.on_invalidate(invalidated.append)
+
+    session.resolve(_parse("fun f() {}"))
+    session.resolve(_parse("var g = 1;"))
+    session.resolve(_parse("var f = 2;"))
+
+    assert [(info.name.lexeme, info.kind, info.version) for info in invalidated] == [
+        ("f", GlobalKind.VARIABLE, 1)
+    ]
+    assert session.lookup("f").version == 1
+    assert session.lookup("g").version == 0
+
+
+def test_resolve_closure_captures():
+    program = _parse(
+        "fun f() { var unused; var x; var y; fun g() { x; y = 1; } var h; h = fun () { h; }; }"
+    )
+    bindings = resolve(program)
+
+    captures = {token.lexeme: names for token, names in bindings.captures.items()}
+    assert captures == {"f": (), "g": (("x", -1), ("y", -1)), "fun": (("h", -1),)}
+    assert {token.lexeme for token in bindings.boxed} == {"y", "h"}
+
+
+_PROGRAMS = [
+    "var g; { var a; { var b; a; b = g; } }",
+    "fun f(a) { var x = a; fun g() { x = x + a; return g; } return g; }",
+    "for (var i = 0; i < 3; i = i + 1) { var j = i; print fun () { return i + j; }; }",
+    "{ class A { m() { return this; } } class B < A { m() { return super.m(); } } }",
+    "var f = fun (n) { { var m = n; return fun () { return m + n; }; } };",
+]
+
+
+@pytest.mark.parametrize("input", _PROGRAMS)
+def test_fused_resolution_matches_two_passes(input):
+    two_passes = resolve(_parse(input))
+    resolver = Resolver()
+    list(parse(scan_tokens(input), resolver=resolver))
+    fused = resolver.bindings
+
+    assert dict(fused) == dict(two_passes)
+    assert fused.boxed == two_passes.boxed
+    assert fused.captures == two_passes.captures
+
+
+def test_fused_diagnostics(capsys):
+    resolver = Resolver()
+    list(parse(scan_tokens("{ var a = a; var b; var b; }"), resolver=resolver))
+
+    assert capsys.readouterr().out.splitlines() == [
+        "Error (1:11): Cannot bind reference to a during definition.",
+        "Error (1:25): Redefinition of b.",
+    ]
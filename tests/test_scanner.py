@@ -32,9 +32,9 @@ def test_parse_numbers():
 def test_parse_strings():
     tokens = list(scan_tokens('"Hello" + "World"'))
     expected = [
-        Token(TokenType.STRING, '"Hello"', "Hello", 1, 0),
-        Token(TokenType.PLUS, "+", None, 1, 8),
-        Token(TokenType.STRING, '"World"', "World", 1, 10),
+        Token(TokenType.STRING, '"Hello"', "Hello", 0),
+        Token(TokenType.PLUS, "+", None, 8),
+        Token(TokenType.STRING, '"World"', "World", 10),
     ]
 
     assert tokens == expected
@@ -45,3 +45,30 @@ def test_parse_identifiers():
     expected = [TokenType.VAR, TokenType.IDENTIFIER, TokenType.EQUAL, TokenType.IDENTIFIER]
 
     assert tokens == expected
+
+
+def test_token_buffer_interns_names_and_literals():
+    tokens = scan_tokens('var x = x + 1; print "a" + "a" + 1;')
+
+    assert tokens.lexemes == ["x"]
+    assert tokens.literals == [1.0, "a"]
+    assert len(tokens) == 14
+    assert tokens[1] == Token(TokenType.IDENTIFIER, "x", None, 4)
+    assert tokens.type_at(5) == TokenType.NUMBER
+
+
+def test_names_and_strings_are_interned_across_inputs():
+    first = scan_tokens('var name = "some text";')
+    second = scan_tokens('print name + "some text";')
+
+    assert first[1].lexeme is second[1].lexeme
+    assert first[3].literal is second[3].literal
+
+
+def test_source_map_locations():
+    tokens = scan_tokens("var a;\n\n  print a;\n")
+    print_token = tokens[3]
+
+    assert print_token.token == TokenType.PRINT
+    assert (print_token.line, print_token.location) == (3, "3:3")
+    assert tokens.source_map.location(len(tokens.source)) == "4:1"
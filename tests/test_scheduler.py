@@ -0,0 +1,119 @@
+import threading
+
+
+def test_spawn_join(run_stdlib, assert_out_lines):
+    run_stdlib(
+        """
+        fun work() { return 6 * 7; }
+        var task = spawn(work);
+        print task.done();
+        print task.join();
+        print task.done();
+        """
+    )
+
+    assert_out_lines("false", "42", "true")
+
+
+def test_tasks_interleave_on_yield(run_stdlib, assert_out_lines):
+    run_stdlib(
+        """
+        fun worker(name) {
+            return fun () {
+                for (var i = 0; i < 3; i = i + 1) {
+                    print name + str(i);
+                    yield();
+                }
+            };
+        }
+        var a = spawn(worker("a"));
+        var b = spawn(worker("b"));
+        a.join();
+        b.join();
+        """
+    )
+
+    assert_out_lines("a0", "b0", "a1", "b1", "a2", "b2")
+
+
+def test_channels(run_stdlib, assert_out_lines):
+    run_stdlib(
+        """
+        var requests = Channel();
+        var responses = Channel();
+        spawn(fun () {
+            while (true) {
+                var n = requests.receive();
+                if (n == nil) return;
+                responses.send(n * n);
+            }
+        });
+        for (var i = 1; i <= 3; i = i + 1) requests.send(i);
+        requests.send(nil);
+        print responses.receive() + responses.receive() + responses.receive();
+        """
+    )
+
+    assert_out_lines("14")
+
+
+def test_sleep_orders_tasks(run_stdlib, assert_out_lines):
+    run_stdlib(
+        """
+        var done = Channel();
+        fun sleeper(name, seconds) {
+            return fun () {
+                sleep(seconds);
+                done.send(name);
+            };
+        }
+        spawn(sleeper("slow", 0.02));
+        spawn(sleeper("fast", 0.01));
+        print done.receive();
+        print done.receive();
+        """
+    )
+
+    assert_out_lines("fast", "slow")
+
+
+def test_deadlock_reported(run_stdlib, assert_out_lines):
+    run_stdlib("Channel().receive();")
+
+    assert_out_lines("Error (1:19): Deadlock: receive on an empty channel with no runnable tasks.")
+
+
+def test_task_error_does_not_stop_main(run_stdlib, assert_out_lines):
+    run_stdlib(
+        """
+        var task = spawn(fun () { return undefined; });
+        print task.join();
+        print "main";
+        """
+    )
+
+    assert_out_lines("Error (2:42): Attempt to access undefined variable undefined", "nil", "main")
+
+
+def test_thousands_of_tasks_without_threads(run_stdlib, assert_out_lines):
+    threads = threading.active_count()
+    run_stdlib(
+        """
+        var results = Channel();
+        var gate = Channel();
+        for (var i = 0; i < 2000; i = i + 1) {
+            spawn(fun () {
+                var n = gate.receive();
+                results.send(n);
+            });
+        }
+        yield();
+        for (var i = 0; i < 2000; i = i + 1) gate.send(1);
+        var total = 0;
+        for (var i = 0; i < 2000; i = i + 1) total = total + results.receive();
+        print total;
+        """
+    )
+
+    assert_out_lines("2000")
+    assert threading.active_count() == threads
@@ -0,0 +1,120 @@
+import gc
+import json
+import multiprocessing
+import socket
+import time
+import weakref
+
+import pytest
+
+import pylox.processes
+from pylox.client import request
+from pylox.server import ProgramCache, Server, handle
+
+
+def _serve_one(programs: ProgramCache, message: dict) -> list:
+    server_end, client_end = socket.socketpair()
+    with server_end, client_end:
+        client_end.sendall(json.dumps(message).encode() + b"\n")
+        handle(server_end, programs)
+        server_end.shutdown(socket.SHUT_WR)
+        with client_end.makefile("rb") as replies:
+            return [json.loads(line) for line in replies]
+
+
+def test_handle_streams_output_and_errors():
+    replies = _serve_one(ProgramCache(), {"source": "print 1; print 2; print x;"})
+
+    assert replies == [
+        {"out": "1"},
+        {"out": "2"},
+        {"error": "Error (1:25): Attempt to access undefined variable x"},
+        {"ok": False},
+    ]
+
+
+def test_handle_reuses_compiled_programs_with_fresh_globals():
+    programs = ProgramCache(size=1)
+    source = "var n; if (n == nil) n = 0; n = n + 1; print n;"
+
+    first = _serve_one(programs, {"source": source})
+    program = programs.get(source)
+    second = _serve_one(programs, {"source": source})
+
+    assert first == second == [{"out": "1"}, {"ok": True}]
+    assert programs.get(source) is program
+    assert len(programs) == 1
+
+
+@pytest.mark.skipif("fork" not in multiprocessing.get_all_start_methods(), reason="needs fork")
+def test_handle_stops_the_worker_processes_a_program_started(monkeypatch):
+    pools = []
+
+    class TrackedPool(pylox.processes.ProcessPool):
+        def __init__(self, *args):
+            super().__init__(*args)
+            pools.append(weakref.ref(self))
+
+    monkeypatch.setattr(pylox.processes, "ProcessPool", TrackedPool)
+    programs = ProgramCache()
+    source = "fun double(x) { return x * 2; } print spawnProcess(double, 21).join();"
+
+    for _ in range(2):
+        replies = _serve_one(programs, {"source": source, "stdlib": True})
+        assert replies == [{"out": "42"}, {"ok": True}]
+        assert multiprocessing.active_children() == []
+
+    gc.collect()
+    assert len(pools) == 2
+    assert all(pool() is None for pool in pools)
+
+
+def test_handle_replays_compile_errors():
+    programs = ProgramCache()
+
+    for _ in range(2):
+        replies = _serve_one(programs, {"source": "print 1 }"})
+        assert replies[-1] == {"ok": False}
+        assert replies[0]["error"].startswith("Error (1:9)")
+
+
+def test_handle_reads_paths_and_rejects_bad_requests(tmp_path):
+    script = tmp_path / "script.lox"
+    script.write_text('print "from a file";')
+
+    assert _serve_one(ProgramCache(), {"path": str(script)}) == [
+        {"out": "from a file"},
+        {"ok": True},
+    ]
+    replies = _serve_one(ProgramCache(), {"path": str(tmp_path / "missing.lox")})
+    assert replies[0]["error"].startswith("Bad request")
+    assert replies[-1] == {"ok": False}
+
+
+def _wait_until_listening(path: str) -> None:
+    # The socket file exists from bind(), before the server listens.
+    for _ in range(100):
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+            try:
+                probe.connect(path)
+                return
+            except (FileNotFoundError, ConnectionRefusedError):
+                time.sleep(0.05)
+    raise TimeoutError(f"Nothing listens on {path}")
+
+
+@pytest.mark.skipif("fork" not in multiprocessing.get_all_start_methods(), reason="needs fork")
+def test_server_and_client(tmp_path):
+    path = str(tmp_path / "pylox.sock")
+    server = Server(path, workers=2, stdlib=True)
+    process = multiprocessing.get_context("fork").Process(target=server.serve_forever)
+    process.start()
+    try:
+        _wait_until_listening(path)
+        lines = []
+        for i in range(3):
+            assert request(path, {"source": f"print sqrt({i * i});"}, lines.append)
+        assert lines == ["0", "1", "2"]
+    finally:
+        process.terminate()
+        process.join()
@@ -0,0 +1,78 @@
+import gc
+
+from pylox.session import Session
+
+
+def _session():
+    out = []
+    return Session(output=out.append, on_error=out.append), out
+
+
+def test_session_keeps_globals():
+    session, out = _session()
+
+    session.run("var x = 1;")
+    session.run("fun inc() { x = x + 1; }")
+    session.run("inc(); inc();")
+    session.run("print x;")
+
+    assert out == ["3"]
+
+
+def test_closures_keep_their_bindings():
+    session, out = _session()
+
+    session.run("fun counter() { var n = 0; return fun () { n = n + 1; return n; }; }")
+    session.run("var c = counter();")
+    session.run("{ var local = 10; print local; }")
+    session.run("c(); print c();")
+
+    assert out == ["10", "2"]
+
+
+def test_dead_inputs_are_released():
+    session, _ = _session()
+
+    for i in range(200):
+        session.run(f"{{ var a = {i}; var b = a + 1; print b; }}")
+    gc.collect()
+
+    stats = session.stats()
+    assert stats.inputs == 200
+    assert stats.live_inputs == 0
+    assert stats.live_bindings == 0
+
+
+def test_redefined_function_releases_old_input():
+    session, out = _session()
+
+    session.run("fun f() { var a = 1; { return a; } }")
+    gc.collect()
+    assert session.stats().live_inputs == 1
+
+    session.run("fun f() { var b = 2; { return b; } }")
+    gc.collect()
+    stats = session.stats()
+    session.run("print f();")
+
+    assert stats.live_inputs == 1
+    assert stats.globals == 2  # clock and f
+    assert out == ["2"]
+
+
+def test_input_with_only_captures_is_live():
+    session, _ = _session()
+
+    session.run("fun f() { return 1; }")
+    gc.collect()
+
+    assert session.stats().live_inputs == 1
+
+
+def test_session_resolver_knows_previous_inputs():
+    session, _ = _session()
+
+    session.run("fun f() {}")
+    session.run("class C {}")
+
+    assert set(session.resolver.globals) == {"f", "C"}
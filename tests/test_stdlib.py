@@ -0,0 +1,126 @@
+import os
+import subprocess
+import sys
+
+from pylox.environment import PROCESS_NATIVES, SCHEDULER_NATIVES, init_global_env
+from pylox.lox import run
+from pylox.runtime import NativeFunction, native
+
+
+def test_stdlib_not_loaded_by_default(assert_out_lines):
+    run("print sqrt(4);")
+
+    assert_out_lines("Error (1:7): Attempt to access undefined variable sqrt")
+
+
+def test_math(run_stdlib, assert_out_lines):
+    run_stdlib(
+        """
+        print sqrt(16);
+        print abs(-2.5);
+        print floor(2.7) + ceil(2.2);
+        print min(3, 4) + max(3, 4);
+        print pow(2, 10);
+        """
+    )
+
+    assert_out_lines("4", "2.5", "5", "7", "1024")
+
+
+def test_strings(run_stdlib, assert_out_lines):
+    run_stdlib(
+        """
+        var s = "Hello World";
+        print len(s);
+        print substr(s, 0, 5);
+        print indexOf(s, "World");
+        print upper(s) + lower(s);
+        print trim("  x  ");
+        """
+    )
+
+    assert_out_lines("11", "Hello", "6", "HELLO WORLDhello world", "x")
+
+
+def test_conversion(run_stdlib, assert_out_lines):
+    run_stdlib(
+        """
+        print str(1.5) + str(true) + str(nil);
+        print num("41") + 1;
+        print num("nope");
+        print type(1) + type("") + type(nil) + type(true);
+        class T {}
+        print type(T) + type(T()) + type(clock) + type(fun () {});
+        """
+    )
+
+    assert_out_lines(
+        "1.5truenil",
+        "42",
+        "nil",
+        "numberstringnilboolean",
+        "classinstancefunctionfunction",
+    )
+
+
+def test_native_error_reported_at_call(run_stdlib, assert_out_lines):
+    run_stdlib(
+        """
+        print len("abc");
+        print len(3);
+        print "unreachable";
+        """
+    )
+
+    assert_out_lines("3", "Error (3:20): len argument must be a string.")
+
+
+def test_native_arity_checked(run_stdlib, assert_out_lines):
+    run_stdlib("print substr(1);")
+
+    assert_out_lines("Error (1:15): Wrong nargs!")
+
+
+def test_register_native(assert_out_lines):
+    natives = {}
+
+    @native(natives)
+    def twice(x):
+        return x * 2
+
+    @native(natives, name="answer")
+    def _answer():
+        return 42.0
+
+    env = init_global_env()
+    env.define_natives(natives)
+    run("print twice(answer()); print twice;", env)
+
+    assert natives["twice"] == NativeFunction("twice", 1, twice)
+    assert_out_lines("84", "<native fn twice>")
+
+
+def test_scheduler_and_processes_load_on_first_use():
+    code = (
+        "import sys; from pylox.environment import init_global_env; "
+        "from pylox.lox import run; env = init_global_env(stdlib=True); "
+        "print(sorted(m for m in ('asyncio', 'multiprocessing', 'pylox.scheduler', "
+        "'pylox.processes') if m in sys.modules)); "
+        "run('sleep(0);', env); print('pylox.scheduler' in sys.modules)"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True, env=os.environ
+    )
+
+    assert result.stdout.splitlines() == ["[]", "True"]
+
+
+def test_deferred_natives_match_the_real_ones():
+    from pylox.processes import ProcessPool
+    from pylox.scheduler import Scheduler
+
+    real = Scheduler().natives() | ProcessPool(init_global_env()).natives()
+
+    assert SCHEDULER_NATIVES | PROCESS_NATIVES == {
+        name: (native.__class__, native.arity) for name, native in real.items()
+    }
@@ -0,0 +1,79 @@
+from pylox.environment import init_global_env
+from pylox.lox import run
+from pylox.strings import ROPE_THRESHOLD, Rope, concat
+
+
+def test_short_concat_stays_str():
+    assert concat("a", "b") == "ab"
+    assert type(concat("a", "b")) is str
+
+
+def test_long_concat_is_rope():
+    chunk = "x" * ROPE_THRESHOLD
+    rope = concat(concat(chunk, "a"), "b")
+
+    assert isinstance(rope, Rope)
+    assert len(rope) == ROPE_THRESHOLD + 2
+    assert rope == chunk + "ab"
+    assert chunk + "ab" == rope
+    assert hash(rope) == hash(chunk + "ab")
+    assert rope > chunk
+    assert str(rope + "c") == chunk + "abc"
+
+
+def test_rope_flatten_is_iterative():
+    rope = "x" * ROPE_THRESHOLD
+    for _ in range(5000):
+        rope = concat(rope, "y" * 2000)
+
+    assert rope.flatten() == "x" * ROPE_THRESHOLD + "y" * 10_000_000
+
+
+def test_loop_concat_output_unchanged(assert_out_lines):
+    env = init_global_env(stdlib=True)
+    run(
+        """
+        var s = "";
+        for (var i = 0; i < 3000; i = i + 1) s = s + "ab";
+        print len(s);
+        print s == substr(s, 0, 6000);
+        print substr(s, 5996, 6000);
+        var m = Map();
+        m.set(s, "found");
+        print m.get(substr(s, 0, 6000));
+        """,
+        env,
+    )
+
+    assert isinstance(env.access_unbound("s"), Rope)
+    assert_out_lines("6000", "true", "abab", "found")
+
+
+def test_print_rope(assert_out_lines):
+    run(
+        """
+        var s = "-";
+        for (var i = 0; i < 13; i = i + 1) s = s + s;
+        var t = s + "|";
+        print t == s;
+        print t;
+        """
+    )
+
+    assert_out_lines("false", "-" * 2**13 + "|")
+
+
+def test_string_builder(run_stdlib, assert_out_lines):
+    run_stdlib(
+        """
+        var sb = StringBuilder();
+        sb.append("a").append(1).append(true).append(nil);
+        print sb.length();
+        print sb.toString();
+        print sb;
+        sb.clear();
+        print sb.toString() == "";
+        """
+    )
+
+    assert_out_lines("9", "a1truenil", "a1truenil", "true")
@@ -0,0 +1,65 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from pylox.lox import Lox, run
+
+
+FIB = """
+fun fib(n) {
+    if (n < 2) return n;
+    return fib(n - 1) + fib(n - 2);
+}
+var total = 0;
+for (var i = 0; i < %d; i = i + 1) total = total + fib(10);
+print "%s " + str(total);
+%s
+"""
+
+
+def test_instance_owns_output_and_diagnostics(capsys):
+    out = []
+    lox = Lox(output=out.append)
+
+    assert lox.run("var x = 1; print x;")
+    assert not lox.run("print x + 1; print y;")
+
+    assert out == ["1", "2"]
+    assert lox.diagnostics == ["Error (1:20): Attempt to access undefined variable y"]
+    assert capsys.readouterr().out == ""
+
+
+def test_instances_do_not_share_globals():
+    first, second = Lox(output=lambda _: None), Lox(output=lambda _: None)
+
+    first.run("var shared = 1;")
+    second.run("print shared;")
+
+    assert not first.diagnostics
+    assert second.diagnostics == ["Error (1:7): Attempt to access undefined variable shared"]
+
+
+def test_module_run_does_not_leak_bindings(capsys):
+    run("{ var x = 1; print x; }")
+    run("{ var x = 2; { print x; } }")
+
+    assert capsys.readouterr().out == "1\n2\n"
+
+
+def test_parallel_instances_stress():
+    def work(i: int):
+        out = []
+        lox = Lox(stdlib=True, output=out.append)
+        error = "print undefined;" if i % 2 else ""
+        for _ in range(3):
+            lox.run(FIB % (i % 4 + 1, f"worker{i}", error))
+        return i, out, lox.diagnostics
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(work, range(16)))
+
+    for i, out, diagnostics in results:
+        assert out == [f"worker{i} {55 * (i % 4 + 1)}"] * 3
+        expected_errors = 3 if i % 2 else 0
+        assert (
+            diagnostics
+            == ["Error (9:7): Attempt to access undefined variable undefined"] * expected_errors
+        )
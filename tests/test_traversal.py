@@ -0,0 +1,70 @@
+import operator
+from typing import List
+
+import pytest
+
+from pylox.expr import Binary, Literal, Variable
+from pylox.parser import parse, parse_expr
+from pylox.printer import expr_to_string
+from pylox.scanner import scan_tokens
+from pylox.stmt import Stmt
+from pylox.traversal import TraversalException, Transformer, Visitor, walk
+
+
+def _parse_program(input: str) -> List[Stmt]:
+    return list(parse(scan_tokens(input)))
+
+
+def test_visitor_dispatch():
+    class Names(Visitor):
+        __slots__ = ("names",)
+
+        def __init__(self):
+            self.names = []
+
+        def visit_Variable(self, variable):
+            self.names.append(variable.name.lexeme)
+
+    names = Names()
+    for stmt in _parse_program("var a = b + c; { print a(d, e.f); }"):
+        names.visit(stmt)
+
+    assert names.names == ["b", "c", "a", "d", "e"]
+
+
+def test_visitor_rejects_unknown_handler():
+    with pytest.raises(TraversalException):
+
+        class Bad(Visitor):
+            def visit_Nothing(self, node):
+                pass
+
+
+def test_walk_is_iterative():
+    depth = 5000
+    expr = Literal(0.0)
+    for _ in range(depth):
+        expr = Binary(expr, scan_tokens("+")[0], Literal(1.0), operator.add)
+
+    nodes = list(walk(expr))
+
+    assert len(nodes) == 2 * depth + 1
+    assert sum(isinstance(node, Literal) for node in nodes) == depth + 1
+
+
+def test_transformer_folds_constants():
+    class Fold(Transformer):
+        __slots__ = ()
+
+        def visit_Binary(self, binary):
+            binary = self.generic_visit(binary)
+            if isinstance(binary.left, Literal) and isinstance(binary.right, Literal):
+                return Literal(binary.op(binary.left.value, binary.right.value))
+            return binary
+
+    untouched = parse_expr(scan_tokens("a * b"))
+    folded = Fold().visit(parse_expr(scan_tokens("x + 2 * 3 * 4")))
+
+    assert Fold().visit(untouched) is untouched
+    assert expr_to_string(folded.right) == "24.0"
+    assert isinstance(folded.left, Variable)
@@ -0,0 +1,109 @@
+from array import array
+
+import pytest
+
+import pylox.vector
+from pylox.environment import init_global_env
+from pylox.lox import run
+from pylox.vector import Vector
+
+
+@pytest.fixture(params=["numpy", "array"])
+def backend(request, monkeypatch):
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(pylox.vector, "_numpy", lambda: None)
+    return request.param
+
+
+def test_vector_arithmetic(backend, run_stdlib, assert_out_lines):
+    run_stdlib(
+        """
+        var items = Array();
+        for (var i = 1; i <= 4; i = i + 1) items.push(i);
+        var v = vectorOf(items);
+        print v;
+        print v.add(v);
+        print v.mul(10).sub(1);
+        print v.div(2);
+        print v.div(0).get(0);
+        print v.length();
+        """
+    )
+
+    assert_out_lines(
+        "Vector(1, 2, 3, 4)",
+        "Vector(2, 4, 6, 8)",
+        "Vector(9, 19, 29, 39)",
+        "Vector(0.5, 1, 1.5, 2)",
+        "inf",
+        "4",
+    )
+
+
+def test_vector_masks_and_reductions(backend, run_stdlib, assert_out_lines):
+    run_stdlib(
+        """
+        var v = Vector(5);
+        for (var i = 0; i < 5; i = i + 1) v.set(i, i * i);
+        var mask = v.gt(3);
+        print mask;
+        print v.mul(mask).sum();
+        print v.eq(v).sum();
+        print v.min();
+        print v.max();
+        print v.mean();
+        print v.toArray();
+        """
+    )
+
+    assert_out_lines("Vector(0, 0, 1, 1, 1)", "29", "5", "0", "16", "6", "[0, 1, 4, 9, 16]")
+
+
+def test_vector_slice_is_view(backend, run_stdlib, assert_out_lines):
+    run_stdlib(
+        """
+        var v = Vector(4);
+        var tail = v.slice(2, 4);
+        tail.set(0, 7);
+        print v;
+        print tail.length();
+        """
+    )
+
+    assert_out_lines("Vector(0, 0, 7, 0)", "2")
+
+
+def test_vector_errors(backend, run_stdlib, assert_out_lines):
+    run_stdlib(
+        """
+        var v = Vector(2);
+        v.add(Vector(3));
+        """
+    )
+
+    assert_out_lines("Error (3:24): Vector lengths differ.")
+
+
+def test_vector_shares_host_buffer(backend):
+    data = array("d", [1.0, 2.0, 3.0])
+    env = init_global_env(stdlib=True)
+    env.define("data", Vector.from_buffer(data))
+
+    run("data.set(0, data.sum());", env)
+
+    assert list(data) == [6.0, 2.0, 3.0]
+    assert env.access_unbound("data").buffer().tolist() == [6.0, 2.0, 3.0]
+
+
+def test_nan_element_is_not_equal_to_itself(backend, run_stdlib, assert_out_lines):
+    run_stdlib(
+        """
+        var nan = Vector(1).div(0).get(0);
+        print nan == nan;
+        print nan != nan;
+        """
+    )
+
+    assert_out_lines("false", "true")